@@ -38,30 +38,40 @@ if "datasets" in sys.modules.keys():
         "This may cause PaddleNLP datasets to be unavalible in intranet. "
         "Please import paddlenlp before datasets module to avoid download issues"
     )
+# set before `datasets` is imported by `paddlenlp.datasets`, which is imported lazily
+os.environ["HF_UPDATE_DOWNLOAD_COUNTS"] = "False"
+
 import paddle
 
-from . import (
-    data,
-    dataaug,
-    datasets,
-    embeddings,
-    experimental,
-    layers,
-    losses,
-    mergekit,
-    metrics,
-    ops,
-    peft,
-    prompt,
-    quantization,
-    seq2vec,
-    trainer,
-    transformers,
-    trl,
-    utils,
-    version,
-)
-from .server import SimpleServer
-from .taskflow import Taskflow
+from . import transformers, utils
+from .utils.lazy_import import lazy_module
+
+# `utils` and `transformers` are imported at once since they patch paddle, though the names of
+# `transformers` are still imported on first access. The other submodules are imported on first
+# access, see `paddlenlp.utils.lazy_import`.
+import_structure = {
+    "data": [],
+    "dataaug": [],
+    "datasets": [],
+    "embeddings": [],
+    "experimental": [],
+    "layers": [],
+    "losses": [],
+    "mergekit": [],
+    "metrics": [],
+    "ops": [],
+    "peft": [],
+    "prompt": [],
+    "quantization": [],
+    "seq2vec": [],
+    "trainer": [],
+    "transformers": [],
+    "trl": [],
+    "version": [],
+    "server": ["SimpleServer"],
+    "taskflow": ["Taskflow"],
+}
+
+__getattr__, __dir__, __all__ = lazy_module(__name__, import_structure)
 
 paddle.disable_signal_handler()
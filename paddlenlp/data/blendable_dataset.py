@@ -20,6 +20,8 @@ import time
 import numpy as np
 import paddle
 
+from paddlenlp.data.index_cache import IndexCacheEntry
+
 local_rank = int(os.getenv("PADDLE_RANK_IN_NODE", 0))
 
 
@@ -87,10 +89,19 @@ class BlendableDataset(paddle.io.Dataset):
 
         if data_cache_path:
             desc_hash = hashlib.md5(desc.encode("utf-8")).hexdigest()
-            desc_path = os.path.join(data_cache_path, desc_hash + ".dsc")
-            index_path = os.path.join(data_cache_path, desc_hash + "_index.npy")
-            sample_index_path = os.path.join(data_cache_path, desc_hash + "_sample_index.npy")
-            cache_hit = os.path.isfile(index_path) and os.path.isfile(sample_index_path)
+            cache = IndexCacheEntry(
+                data_cache_path,
+                desc_hash,
+                {
+                    "desc": desc_hash + ".dsc",
+                    "index": desc_hash + "_index.npy",
+                    "sample_index": desc_hash + "_sample_index.npy",
+                },
+                data_files=[f for dataset in datasets for f in getattr(dataset, "data_files", [])],
+            )
+            index_path = cache.paths["index"]
+            sample_index_path = cache.paths["sample_index"]
+            cache_hit = cache.is_ready()
             # cache_success = True
             # if paddle.distributed.get_rank() == 0 and not cache_hit:
             check_rank_flag = not cache_hit and local_rank == 0
@@ -107,13 +118,14 @@ class BlendableDataset(paddle.io.Dataset):
                     " dataset, building indices on rank 0 ...",
                     flush=True,
                 )
-                dataset_index, dataset_sample_index = _build_indices()
                 try:
-                    os.makedirs(os.path.dirname(index_path), exist_ok=True)
-                    with open(desc_path, "wt") as fd:
-                        fd.write(desc)
-                        np.save(index_path, dataset_index, allow_pickle=True)
-                        np.save(sample_index_path, dataset_sample_index, allow_pickle=True)
+                    with cache.lock():
+                        if not cache.is_ready():
+                            dataset_index, dataset_sample_index = _build_indices()
+                            cache.save_text("desc", desc)
+                            cache.save("index", dataset_index)
+                            cache.save("sample_index", dataset_sample_index)
+                            cache.mark_ready()
                 except OSError:
                     print(f"There was an error trying to create the data cache directory ({data_cache_path})")
                     print("or a file in it. This is set with the --data-cache-path argument. Please")
@@ -134,18 +146,9 @@ class BlendableDataset(paddle.io.Dataset):
             #     exit()
 
             else:
-                while True:
-                    if (not os.path.isfile(index_path)) or (not os.path.isfile(sample_index_path)):
-                        print("building indices on rank 0 ...", flush=True)
-                        time.sleep(3)
-                    else:
-                        try:
-                            np.load(index_path, allow_pickle=True, mmap_mode="r")
-                            print("build success", flush=True)
-                            break
-                        except Exception:
-                            print("%s file is still writing or damaged, please wait for a moment." % index_path)
-                            time.sleep(3)
+                print("building indices on rank 0 ...", flush=True)
+                cache.wait()
+                print("build success", flush=True)
 
             # paddle.distributed.barrier()
             # Load on all ranks.
@@ -182,3 +185,20 @@ class BlendableDataset(paddle.io.Dataset):
             "dataset_idx": dataset_idx,
             **self.datasets[dataset_idx][sample_idx],
         }
+
+    def __getitems__(self, indices):
+        dataset_index = self.dataset_index[indices]
+        dataset_sample_index = self.dataset_sample_index[indices]
+        samples = [None] * len(indices)
+        # Fetch the samples of each dataset in one batch.
+        for dataset_idx in np.unique(dataset_index):
+            positions = np.nonzero(dataset_index == dataset_idx)[0]
+            dataset = self.datasets[dataset_idx]
+            sample_indices = dataset_sample_index[positions]
+            if hasattr(dataset, "__getitems__"):
+                items = dataset.__getitems__(sample_indices)
+            else:
+                items = [dataset[sample_idx] for sample_idx in sample_indices]
+            for position, item in zip(positions, items):
+                samples[position] = {"dataset_idx": dataset_idx, **item}
+        return samples
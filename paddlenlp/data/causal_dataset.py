@@ -5,11 +5,14 @@ import hashlib
 import math
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import paddle
 
 from paddlenlp.data.blendable_dataset import BlendableDataset
+from paddlenlp.data.index_cache import IndexCacheEntry
+from paddlenlp.data.indexed_dataset import data_file_path, index_file_path
 from paddlenlp.data.indexed_dataset import make_dataset as make_indexed_dataset
 
 local_rank = int(os.getenv("PADDLE_RANK_IN_NODE", 0))
@@ -300,6 +303,8 @@ class GPTDataset(paddle.io.Dataset):
         self.name = name
         self.indexed_dataset = indexed_dataset
         self.return_doc_ids = return_doc_ids
+        self.seq_length = seq_length
+        self.data_files = [index_file_path(data_prefix), data_file_path(data_prefix)]
 
         # Build index mappings.
         if need_data and len(documents) > 0:
@@ -413,6 +418,58 @@ class GPTDataset(paddle.io.Dataset):
             else:
                 return {"text": np.array(sample, dtype=np.int64), "mask": np.array(mask, dtype=np.int64)}
 
+    def __getitems__(self, indices):
+        batch = self.get_batch(indices)
+        return [{key: value[i] for key, value in batch.items()} for i in range(len(indices))]
+
+    def get_batch(self, indices):
+        """Fetches the samples of `indices` at once.
+
+        All token spans of the batch are gathered from the indexed dataset into
+        one preallocated `[batch_size, seq_length + 1]` int64 buffer, together
+        with the loss mask if there is one. The returned dict has the same keys
+        as `__getitem__`, with `text` and `mask` stacked along the first axis.
+        """
+        if not hasattr(self.indexed_dataset, "gather"):
+            samples = [self[i] for i in indices]
+            return {
+                key: [sample[key] for sample in samples] if key == "doc_ids" else np.stack([s[key] for s in samples])
+                for key in samples[0]
+            }
+
+        idx = self.shuffle_idx[np.asarray(indices, dtype=np.int64)].astype(np.int64)
+        batch_size = len(idx)
+        # Start and end documents and offsets.
+        doc_index_f = self.sample_idx[idx, 0].astype(np.int64)
+        doc_index_l = self.sample_idx[idx + 1, 0].astype(np.int64)
+        offset_f = self.sample_idx[idx, 1].astype(np.int64)
+        offset_l = self.sample_idx[idx + 1, 1].astype(np.int64)
+
+        # Every sample spans the documents doc_idx[doc_index_f: doc_index_l + 1],
+        # from offset_f in the first one to offset_l (inclusive) in the last one.
+        num_docs = doc_index_l - doc_index_f + 1
+        first = np.cumsum(num_docs) - num_docs
+        last = first + num_docs - 1
+        doc_positions = np.arange(num_docs.sum(), dtype=np.int64) + np.repeat(doc_index_f - first, num_docs)
+        doc_ids = self.doc_idx[doc_positions].astype(np.int64)
+
+        offsets = np.zeros_like(doc_ids)
+        offsets[first] = offset_f
+        ends = self.indexed_dataset.sizes[doc_ids].astype(np.int64)
+        ends[last] = offset_l + 1
+        lengths = ends - offsets
+
+        text = np.empty([batch_size, self.seq_length + 1], dtype=np.int64)
+        mask = np.empty_like(text) if self.indexed_dataset.has_loss_mask else None
+        self.indexed_dataset.gather(doc_ids, offsets, lengths, text, mask)
+
+        batch = {"text": text}
+        if self.return_doc_ids:  # for retro preprocessing
+            batch["doc_ids"] = np.split(doc_ids, first[1:])
+        if mask is not None:
+            batch["mask"] = mask
+        return batch
+
 
 def _build_index_mappings(
     name, data_prefix, documents, sizes, splits_string, num_samples, seq_length, seed, share_folder, *, data_cache_path
@@ -451,17 +508,21 @@ def _build_index_mappings(
     prefixes = [os.path.join(os.path.dirname(data_prefix), "index-cache")]
     if data_cache_path is not None:
         prefixes.append(data_cache_path)
+    data_files = [index_file_path(data_prefix), data_file_path(data_prefix)]
     for prefix in prefixes:
-        idx_path = {
-            "desc": os.path.join(prefix, desc_filename),
-            "doc": os.path.join(prefix, doc_idx_filename),
-            "sample": os.path.join(prefix, sample_idx_filename),
-            "shuffle": os.path.join(prefix, shuffle_idx_filename),
-        }
-        for f in idx_path.values():
-            if not os.path.isfile(f):
-                break
-        else:
+        cache = IndexCacheEntry(
+            prefix,
+            desc_hash,
+            {
+                "desc": desc_filename,
+                "doc": doc_idx_filename,
+                "sample": sample_idx_filename,
+                "shuffle": shuffle_idx_filename,
+            },
+            data_files=data_files,
+        )
+        idx_path = cache.paths
+        if cache.is_ready():
             # Found our files!
             build_indices = False
             break
@@ -519,49 +580,70 @@ def _build_index_mappings(
             print(string.format(last_epoch_num_samples, num_samples_per_epoch), flush=True)
 
         try:
-            os.makedirs(data_cache_dir, exist_ok=True)
-
-            # description
-            with open(idx_path["desc"], "wt") as fd:
-                fd.write(desc)
-
-            # doc-idx.
-            start_time = time.time()
-            doc_idx = _build_doc_idx(documents, num_epochs, np_rng, separate_last_epoch)
-            np.save(idx_path["doc"], doc_idx, allow_pickle=True)
-            print_rank_0(
-                " > elasped time to build and save doc-idx mapping "
-                "(seconds): {:4f}".format(time.time() - start_time)
-            )
-            # sample-idx.
-            start_time = time.time()
-            # Use C++ implementation for speed.
-            # First compile and then import.
-            # from megatron.data import helpers
-            from fast_dataindex import helpers
-
-            assert doc_idx.dtype == np.int32
-            assert sizes.dtype == np.int32
-            sample_idx = helpers.build_sample_idx(sizes, doc_idx, seq_length, num_epochs, tokens_per_epoch)
-            np.save(idx_path["sample"], sample_idx, allow_pickle=True)
-            print_rank_0(
-                " > elasped time to build and save sample-idx mapping "
-                "(seconds): {:4f}".format(time.time() - start_time)
-            )
-            # shuffle-idx.
-            start_time = time.time()
-            # -1 is due to data structure used to retieve the index:
-            #    sample i --> [sample_idx[i], sample_idx[i+1])
-            if separate_last_epoch:
-                num_samples_ = num_samples_from_epochs_minus_one
-            else:
-                num_samples_ = sample_idx.shape[0] - 1
-            shuffle_idx = _build_shuffle_idx(num_samples_, sample_idx.shape[0] - 1, np_rng)
-            np.save(idx_path["shuffle"], shuffle_idx, allow_pickle=True)
-            print_rank_0(
-                " > elasped time to build and save shuffle-idx mapping"
-                " (seconds): {:4f}".format(time.time() - start_time)
-            )
+            # Files are written atomically and the entry is marked ready at last, the lock
+            # also prevents several nodes from building the same entry in a shared folder.
+            with cache.lock():
+                if cache.is_ready():
+                    print(" > index map files were built by another process", flush=True)
+                else:
+                    # description
+                    cache.save_text("desc", desc)
+
+                    # doc-idx.
+                    start_time = time.time()
+                    doc_idx = _build_doc_idx(documents, num_epochs, np_rng, separate_last_epoch)
+                    print_rank_0(
+                        " > elasped time to build doc-idx mapping " "(seconds): {:4f}".format(time.time() - start_time)
+                    )
+
+                    # The sample-idx only depends on doc-idx, and the shuffle-idx only
+                    # depends on the rng state after building doc-idx, so both of them
+                    # (and the saving of doc-idx) can run concurrently while producing
+                    # exactly the same mappings as the sequential build.
+                    # -1 is due to data structure used to retieve the index:
+                    #    sample i --> [sample_idx[i], sample_idx[i+1])
+                    total_num_samples = (num_epochs * tokens_per_epoch - 1) // seq_length
+                    if separate_last_epoch:
+                        num_samples_ = num_samples_from_epochs_minus_one
+                    else:
+                        num_samples_ = total_num_samples
+
+                    def _save_doc_idx():
+                        cache.save("doc", doc_idx)
+
+                    def _build_and_save_sample_idx():
+                        start_time = time.time()
+                        sample_idx = _build_sample_idx_fast(sizes, doc_idx, seq_length, num_epochs, tokens_per_epoch)
+                        assert sample_idx.shape[0] == total_num_samples + 1
+                        cache.save("sample", sample_idx)
+                        print_rank_0(
+                            " > elasped time to build and save sample-idx mapping "
+                            "(seconds): {:4f}".format(time.time() - start_time)
+                        )
+
+                    def _build_and_save_shuffle_idx():
+                        start_time = time.time()
+                        shuffle_idx = _build_shuffle_idx(num_samples_, total_num_samples, np_rng)
+                        cache.save("shuffle", shuffle_idx)
+                        print_rank_0(
+                            " > elasped time to build and save shuffle-idx mapping"
+                            " (seconds): {:4f}".format(time.time() - start_time)
+                        )
+
+                    start_time = time.time()
+                    with ThreadPoolExecutor(max_workers=3) as executor:
+                        futures = [
+                            executor.submit(_save_doc_idx),
+                            executor.submit(_build_and_save_sample_idx),
+                            executor.submit(_build_and_save_shuffle_idx),
+                        ]
+                        for future in futures:
+                            future.result()
+                    print_rank_0(
+                        " > elasped time to build and save all index mappings "
+                        "(seconds): {:4f}".format(time.time() - start_time)
+                    )
+                    cache.mark_ready()
         except OSError:
             print(f"There was an error trying to create the data cache directory ({data_cache_dir})")
             print('or a file in it. This defaults to a directory "index-cache" within the directory')
@@ -570,22 +652,9 @@ def _build_index_mappings(
             print("write access to.")
             # data_cache_success = False
     else:
-        while True:
-            if (
-                (not os.path.isfile(idx_path["doc"]))
-                or (not os.path.isfile(idx_path["sample"]))
-                or (not os.path.isfile(idx_path["shuffle"]))
-            ):
-                print("building indices on rank 0 ...", flush=True)
-                time.sleep(3)
-            else:
-                try:
-                    np.load(idx_path["shuffle"], allow_pickle=True, mmap_mode="r")
-                    print("build success", flush=True)
-                    break
-                except Exception:
-                    print("%s file is still writing or damaged, please wait for a moment." % idx_path["shuffle"])
-                    time.sleep(3)
+        print("building indices on rank 0 ...", flush=True)
+        cache.wait()
+        print("build success", flush=True)
     # try:
     #     hcg = paddle.distributed.fleet.get_hybrid_communicate_group()
     # except:
@@ -688,6 +757,59 @@ def _build_sample_idx(sizes, doc_idx, seq_length, num_epochs, tokens_per_epoch):
     return sample_idx
 
 
+def _build_sample_idx_fast(sizes, doc_idx, seq_length, num_epochs, tokens_per_epoch):
+    """Build the sample index mapping, see `_build_sample_idx` for the layout.
+    The C++ implementation of `fast_dataindex` is used if it is installed,
+    otherwise falls back to the vectorized `_build_sample_idx_np`."""
+    try:
+        from fast_dataindex import helpers
+    except ImportError:
+        return _build_sample_idx_np(sizes, doc_idx, seq_length, num_epochs, tokens_per_epoch)
+
+    assert doc_idx.dtype == np.int32
+    assert sizes.dtype == np.int32
+    return helpers.build_sample_idx(sizes, doc_idx, seq_length, num_epochs, tokens_per_epoch)
+
+
+def _build_sample_idx_np(
+    sizes, doc_idx, seq_length, num_epochs, tokens_per_epoch, chunk_size=1 << 22, num_workers=None
+):
+    """Vectorized version of `_build_sample_idx` which produces the same mapping.
+
+    Sample i starts at the global token position `i * seq_length` of the documents
+    flattened in `doc_idx` order, so its start document is found by a binary search
+    over the cumulative document lengths. The samples are processed in chunks
+    which are searched concurrently in a thread pool."""
+
+    # Total number of samples. For -1 see comments in `_num_epochs`.
+    num_samples = (num_epochs * tokens_per_epoch - 1) // seq_length
+
+    doc_lengths = sizes[doc_idx].astype(np.int64)
+    doc_ends = np.cumsum(doc_lengths)
+    assert doc_ends[-1] >= num_samples * seq_length + 1, "not enough tokens to build the sample index."
+
+    dtype = np.int32
+    if len(doc_idx) >= np.iinfo(np.int32).max or sizes.max() >= np.iinfo(np.int32).max:
+        dtype = np.int64
+    sample_idx = np.empty([num_samples + 1, 2], dtype=dtype)
+
+    def _fill(start):
+        end = min(start + chunk_size, num_samples + 1)
+        positions = np.arange(start, end, dtype=np.int64) * seq_length
+        doc_idx_index = np.searchsorted(doc_ends, positions, side="right")
+        sample_idx[start:end, 0] = doc_idx_index
+        sample_idx[start:end, 1] = positions - (doc_ends[doc_idx_index] - doc_lengths[doc_idx_index])
+
+    if num_workers is None:
+        num_workers = min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        list(executor.map(_fill, range(0, num_samples + 1, chunk_size)))
+
+    # Start with first document and no offset.
+    sample_idx[0] = 0
+    return sample_idx
+
+
 def _build_shuffle_idx(num_samples, total_size, np_rng):
     """Build the range [0, size) and shuffle."""
     print(
@@ -40,6 +40,7 @@ __all__ = [
     "DataCollatorForLanguageModeling",
     "DataCollatorForWholeWordMask",
     "DataCollatorForEmbedding",
+    "DataCollatorWithBatchFetch",
 ]
 
 InputDataClass = NewType("InputDataClass", Any)
@@ -214,6 +215,51 @@ class DataCollatorWithPadding:
 
 
 @dataclass
+class _SampleIndexDataset(paddle.io.Dataset):
+    """
+    Returns the sample indices of `dataset` instead of its samples, so that [`DataCollatorWithBatchFetch`] can fetch
+    them as a batch.
+    """
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+
+    def __getitem__(self, idx):
+        return idx
+
+    def __len__(self):
+        return len(self.dataset)
+
+
+@dataclass
+class DataCollatorWithBatchFetch:
+    """
+    Data collator that fetches the samples of a batch with one `dataset.__getitems__(indices)` call.
+
+    [`paddle.io.DataLoader`] fetches every sample with its own `dataset[idx]` call, so datasets that can read a batch
+    at once (such as [`GPTDataset`]) are passed to the dataloader through [`index_dataset`], which yields the sample
+    indices, and the batch is fetched here before being collated by `data_collator`. The fetch runs in the dataloader
+    workers like the per-sample reads it replaces.
+
+    Args:
+        dataset (`paddle.io.Dataset`):
+            The dataset to fetch the batches from, it must implement `__getitems__`.
+        data_collator (`DataCollator`, *optional*):
+            The data collator to apply to the fetched samples. Defaults to [`default_data_collator`].
+    """
+
+    dataset: Any
+    data_collator: Optional[DataCollator] = None
+
+    def index_dataset(self):
+        return _SampleIndexDataset(self.dataset)
+
+    def __call__(self, indices: List[int]) -> Dict[str, Any]:
+        features = self.dataset.__getitems__([int(idx) for idx in indices])
+        data_collator = self.data_collator if self.data_collator is not None else default_data_collator
+        return data_collator(features)
+
+
 class DataCollatorForTokenClassification(DataCollatorMixin):
     """
     Data collator that will dynamically pad the inputs received, as well as the labels.
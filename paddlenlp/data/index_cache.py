@@ -0,0 +1,208 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import glob
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+READY_SUFFIX = ".ready"
+LOCK_SUFFIX = ".lock"
+TMP_INFIX = ".tmp."
+
+
+def file_fingerprint(path, num_chunks=8, chunk_size=1 << 20):
+    """Content fingerprint of a (possibly very large) data file: its size and the md5 of
+    `num_chunks` chunks of `chunk_size` bytes spread evenly over the file, or of the whole
+    file if it is smaller. Unlike the modification time, it is the same for copies of the
+    file on other hosts."""
+    size = os.path.getsize(path)
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        if size <= num_chunks * chunk_size:
+            md5.update(f.read())
+        else:
+            for i in range(num_chunks):
+                f.seek((size - chunk_size) * i // (num_chunks - 1))
+                md5.update(f.read(chunk_size))
+    return [size, md5.hexdigest()]
+
+
+def _atomic_write(path, write_fn, mode="wb"):
+    tmp_path = f"{path}{TMP_INFIX}{os.getpid()}"
+    try:
+        with open(tmp_path, mode) as f:
+            write_fn(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class IndexCacheEntry:
+    """A set of index files cached under `cache_dir`, named by the hash of their description.
+
+    Files are written to a temporary name and atomically renamed, and a `<desc_hash>.ready`
+    marker recording the fingerprints of the underlying data files (e.g. `.idx/.bin`) is
+    written last. The entry is only considered ready if the marker exists and the data
+    files are unchanged. Entries built by older versions (without marker) are still
+    accepted once all of their files exist.
+
+    The builder holds an exclusive advisory lock on `<desc_hash>.lock` while building, so
+    waiting processes block on that lock and wake up as soon as the build finishes. If file
+    locks are not supported, waiting falls back to polling with exponential backoff.
+
+    Stale entries are never removed automatically, since the cache directory may be shared
+    by other jobs; call `gc` explicitly to clean it up.
+
+    Args:
+        cache_dir (str): Directory of the cache.
+        desc_hash (str): Hash of the description of the entry, used as the file prefix.
+        filenames (dict): Mapping from keys to the file names of the entry.
+        data_files (list, optional): The files the entry is built from. Defaults to None.
+    """
+
+    def __init__(self, cache_dir, desc_hash, filenames, data_files=None):
+        self.cache_dir = cache_dir
+        self.desc_hash = desc_hash
+        self.paths = {key: os.path.join(cache_dir, filename) for key, filename in filenames.items()}
+        self.ready_path = os.path.join(cache_dir, desc_hash + READY_SUFFIX)
+        self.lock_path = os.path.join(cache_dir, desc_hash + LOCK_SUFFIX)
+        self.data_files = [os.path.abspath(f) for f in (data_files or []) if os.path.exists(f)]
+
+    def fingerprints(self):
+        return {f: file_fingerprint(f) for f in self.data_files}
+
+    def _read_marker(self):
+        try:
+            with open(self.ready_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_ready(self):
+        if not all(os.path.isfile(path) for path in self.paths.values()):
+            return False
+        if not os.path.exists(self.ready_path):
+            # built by an older version without ready marker
+            return True
+        marker = self._read_marker()
+        return marker is not None and marker.get("data_files") == self.fingerprints()
+
+    def save(self, key, array):
+        """Saves `array` as the numpy file of `key` atomically."""
+        _atomic_write(self.paths[key], lambda f: np.save(f, array, allow_pickle=True))
+
+    def save_text(self, key, text):
+        _atomic_write(self.paths[key], lambda f: f.write(text), mode="wt")
+
+    def mark_ready(self):
+        marker = {
+            "files": [os.path.basename(path) for path in self.paths.values()],
+            "data_files": self.fingerprints(),
+            "created": time.time(),
+        }
+        _atomic_write(self.ready_path, lambda f: json.dump(marker, f), mode="wt")
+
+    @contextlib.contextmanager
+    def lock(self):
+        """Holds the exclusive build lock of the entry."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.lock_path, "a+b") as f:
+            locked = False
+            if fcntl is not None:
+                try:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                    locked = True
+                except OSError:
+                    # file locks are not supported by some shared file systems
+                    pass
+            try:
+                yield
+            finally:
+                if locked:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _wait_for_lock(self):
+        """Blocks until the current builder releases the lock, returns False if that is not possible."""
+        if fcntl is None or not os.path.exists(self.lock_path):
+            return False
+        try:
+            with open(self.lock_path, "rb") as f:
+                fcntl.flock(f, fcntl.LOCK_SH)
+                fcntl.flock(f, fcntl.LOCK_UN)
+            return True
+        except OSError:
+            return False
+
+    def wait(self, timeout=None, min_interval=0.05, max_interval=2.0):
+        """Waits until the entry is ready, raises `TimeoutError` after `timeout` seconds."""
+        start_time = time.time()
+        interval = min_interval
+        while not self.is_ready():
+            if timeout is not None and time.time() - start_time > timeout:
+                raise TimeoutError(f"Timeout while waiting for the index cache {self.ready_path}.")
+            # The lock may not be taken by the builder yet, so still sleep a little after it is released.
+            self._wait_for_lock()
+            time.sleep(interval)
+            interval = min(interval * 2, max_interval)
+
+    def gc(self, tmp_max_age=24 * 3600):
+        """Removes the entries in `cache_dir` whose data files have changed, and the temporary
+        files left by crashed builders. Returns the removed files.
+
+        Entries whose data files do not exist on this host may belong to other jobs sharing
+        the cache, so they are kept. Lock files are never removed, as other processes may be
+        waiting on them.
+        """
+        removed = []
+        for ready_path in glob.glob(os.path.join(self.cache_dir, "*" + READY_SUFFIX)):
+            if ready_path == self.ready_path:
+                continue
+            try:
+                with open(ready_path, "r") as f:
+                    marker = json.load(f)
+                data_files = marker.get("data_files", {})
+                if not all(os.path.exists(data_file) for data_file in data_files):
+                    continue
+                stale = any(
+                    file_fingerprint(data_file) != fingerprint for data_file, fingerprint in data_files.items()
+                )
+            except (OSError, ValueError):
+                continue
+            if not stale:
+                continue
+            paths = [os.path.join(self.cache_dir, name) for name in marker.get("files", [])] + [ready_path]
+            for path in paths:
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+                    removed.append(path)
+
+        for tmp_path in glob.glob(os.path.join(self.cache_dir, "*" + TMP_INFIX + "*")):
+            with contextlib.suppress(OSError):
+                if time.time() - os.path.getmtime(tmp_path) > tmp_max_age:
+                    os.remove(tmp_path)
+                    removed.append(tmp_path)
+        return removed
@@ -551,6 +551,43 @@ class MMapIndexedDataset(paddle.io.Dataset):
             mask_array = np.frombuffer(self._loss_mask_buffer, dtype=np.uint8, count=length, offset=mask_ptr)
         return np_array, mask_array
 
+    def gather(self, idxs, offsets, lengths, out, mask_out=None):
+        """Gathers many items (or portions of items) into preallocated buffers.
+
+        The span `[offsets[i], offsets[i] + lengths[i])` of item `idxs[i]` is
+        written right after the span of item `idxs[i - 1]` in the flattened
+        `out`, which must be C-contiguous. Every span is contiguous in the mmap,
+        so it is copied into `out` as one slice and cast to the dtype of `out`
+        in the same copy. The loss mask is gathered into `mask_out` the same way
+        if the dataset has one.
+        """
+        lengths = np.asarray(lengths, dtype=np.int64)
+        total_length = int(lengths.sum())
+        assert out.size == total_length, f"size of out ({out.size}) mismatches the total length ({total_length})."
+        if not out.flags.c_contiguous or (mask_out is not None and not mask_out.flags.c_contiguous):
+            raise ValueError("The output buffers of gather must be C-contiguous.")
+
+        itemsize = np.dtype(self._index.dtype).itemsize
+        starts = self._index._pointers[np.asarray(idxs, dtype=np.int64)] // itemsize + np.asarray(offsets)
+        tokens = np.frombuffer(self._bin_buffer, dtype=self._index.dtype)
+        out_flat = out.reshape(-1)
+        mask, mask_flat = None, None
+        if mask_out is not None and self._loss_mask_buffer is not None:
+            mask = np.frombuffer(self._loss_mask_buffer, dtype=np.uint8)
+            mask_flat = mask_out.reshape(-1)
+
+        dst = 0
+        for start, length in zip(starts.tolist(), lengths.tolist()):
+            out_flat[dst : dst + length] = tokens[start : start + length]
+            if mask is not None:
+                mask_flat[dst : dst + length] = mask[start : start + length]
+            dst += length
+        return out, mask_out
+
+    @property
+    def has_loss_mask(self):
+        return self._loss_mask_buffer is not None
+
     @property
     def sizes(self):
         return self._index.sizes
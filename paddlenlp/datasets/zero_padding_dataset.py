@@ -14,7 +14,8 @@
 
 import numpy as np
 from paddle.io import Dataset, IterableDataset
-from scipy.linalg import block_diag
+
+from ..utils.log import logger
 
 
 def generate_greedy_packs(examples, max_length):
@@ -38,6 +39,162 @@ def generate_greedy_packs(examples, max_length):
     return generate_packs
 
 
+class _CapacityIndex:
+    """Segment tree over the remaining capacities `[0, max_length]` of the open packs,
+    which finds the pack with the smallest remaining capacity that fits a record in
+    O(log(max_length))."""
+
+    def __init__(self, max_length):
+        self.size = 1
+        while self.size < max_length + 1:
+            self.size *= 2
+        self.counts = [0] * (2 * self.size)
+        self.buckets = [[] for _ in range(max_length + 1)]
+
+    def _update(self, capacity, delta):
+        node = capacity + self.size
+        while node > 0:
+            self.counts[node] += delta
+            node //= 2
+
+    def add(self, capacity, pack_id):
+        self.buckets[capacity].append(pack_id)
+        self._update(capacity, 1)
+
+    def pop_best_fit(self, length):
+        """Removes and returns `(capacity, pack_id)` of the best fitting pack, or None."""
+        if length >= len(self.buckets):
+            return None
+        node = length + self.size
+        if self.counts[node] == 0:
+            # climb until there is a non-empty subtree on the right side
+            while True:
+                if node == 1:
+                    return None
+                if node % 2 == 0 and self.counts[node + 1] > 0:
+                    node += 1
+                    break
+                node //= 2
+            # descend to the leftmost non-empty leaf
+            while node < self.size:
+                node = 2 * node if self.counts[2 * node] > 0 else 2 * node + 1
+        capacity = node - self.size
+        pack_id = self.buckets[capacity].pop()
+        self._update(capacity, -1)
+        return capacity, pack_id
+
+
+def generate_best_fit_packs(examples, max_length):
+    """Packs the examples with the best-fit-decreasing strategy: the examples are visited
+    from the longest to the shortest and each one is put into the open pack with the
+    smallest remaining space that can hold it. Runs in O(n * log(max_length)).
+    Returns the non-empty packs in the order they are opened."""
+    lengths = [len(record["input_ids"]) for record in examples]
+    order = sorted(range(len(examples)), key=lambda i: lengths[i], reverse=True)
+    capacity_index = _CapacityIndex(max_length)
+    packs = []
+    for i in order:
+        best_fit = capacity_index.pop_best_fit(lengths[i])
+        if best_fit is None:
+            capacity, pack_id = max_length, len(packs)
+            packs.append([])
+        else:
+            capacity, pack_id = best_fit
+        packs[pack_id].append(examples[i])
+        capacity -= lengths[i]
+        if capacity > 0:
+            capacity_index.add(capacity, pack_id)
+    return packs
+
+
+class PackingStats:
+    """Packing efficiency of a zero padding dataset."""
+
+    def __init__(self, max_length):
+        self.max_length = max_length
+        self.num_packs = 0
+        self.num_sequences = 0
+        self.num_tokens = 0
+
+    def update(self, batch_records):
+        self.num_packs += 1
+        self.num_sequences += len(batch_records)
+        self.num_tokens += sum(len(record["input_ids"]) for record in batch_records)
+
+    @property
+    def tokens_per_pack(self):
+        return self.num_tokens / max(self.num_packs, 1)
+
+    @property
+    def padding_ratio(self):
+        """Ratio of the padding tokens if every pack is padded to `max_length`."""
+        return 1.0 - self.num_tokens / max(self.num_packs * self.max_length, 1)
+
+    def to_dict(self):
+        return {
+            "num_packs": self.num_packs,
+            "num_sequences": self.num_sequences,
+            "num_tokens": self.num_tokens,
+            "tokens_per_pack": self.tokens_per_pack,
+            "padding_ratio": self.padding_ratio,
+        }
+
+    def __repr__(self):
+        return (
+            f"PackingStats(num_packs={self.num_packs}, num_sequences={self.num_sequences}, "
+            f"tokens_per_pack={self.tokens_per_pack:.2f}, padding_ratio={self.padding_ratio:.4f})"
+        )
+
+
+class BlockAttentionMask:
+    """Compact form of the block diagonal attention mask of a pack.
+
+    Only the sequence lengths are kept for sequences with causal masks, the (rare) custom
+    masks given by records are kept as they are. The `[seq_len, seq_len]` dense mask is
+    only built by `to_dense`, and causal packs can be converted to the
+    `attn_mask_startend_row_indices` used by flash mask without building it at all.
+    """
+
+    def __init__(self):
+        self.seq_lens = []
+        self.custom_masks = {}
+        self.dtype = None
+        # whether any record provides its own attention mask
+        self.explicit = False
+
+    def append(self, seq_length, attention_mask=None):
+        if attention_mask is not None:
+            attention_mask = np.asarray(attention_mask)
+            self.explicit = True
+            if self.dtype is None:
+                self.dtype = attention_mask.dtype
+            if not np.array_equal(attention_mask, np.tri(seq_length, seq_length, dtype=bool)):
+                self.custom_masks[len(self.seq_lens)] = attention_mask
+        self.seq_lens.append(seq_length)
+
+    @property
+    def is_causal(self):
+        return len(self.custom_masks) == 0
+
+    def to_dense(self):
+        total_length = sum(self.seq_lens)
+        mask = np.zeros([total_length, total_length], dtype=self.dtype or bool)
+        start = 0
+        for i, seq_length in enumerate(self.seq_lens):
+            end = start + seq_length
+            if i in self.custom_masks:
+                mask[start:end, start:end] = self.custom_masks[i]
+            else:
+                mask[start:end, start:end] = np.tri(seq_length, seq_length, dtype=bool)
+            start = end
+        return mask
+
+    def to_startend_row_indices(self):
+        assert self.is_causal, "Only causal masks can be converted to attn_mask_startend_row_indices."
+        ends = np.cumsum(self.seq_lens)
+        return np.repeat(ends, self.seq_lens).tolist()
+
+
 class ZeroPadding:
     required_output_keys = ["input_ids", "labels", "attention_mask"]
     # Only supported the following keys for ZeroPadding. Keys outside of the set will be ignored.
@@ -53,12 +210,15 @@ class ZeroPadding:
     ]
 
     @classmethod
-    def _pad_batch_records(cls, batch_records):
+    def _pack_batch_records(cls, batch_records):
+        """Merges the records into one pack, the attention mask is kept as a `BlockAttentionMask`."""
         # Only consider supported input keys
         input_keys = [key for key in batch_records[0].keys() if key in cls.supported_input_keys]
         if "attn_mask_startend_row_indices" not in input_keys and "attention_mask" not in input_keys:
             input_keys.append("attention_mask")
         batched_features = {key: [] for key in input_keys}
+        if "attention_mask" in batched_features:
+            batched_features["attention_mask"] = BlockAttentionMask()
         sequence_sum = 0
         for record in batch_records:
             batched_features["input_ids"].extend(record["input_ids"])
@@ -85,30 +245,61 @@ class ZeroPadding:
                 attn_mask_startend_row_indices = [i + sequence_sum for i in record["attn_mask_startend_row_indices"]]
                 batched_features["attn_mask_startend_row_indices"].extend(attn_mask_startend_row_indices)
             else:
-                attention_mask = record.get("attention_mask", np.tril(np.ones([seq_length, seq_length], dtype=bool)))
-                batched_features["attention_mask"].append(attention_mask)
+                batched_features["attention_mask"].append(seq_length, record.get("attention_mask", None))
             # NOTE: position_ids is optional and not required by every model
             # We append instead of extend here to accomodate 2D position ids
             if "position_ids" in record:
                 batched_features["position_ids"].append(record["position_ids"])
             sequence_sum += seq_length
 
-        if "attention_mask" in batched_features:
-            block_attention_mask = block_diag(*batched_features["attention_mask"])
-            # convert to 3-D [batch_size(1), seq_length, seq_length]
-            batched_features["attention_mask"] = np.expand_dims(block_attention_mask, axis=0)
         if "position_ids" in batched_features:
             # Accomodate both 1D and 2D position ids
             batched_features["position_ids"] = np.concatenate(batched_features["position_ids"], axis=-1).tolist()
         return batched_features
 
+    @classmethod
+    def _materialize_attention_mask(cls, batched_features, dense_attention_mask=True):
+        """Converts the `BlockAttentionMask` of a pack to its output format.
+
+        Packs of causal records without attention masks get the compact
+        `attn_mask_startend_row_indices` unless `dense_attention_mask` is True, otherwise
+        the dense 3-D `[batch_size(1), seq_length, seq_length]` attention mask is built.
+        """
+        block_attention_mask = batched_features.get("attention_mask", None)
+        if not isinstance(block_attention_mask, BlockAttentionMask):
+            return batched_features
+        batched_features = dict(batched_features)
+        if not dense_attention_mask and not block_attention_mask.explicit and block_attention_mask.is_causal:
+            del batched_features["attention_mask"]
+            batched_features["attn_mask_startend_row_indices"] = block_attention_mask.to_startend_row_indices()
+        else:
+            batched_features["attention_mask"] = np.expand_dims(block_attention_mask.to_dense(), axis=0)
+        return batched_features
+
+    @classmethod
+    def _pad_batch_records(cls, batch_records, dense_attention_mask=True):
+        return cls._materialize_attention_mask(cls._pack_batch_records(batch_records), dense_attention_mask)
+
 
 class ZeroPaddingMapDataset(ZeroPadding, Dataset):
-    def __init__(self, data, tokenizer, max_length, greedy_zero_padding=False):
+    def __init__(
+        self,
+        data,
+        tokenizer,
+        max_length,
+        greedy_zero_padding=False,
+        dense_attention_mask=True,
+        greedy_buffer_size=500,
+    ):
         self.tokenizer = tokenizer
         self.max_length = max_length
         self.greedy_zero_padding = greedy_zero_padding
+        self.dense_attention_mask = dense_attention_mask
+        self.greedy_buffer_size = greedy_buffer_size
+        self.packing_stats = PackingStats(max_length)
+        # Packs are stored with compact attention masks, see `__getitem__`.
         self.new_data = self._create_zero_padding_data(data)
+        logger.info(f"Zero padding dataset is created: {self.packing_stats}")
 
     def _create_zero_padding_data(self, data):
         total_data = []
@@ -125,7 +316,8 @@ class ZeroPaddingMapDataset(ZeroPadding, Dataset):
                     cur_len_so_far += len(record["input_ids"])
                 else:
                     # exceed max length
-                    padded_list = self._pad_batch_records(batch_records)
+                    self.packing_stats.update(batch_records)
+                    padded_list = self._pack_batch_records(batch_records)
                     total_data.append(padded_list)
                     # reset
                     batch_records = []
@@ -136,50 +328,53 @@ class ZeroPaddingMapDataset(ZeroPadding, Dataset):
 
             # remaining data
             if batch_records:
-                padded_list = self._pad_batch_records(batch_records)
+                self.packing_stats.update(batch_records)
+                padded_list = self._pack_batch_records(batch_records)
                 total_data.append(padded_list)
         else:
             examples = []
-            buffer_size = 500
-            i = 0
             for record in data:
                 if len(record["input_ids"]) > self.max_length:
                     continue
-                if i < buffer_size:
-                    examples.append(record)
-                    i += 1
-                else:
-                    # Running greedy strategy in examples.
-                    generate_packs = generate_greedy_packs(examples, self.max_length)
-                    for batch_records in generate_packs:
-                        if len(batch_records) > 0:
-                            padded_list = self._pad_batch_records(batch_records)
-                            total_data.append(padded_list)
-                    examples = [record]
-                    i = 1
+                examples.append(record)
+                if len(examples) == self.greedy_buffer_size:
+                    # Running best fit strategy in the buffered examples.
+                    for batch_records in generate_best_fit_packs(examples, self.max_length):
+                        self.packing_stats.update(batch_records)
+                        total_data.append(self._pack_batch_records(batch_records))
+                    examples = []
             if len(examples) > 0:
-                generate_packs = generate_greedy_packs(examples, self.max_length)
-                for batch_records in generate_packs:
-                    if len(batch_records) > 0:
-                        padded_list = self._pad_batch_records(batch_records)
-                        total_data.append(padded_list)
+                for batch_records in generate_best_fit_packs(examples, self.max_length):
+                    self.packing_stats.update(batch_records)
+                    total_data.append(self._pack_batch_records(batch_records))
 
         return total_data
 
     def __getitem__(self, idx):
-        return self.new_data[idx]
+        return self._materialize_attention_mask(self.new_data[idx], self.dense_attention_mask)
 
     def __len__(self):
         return len(self.new_data)
 
 
 class ZeroPaddingIterableDataset(ZeroPadding, IterableDataset):
-    def __init__(self, data, tokenizer, max_length, greedy_zero_padding=False):
+    def __init__(
+        self,
+        data,
+        tokenizer,
+        max_length,
+        greedy_zero_padding=False,
+        dense_attention_mask=True,
+        greedy_buffer_size=500,
+    ):
         self.data = data
         self.tokenizer = tokenizer
         self.max_length = max_length
         self.zero_padding_global_step = 0
         self.greedy_zero_padding = greedy_zero_padding
+        self.dense_attention_mask = dense_attention_mask
+        self.greedy_buffer_size = greedy_buffer_size
+        self.packing_stats = PackingStats(max_length)
 
     def __iter__(self):
         if not self.greedy_zero_padding:
@@ -193,7 +388,8 @@ class ZeroPaddingIterableDataset(ZeroPadding, IterableDataset):
                     cur_len_so_far += len(record["input_ids"])
                 else:
                     # exceed max length
-                    padded_list = self._pad_batch_records(batch_records)
+                    self.packing_stats.update(batch_records)
+                    padded_list = self._pad_batch_records(batch_records, self.dense_attention_mask)
                     yield padded_list
                     # reset
                     batch_records = []
@@ -203,32 +399,23 @@ class ZeroPaddingIterableDataset(ZeroPadding, IterableDataset):
                     self.zero_padding_global_step += 1
                     cur_len_so_far += len(record["input_ids"])
             if batch_records:
-                padded_list = self._pad_batch_records(batch_records)
+                self.packing_stats.update(batch_records)
+                padded_list = self._pad_batch_records(batch_records, self.dense_attention_mask)
                 yield padded_list
         else:
             examples = []
-            buffer_size = 500
-            i = 0
             for record in self.data:
                 if len(record["input_ids"]) > self.max_length:
                     continue
-                if i < buffer_size:
-                    examples.append(record)
-                    self.zero_padding_global_step += 1
-                    i += 1
-                else:
-                    # Running greedy strategy in examples.
-                    generate_packs = generate_greedy_packs(examples, self.max_length)
-                    for batch_records in generate_packs:
-                        if len(batch_records) > 0:
-                            padded_list = self._pad_batch_records(batch_records)
-                            yield padded_list
-                    examples = [record]
-                    self.zero_padding_global_step += 1
-                    i = 1
+                examples.append(record)
+                self.zero_padding_global_step += 1
+                if len(examples) == self.greedy_buffer_size:
+                    # Running best fit strategy in the buffered examples.
+                    for batch_records in generate_best_fit_packs(examples, self.max_length):
+                        self.packing_stats.update(batch_records)
+                        yield self._pad_batch_records(batch_records, self.dense_attention_mask)
+                    examples = []
             if len(examples) > 0:
-                generate_packs = generate_greedy_packs(examples, self.max_length)
-                for batch_records in generate_packs:
-                    if len(batch_records) > 0:
-                        padded_list = self._pad_batch_records(batch_records)
-                        yield padded_list
+                for batch_records in generate_best_fit_packs(examples, self.max_length):
+                    self.packing_stats.update(batch_records)
+                    yield self._pad_batch_records(batch_records, self.dense_attention_mask)
@@ -11,6 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from .cache_utils import StaticCache, StaticLayerCache
 from .configuration_utils import GenerationConfig
 from .logits_process import (
     ForcedBOSTokenLogitsProcessor,
@@ -0,0 +1,128 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import paddle
+
+__all__ = ["StaticCache", "StaticLayerCache"]
+
+
+class StaticLayerCache:
+    """
+    The preallocated key/value buffers of one decoder layer, see `StaticCache`.
+    """
+
+    def __init__(self, cache, batch_size, max_length, num_key_value_heads, head_dim, dtype):
+        self.cache = cache
+        shape = [batch_size, max_length, num_key_value_heads, head_dim]
+        self.key = paddle.zeros(shape, dtype=dtype)
+        self.value = paddle.zeros(shape, dtype=dtype)
+
+    @property
+    def seq_length(self):
+        return self.cache.seq_length
+
+    def update(self, key_states, value_states):
+        """
+        Writes `key_states` and `value_states` with shape [batch_size, seq_len, num_key_value_heads, head_dim]
+        at the current position in place and returns the whole key and value buffers.
+        """
+        start = self.cache.seq_length
+        end = start + key_states.shape[1]
+        if end > self.cache.max_length:
+            raise ValueError(
+                f"The static cache is full: {end} tokens exceed `max_length` {self.cache.max_length} of the cache."
+            )
+        self.key[:, start:end] = key_states.astype(self.key.dtype)
+        self.value[:, start:end] = value_states.astype(self.value.dtype)
+        return self.key, self.value
+
+    def __getitem__(self, idx):
+        return (self.key, self.value)[idx]
+
+
+class StaticCache:
+    """
+    Key/value cache of a decoder whose buffers are allocated once for `max_length` tokens.
+
+    The states of the new tokens are written in place at the current position and attention
+    runs over the whole `[batch_size, max_length, num_key_value_heads, head_dim]` buffers, while
+    the positions that have not been written yet are masked out by `make_attention_mask`. So the
+    shapes stay fixed during decoding and no memory is allocated for the cache after prefill.
+
+    Args:
+        num_layers (int): The number of decoder layers.
+        batch_size (int): The batch size of generation.
+        max_length (int): The max number of tokens (prompt included) the cache can hold.
+        num_key_value_heads (int): The number of key/value heads of each layer.
+        head_dim (int): The dimension of each attention head.
+        dtype (str|paddle.dtype): The data type of the cache.
+    """
+
+    def __init__(self, num_layers, batch_size, max_length, num_key_value_heads, head_dim, dtype):
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.seq_length = 0
+        self.layers = [
+            StaticLayerCache(self, batch_size, max_length, num_key_value_heads, head_dim, dtype)
+            for _ in range(num_layers)
+        ]
+
+    def __getitem__(self, idx):
+        return self.layers[idx]
+
+    def __iter__(self):
+        return iter(self.layers)
+
+    def __len__(self):
+        return len(self.layers)
+
+    def __bool__(self):
+        # an empty cache behaves like `past_key_values=None` in `prepare_inputs_for_generation`
+        return self.seq_length > 0
+
+    def advance(self, num_tokens):
+        """Moves the current position forward after all the layers have been updated."""
+        self.seq_length += num_tokens
+
+    def reset(self):
+        self.seq_length = 0
+
+    def make_attention_mask(self, attention_mask, query_length):
+        """
+        Builds the bool attention mask with shape [batch_size, 1, query_length, max_length] of the
+        tokens written at the current position. A query token attends to the positions before it
+        and is masked by `attention_mask` with shape [batch_size, key_length] (key_length <= max_length)
+        if it is given.
+        """
+        key_positions = paddle.arange(self.max_length, dtype="int64")
+        query_positions = paddle.arange(self.seq_length, self.seq_length + query_length, dtype="int64")
+        # [query_length, max_length]
+        mask = key_positions.unsqueeze(0) <= query_positions.unsqueeze(-1)
+        mask = mask[None, None, :, :].expand([self.batch_size, 1, query_length, self.max_length])
+        if attention_mask is not None:
+            attention_mask = attention_mask.astype("bool")
+            if attention_mask.shape[-1] < self.max_length:
+                padding = paddle.zeros(
+                    [attention_mask.shape[0], self.max_length - attention_mask.shape[-1]], dtype="bool"
+                )
+                attention_mask = paddle.concat([attention_mask, padding], axis=-1)
+            mask = mask & attention_mask[:, None, None, :]
+        return mask
+
+    def reorder(self, index):
+        """Selects the cached states of `index` along the batch dimension, e.g. for beam search."""
+        for layer in self.layers:
+            layer.key = paddle.index_select(layer.key, index, axis=0)
+            layer.value = paddle.index_select(layer.value, index, axis=0)
+        self.batch_size = self.layers[0].key.shape[0] if self.layers else index.shape[0]
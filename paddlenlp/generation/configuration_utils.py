@@ -118,6 +118,11 @@ class GenerationConfig:
                 If not, this is the diversity_rate for DIVERSE BEAM SEARCH.
             use_cache: (bool, optional): Whether to use the model cache to
                 speed up decoding. Default to True.
+            cache_implementation: (str, optional): The cache used in greedy search
+                and sampling. "static" preallocates the key/value cache, the ids and
+                the attention mask for all the tokens to generate and updates them in
+                place, which keeps the shapes fixed during decoding. Only works for
+                models supporting `init_static_cache`. Default to None.
             use_fast: (bool, optional): Whether to use fast entry of model
                 for FastGeneration. Default to False.
             use_fp16_decoding: (bool, optional): Whether to use fp16 for decoding.
@@ -166,6 +171,7 @@ class GenerationConfig:
         self.num_beams = kwargs.pop("num_beams", 1)
         self.num_beam_groups = kwargs.pop("num_beam_groups", 1)
         self.use_cache = kwargs.pop("use_cache", True)
+        self.cache_implementation = kwargs.pop("cache_implementation", None)
 
         # Parameters that define the output variables of `generate`
         self.num_return_sequences = kwargs.pop("num_return_sequences", 1)
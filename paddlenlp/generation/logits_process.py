@@ -15,7 +15,7 @@ from __future__ import annotations
 
 import inspect
 from abc import ABC
-from collections import OrderedDict
+from collections import Counter, OrderedDict
 from typing import Callable, Dict, List, Tuple, Union
 
 import numpy as np
@@ -178,6 +178,12 @@ class NoRepeatNGramLogitsProcessor(LogitsProcessor):
     r"""
     [`LogitsProcessor`] that enforces no repetition of n-grams. See
     [Fairseq](https://github.com/pytorch/fairseq/blob/a07cb6f40480928c9e0548b737aadd36ee66ac76/fairseq/sequence_generator.py#L345).
+
+    The n-grams of each hypothesis are kept between steps, keyed by the tokens of the hypothesis.
+    On each step the table of a hypothesis is taken from its parent (the hypothesis without the
+    newest token, which also follows the reordering of beam search) and only updated with the
+    newest n-gram, so it is only built from scratch for unseen hypotheses such as the prompts.
+
     Args:
         ngram_size (`int`):
             All ngrams of size `ngram_size` can only occur once.
@@ -187,18 +193,70 @@ class NoRepeatNGramLogitsProcessor(LogitsProcessor):
         if not isinstance(ngram_size, int) or ngram_size <= 0:
             raise ValueError(f"`ngram_size` has to be a strictly positive integer, but is {ngram_size}")
         self.ngram_size = ngram_size
+        # {length: {hypothesis tokens bytes: {ngram prefix: banned tokens}}}
+        self._ngram_tables = {}
+
+    def _build_ngram_table(self, tokens):
+        ngram_table = {}
+        for ngram in zip(*[tokens[i:] for i in range(self.ngram_size)]):
+            prev_ngram_tuple = ngram[:-1]
+            ngram_table[prev_ngram_tuple] = ngram_table.get(prev_ngram_tuple, ()) + (ngram[-1],)
+        return ngram_table
+
+    def _get_ngram_tables(self, input_ids: np.ndarray):
+        cur_len = input_ids.shape[-1]
+        prev_tables = self._ngram_tables.get(cur_len - 1, {})
+        # the groups of group beam search are processed one by one with the same length
+        cur_tables = self._ngram_tables.get(cur_len, {})
+
+        parent_keys = [row[:-1].tobytes() for row in input_ids]
+        num_children = Counter(parent_keys)
+        ngram_tables = []
+        for row, parent_key in zip(input_ids, parent_keys):
+            num_children[parent_key] -= 1
+            # the last child takes over the table of its parent, the others copy it
+            if num_children[parent_key] == 0:
+                parent_table = prev_tables.pop(parent_key, None)
+            else:
+                parent_table = prev_tables.get(parent_key, None)
+
+            key = row.tobytes()
+            ngram_table = cur_tables.get(key, None)
+            if ngram_table is None:
+                if parent_table is None:
+                    ngram_table = self._build_ngram_table(row.tolist())
+                else:
+                    ngram_table = parent_table if num_children[parent_key] == 0 else dict(parent_table)
+                    if cur_len >= self.ngram_size:
+                        prev_ngram_tuple = tuple(row[cur_len - self.ngram_size : -1].tolist())
+                        ngram_table[prev_ngram_tuple] = ngram_table.get(prev_ngram_tuple, ()) + (int(row[-1]),)
+                cur_tables[key] = ngram_table
+            ngram_tables.append(ngram_table)
+
+        self._ngram_tables = {cur_len - 1: prev_tables, cur_len: cur_tables}
+        return ngram_tables
 
     def __call__(self, input_ids: paddle.Tensor, scores: paddle.Tensor):
-        num_batch_hypotheses = scores.shape[0]
         cur_len = input_ids.shape[-1]
-        banned_batch_tokens = _calc_banned_ngram_tokens(self.ngram_size, input_ids, num_batch_hypotheses, cur_len)
+        prev_input_ids = input_ids.numpy()
+        ngram_tables = self._get_ngram_tables(prev_input_ids)
+        if cur_len + 1 < self.ngram_size:
+            # no banned tokens if we haven't generated no_repeat_ngram_size tokens yet
+            return scores
 
-        for i, banned_tokens in enumerate(banned_batch_tokens):
-            if len(banned_tokens) == 0:
-                continue
-            scores[i, banned_tokens] = paddle.finfo(scores.dtype).min
+        banned_rows, banned_tokens = [], []
+        start_idx = cur_len + 1 - self.ngram_size
+        for i, (row, ngram_table) in enumerate(zip(prev_input_ids, ngram_tables)):
+            tokens = ngram_table.get(tuple(row[start_idx:].tolist()), ())
+            banned_rows.extend([i] * len(tokens))
+            banned_tokens.extend(tokens)
+        if len(banned_tokens) == 0:
+            return scores
 
-        return scores
+        index = np.array(banned_rows, dtype="int64") * scores.shape[-1] + np.array(banned_tokens, dtype="int64")
+        index = paddle.to_tensor(index)
+        updates = paddle.full(index.shape, paddle.finfo(scores.dtype).min, dtype=scores.dtype)
+        return paddle.scatter(scores.flatten(), index, updates).reshape(scores.shape)
 
 
 class HammingDiversityLogitsProcessor(LogitsProcessor):
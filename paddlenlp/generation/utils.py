@@ -507,6 +507,69 @@ class GenerationMixin(object):
 
         return model_kwargs
 
+    def init_static_cache(self, batch_size, max_length):
+        """
+        Returns the `StaticCache` of `max_length` tokens used by `cache_implementation="static"`.
+        Models supporting static cache should implement this method.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support `cache_implementation='static'`, "
+            "please implement `init_static_cache` to use it."
+        )
+
+    def prepare_static_cache_for_generation(self, input_ids, max_length, pad_token_id, model_kwargs):
+        # Preallocate the cache, the ids and the attention mask of `max_length` tokens, which are
+        # updated in place by `update_model_kwargs_for_static_generation` during decoding.
+        if model_kwargs.get("past_key_values", None) is not None or model_kwargs.get("cache", None) is not None:
+            raise ValueError("`past_key_values` can not be passed when `cache_implementation` is 'static'.")
+        if max_length is None:
+            raise ValueError("`max_length` must be set when `cache_implementation` is 'static'.")
+
+        batch_size, cur_len = input_ids.shape
+        model_kwargs["past_key_values"] = self.init_static_cache(batch_size, max_length)
+        model_kwargs["use_cache"] = True
+
+        attention_mask = paddle.zeros([batch_size, max_length], dtype="int64")
+        prompt_attention_mask = model_kwargs.get("attention_mask", None)
+        if prompt_attention_mask is None:
+            attention_mask[:, :cur_len] = 1
+        else:
+            if len(prompt_attention_mask.shape) == 4:
+                # [batch_size, 1, 1, seq_len] made by `prepare_attention_mask_for_generation`
+                if prompt_attention_mask.shape[1] != 1 or prompt_attention_mask.shape[2] != 1:
+                    raise ValueError(
+                        "Only 2-D attention_mask or 4-D attention_mask with shape [batch_size, 1, 1, seq_len] "
+                        "is supported when `cache_implementation` is 'static'."
+                    )
+                prompt_attention_mask = prompt_attention_mask[:, 0, 0, :]
+                if "float" in convert_dtype(prompt_attention_mask.dtype):
+                    prompt_attention_mask = prompt_attention_mask == 0
+            attention_mask[:, :cur_len] = prompt_attention_mask.astype("int64")
+        model_kwargs["attention_mask"] = attention_mask
+
+        if model_kwargs.get("position_ids", None) is None:
+            model_kwargs["position_ids"] = paddle.arange(cur_len, dtype="int64").expand([batch_size, cur_len])
+
+        input_ids_buffer = paddle.full(
+            [batch_size, max_length], pad_token_id if pad_token_id is not None else 0, dtype=input_ids.dtype
+        )
+        input_ids_buffer[:, :cur_len] = input_ids
+        return input_ids_buffer, model_kwargs
+
+    @staticmethod
+    def update_model_kwargs_for_static_generation(outputs, model_kwargs, cur_len):
+        # The static cache is updated in place by the model, only the attention mask of
+        # the new token and the position ids are updated here.
+        if isinstance(outputs, tuple) and len(outputs) > 1 and not isinstance(outputs[1], paddle.Tensor):
+            model_kwargs["past_key_values"] = outputs[1]
+        if isinstance(outputs, ModelOutput) and "past_key_values" in outputs:
+            model_kwargs["past_key_values"] = outputs.past_key_values
+
+        model_kwargs["attention_mask"][:, cur_len - 1] = 1
+        position_ids = model_kwargs["position_ids"]
+        model_kwargs["position_ids"] = position_ids[..., -1:] + 1
+        return model_kwargs
+
     @staticmethod
     def update_scores_for_generation(scores, next_scores, length, unfinished_flag):
         # update scores
@@ -918,6 +981,19 @@ class GenerationMixin(object):
 
         stopping_criteria = stopping_criteria if stopping_criteria is not None else StoppingCriteriaList()
 
+        if generation_config.cache_implementation not in [None, "static"]:
+            raise ValueError(
+                "`cache_implementation` must be None or 'static' but received {}.".format(
+                    generation_config.cache_implementation
+                )
+            )
+        if generation_config.cache_implementation == "static" and (
+            generation_config.decode_strategy == "beam_search" or synced_gpus
+        ):
+            raise ValueError(
+                "`cache_implementation='static'` only supports greedy search and sampling without `synced_gpus`."
+            )
+
         if generation_config.decode_strategy == "greedy_search":
             if generation_config.num_return_sequences > 1:
                 raise ValueError(
@@ -935,6 +1011,7 @@ class GenerationMixin(object):
                 fast_ptq_sampling=generation_config.fast_ptq_sampling,
                 trunc_input=generation_config.trunc_input,
                 synced_gpus=synced_gpus,
+                cache_implementation=generation_config.cache_implementation,
                 **model_kwargs,
             )
 
@@ -958,6 +1035,7 @@ class GenerationMixin(object):
                 fast_ptq_sampling=generation_config.fast_ptq_sampling,
                 trunc_input=generation_config.trunc_input,
                 synced_gpus=synced_gpus,
+                cache_implementation=generation_config.cache_implementation,
                 **model_kwargs,
             )
 
@@ -1045,6 +1123,7 @@ class GenerationMixin(object):
         fast_ptq_sampling=False,
         trunc_input=True,
         synced_gpus=False,
+        cache_implementation=None,
         **model_kwargs
     ):
         model_kwargs["use_cache"] = model_kwargs.get("use_cache", True)
@@ -1063,6 +1142,10 @@ class GenerationMixin(object):
         origin_len = cur_len
         unfinished_flag = paddle.full([batch_size, 1], True, dtype="bool")
         scores = paddle.full([batch_size, 1], 0.0, dtype=paddle.get_default_dtype())
+        if cache_implementation == "static":
+            input_ids_buffer, model_kwargs = self.prepare_static_cache_for_generation(
+                input_ids, max_length, pad_token_id, model_kwargs
+            )
         generate_end = False
         while True:
             if synced_gpus:
@@ -1106,7 +1189,11 @@ class GenerationMixin(object):
             scores = self.update_scores_for_generation(scores, next_scores, cur_len - origin_len, unfinished_flag)
             cur_len += 1
 
-            input_ids = paddle.concat([input_ids, next_tokens], axis=1)
+            if cache_implementation == "static":
+                input_ids_buffer[:, cur_len - 1 : cur_len] = next_tokens
+                input_ids = input_ids_buffer[:, :cur_len]
+            else:
+                input_ids = paddle.concat([input_ids, next_tokens], axis=1)
             if streamer is not None:
                 if self.config.tensor_parallel_rank == 0:
                     streamer.put(next_tokens.cpu())
@@ -1123,9 +1210,12 @@ class GenerationMixin(object):
             if generate_end and not synced_gpus:
                 break
 
-            model_kwargs = self.update_model_kwargs_for_generation(
-                outputs, model_kwargs, is_encoder_decoder=self.config.is_encoder_decoder
-            )
+            if cache_implementation == "static":
+                model_kwargs = self.update_model_kwargs_for_static_generation(outputs, model_kwargs, cur_len)
+            else:
+                model_kwargs = self.update_model_kwargs_for_generation(
+                    outputs, model_kwargs, is_encoder_decoder=self.config.is_encoder_decoder
+                )
             if fast_ptq_sampling:
                 break
 
@@ -1150,6 +1240,7 @@ class GenerationMixin(object):
         fast_ptq_sampling=False,
         trunc_input=True,
         synced_gpus=False,
+        cache_implementation=None,
         **model_kwargs
     ):
         model_kwargs["use_cache"] = model_kwargs.get("use_cache", True)
@@ -1169,6 +1260,10 @@ class GenerationMixin(object):
         origin_len = cur_len
         unfinished_flag = paddle.full([batch_size, 1], True, dtype="bool")
         scores = paddle.full([batch_size, 1], 0.0, dtype=paddle.get_default_dtype())
+        if cache_implementation == "static":
+            input_ids_buffer, model_kwargs = self.prepare_static_cache_for_generation(
+                input_ids, max_length, pad_token_id, model_kwargs
+            )
 
         generate_end = False
         while True:
@@ -1250,7 +1345,11 @@ class GenerationMixin(object):
             scores = self.update_scores_for_generation(scores, next_scores, cur_len - origin_len, unfinished_flag)
 
             cur_len += 1
-            input_ids = paddle.concat([input_ids, next_tokens], axis=1)
+            if cache_implementation == "static":
+                input_ids_buffer[:, cur_len - 1 : cur_len] = next_tokens
+                input_ids = input_ids_buffer[:, :cur_len]
+            else:
+                input_ids = paddle.concat([input_ids, next_tokens], axis=1)
             if streamer is not None:
                 if self.config.tensor_parallel_rank == 0:
                     streamer.put(next_tokens.cpu())
@@ -1267,9 +1366,12 @@ class GenerationMixin(object):
             if generate_end and not synced_gpus:
                 break
 
-            model_kwargs = self.update_model_kwargs_for_generation(
-                outputs, model_kwargs, is_encoder_decoder=self.is_encoder_decoder
-            )
+            if cache_implementation == "static":
+                model_kwargs = self.update_model_kwargs_for_static_generation(outputs, model_kwargs, cur_len)
+            else:
+                model_kwargs = self.update_model_kwargs_for_generation(
+                    outputs, model_kwargs, is_encoder_decoder=self.is_encoder_decoder
+                )
             if fast_ptq_sampling:
                 break
 
@@ -31,6 +31,11 @@ class MergeConfig:
         default="np", metadata={"help": "Tensor type to use for the merge. Choose np(CPU Only) or pd (CPU/GPU)"}
     )
     n_process: int = field(default=1, metadata={"help": "Number of processes to use for the merge."})
+    n_thread: int = field(default=1, metadata={"help": "Number of threads of each process to merge the tensors."})
+    max_shard_size: Optional[str] = field(
+        default=None,
+        metadata={"help": "Max size of each merged safetensors shard, e.g. '5GB'. Defaults to one shard per process."},
+    )
     merge_prefix: str = field(default="model", metadata={"help": "Prefix name: model or master_weights"})
     merge_method: str = field(default="linear", metadata={"help": "The merge strategy."})
     merge_type: str = field(default="linear", metadata={"help": "The type of merge process."})
@@ -75,6 +80,8 @@ class MergeConfig:
     def config_check(self):
         if self.output_path is not None:
             os.makedirs(self.output_path, exist_ok=True)
+        if self.n_thread < 1:
+            raise ValueError(f"n_thread must be positive, but got {self.n_thread}.")
         if self.tensor_type not in ["np", "pd"]:
             raise ValueError(f"Unsupported tensor type: {self.tensor_type}. Support 'np' and 'pd' only.")
         if self.lora_model_path is not None:
@@ -11,10 +11,13 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import collections
+import contextlib
 import json
 import math
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from multiprocessing import Process
 
 import numpy as np
@@ -25,6 +28,7 @@ from safetensors.numpy import save_file
 
 from paddlenlp.peft import LoRAConfig
 from paddlenlp.utils import device_guard
+from paddlenlp.utils.distributed import convert_file_size_to_int
 from paddlenlp.utils.env import (
     LORA_WEIGHTS_NAME,
     PADDLE_MASTER_WEIGHTS_NAME,
@@ -36,7 +40,7 @@ from paddlenlp.utils.env import (
     SAFE_WEIGHTS_NAME,
 )
 from paddlenlp.utils.log import logger
-from paddlenlp.utils.safetensors import fast_safe_open
+from paddlenlp.utils.safetensors import SafeTensorsWriter, fast_safe_open
 
 from .merge_method import MergeMethod
 from .merge_utils import divide_lora_key_list, divide_positions
@@ -309,156 +313,184 @@ class MergeModel:
         index = {}
         index["metadata"] = index_list[0]["metadata"]
         index["metadata"]["total_size"] = int(index["metadata"]["total_size"])
-        index["weight_map"] = {}
         num = self.merge_config.n_process if self.is_cpu else dist.get_world_size()
         key_list = list(index_list[0]["weight_map"].keys())
-        positions = divide_positions(len(key_list), num)
-        if not self.is_cpu:
-            rank = dist.get_rank()
-            file_list = sorted(list(set(index_list[0]["weight_map"].values())))
-            if file_type_list[0] == "safetensors" and len(file_list) >= num:
-                positions = divide_positions(len(file_list), num)
-                index["weight_map"] = index_list[0]["weight_map"]
-                file_map = {}
-                for key in key_list:
-                    if index["weight_map"][key] not in file_map:
-                        file_map[index["weight_map"][key]] = [key]
-                    else:
-                        file_map[index["weight_map"][key]].append(key)
-                for shard_file in file_list[positions[rank] : positions[rank + 1]]:
-                    if self.merge_config.tensor_type == "np":
-                        self.shard_merge_np(file_map[shard_file], index_list, shard_file)
-                    else:
-                        self.shard_merge_pd(file_map[shard_file], index_list, shard_file)
-            else:
-                local_keys = key_list[positions[rank] : positions[rank + 1]]
-                shard_file = (
-                    f"{self.merge_config.merge_prefix}-{rank+1:05d}-of-{dist.get_world_size():05d}.safetensors"
-                )
-                if self.merge_config.tensor_type == "np":
-                    self.shard_merge_np(local_keys, index_list, shard_file)
-                else:
-                    self.shard_merge_pd(local_keys, index_list, shard_file)
-
-                for i in range(len(positions) - 1):
-                    shard_file = (
-                        f"{self.merge_config.merge_prefix}-{i+1:05d}-of-{dist.get_world_size():05d}.safetensors"
-                    )
-                    for k in key_list[positions[i] : positions[i + 1]]:
-                        index["weight_map"][k] = shard_file
+        file_list = sorted(list(set(index_list[0]["weight_map"].values())))
+        # Plan the output shards of each process (rank), a list of (shard_file, key_list)
+        if not self.is_cpu and file_type_list[0] == "safetensors" and len(file_list) >= num:
+            file_map = {}
+            for key in key_list:
+                file_map.setdefault(index_list[0]["weight_map"][key], []).append(key)
+            positions = divide_positions(len(file_list), num)
+            shard_plans = [
+                [(shard_file, file_map[shard_file]) for shard_file in file_list[positions[i] : positions[i + 1]]]
+                for i in range(num)
+            ]
         else:
-            threads = []
-            for i in range(len(positions) - 1):
-                shard_file = (
-                    f"{self.merge_config.merge_prefix}-{i+1:05d}-of-{self.merge_config.n_process:05d}.safetensors"
-                )
-                t = Process(
-                    target=self.shard_merge_np if self.merge_config.tensor_type == "np" else self.shard_merge_pd,
-                    args=(
-                        key_list[positions[i] : positions[i + 1]],  # key_list
-                        index_list,  # index_list
-                        shard_file,  # shard_file name
-                    ),
-                )
-                threads.append(t)
-                for k in key_list[positions[i] : positions[i + 1]]:
-                    index["weight_map"][k] = shard_file
+            positions = divide_positions(len(key_list), num)
+            shard_plans = [
+                [
+                    (
+                        f"{self.merge_config.merge_prefix}-{i+1:05d}-of-{num:05d}.safetensors",
+                        key_list[positions[i] : positions[i + 1]],
+                    )
+                ]
+                for i in range(num)
+            ]
+        if self.merge_config.max_shard_size is not None:
+            tensor_sizes = self.get_safetensor_sizes(model_path_list[0], index_list[0])
+            shard_plans = self.split_shard_plans(shard_plans, tensor_sizes)
+        index["weight_map"] = {key: shard_file for plan in shard_plans for shard_file, keys in plan for key in keys}
 
-            for t in threads:
-                t.start()
-            for t in threads:
-                t.join()
+        # The index is only written once every shard is merged
+        if not self.is_cpu:
+            error = None
+            try:
+                self.shard_merge(shard_plans[dist.get_rank()], index_list)
+            except Exception as e:
+                error = e
+            num_failed = paddle.to_tensor([0 if error is None else 1], dtype="int32")
+            if dist.get_world_size() > 1:
+                # every rank reaches the all_reduce, so a failure on any rank stops rank 0 from writing the index
+                dist.all_reduce(num_failed)
+            if error is not None:
+                raise error
+            if int(num_failed.item()) > 0:
+                raise RuntimeError(f"Merging failed on {int(num_failed.item())} ranks, the index file is not saved.")
+        else:
+            processes = []
+            for plan in shard_plans:
+                p = Process(target=self.shard_merge, args=(plan, index_list))
+                processes.append(p)
+            for p in processes:
+                p.start()
+            for p in processes:
+                p.join()
+            failed = [f"process {i} exited with code {p.exitcode}" for i, p in enumerate(processes) if p.exitcode != 0]
+            if failed:
+                raise RuntimeError(f"Merging failed: {', '.join(failed)}, the index file is not saved.")
         # Save safe index file
         if paddle.distributed.get_rank() == 0:
             save_index_file = os.path.join(self.merge_config.output_path, self.safe_index_name())
             with open(save_index_file, "w", encoding="utf-8") as f:
                 f.write(json.dumps(index, indent=2) + "\n")
 
-    def shard_merge_np(
-        self,
-        key_list,
-        index_list,
-        shard_file,
-    ):
-        merge_state_dict = {}
-        for k in key_list:
-            tensor_list = []
-            for i, model_path in enumerate(self.merge_config.model_path_list):
-                with fast_safe_open(os.path.join(model_path, index_list[i]["weight_map"][k]), framework="np") as w:
-                    tensor = w.get_tensor(k)
-                    dtype = tensor.dtype
-                    # dtype==bfloat16: numpy(uint16) -> paddle(bfloat16) -> paddle(float32) -> numpy(float32)
-                    if tensor.dtype == np.uint16:
-                        tensor = paddle.Tensor(tensor, zero_copy=True).astype("float32").numpy()
-                    tensor_list.append(tensor)
-            if self.merge_config.base_model_path is not None:
-                with fast_safe_open(
-                    os.path.join(self.merge_config.base_model_path, index_list[-1]["weight_map"][k]),
-                    framework="np",
-                ) as w:
-                    base_tensor = w.get_tensor(k)
-                    if base_tensor.dtype == np.uint16:
-                        base_tensor = paddle.Tensor(base_tensor, zero_copy=True).astype("float32").numpy()
-                tensor_list = [tensor - base_tensor for tensor in tensor_list]
-            merge_state_dict[k] = self.merge_method.merge(tensor_list)
-            if self.merge_config.base_model_path is not None:
-                merge_state_dict[k] += base_tensor
-            # dtype==bfloat16: numpy(float32) -> paddle(float32) -> paddle(bfloat16) -> numpy(uint16)
-            if dtype == np.uint16:
-                merge_state_dict[k] = paddle.Tensor(merge_state_dict[k], zero_copy=True).astype("bfloat16").numpy()
-        save_file(
-            merge_state_dict,
-            os.path.join(self.merge_config.output_path, shard_file),
-            metadata={"format": "np"},
-        )
-
-    def shard_merge_pd(
-        self,
-        key_list,
-        index_list,
-        shard_file,
-    ):
-        merge_state_dict = {}
-        for k in key_list:
-            tensor_list = []
-            for i, model_path in enumerate(self.merge_config.model_path_list):
-                with fast_safe_open(os.path.join(model_path, index_list[i]["weight_map"][k]), framework="np") as w:
-                    tensor_list.append(w.get_tensor(k))
-            if self.merge_config.base_model_path is not None:
-                with fast_safe_open(
-                    os.path.join(self.merge_config.base_model_path, index_list[-1]["weight_map"][k]),
-                    framework="np",
-                ) as w:
-                    tensor_list.append(w.get_tensor(k))
-            is_bf16 = str(tensor_list[0].dtype) == "uint16"
-            tensor_mem = int(np.prod(tensor_list[0].shape) * self.numpy_dtype_map[str(tensor_list[0].dtype)]) / (
-                1024**3
-            )
-            if tensor_mem > self.merge_config.max_tensor_mem:
-                tensor_split_list = [
-                    np.array_split(tensor, self.merge_config.split_pieces, axis=0) for tensor in tensor_list
-                ]
-                merge_split = []
-                for sp in range(self.merge_config.split_pieces):
-                    tensor_list = [tensor_split[sp] for tensor_split in tensor_split_list]
-                    if is_bf16:
-                        tensor_list = [
-                            paddle.Tensor(tensor, zero_copy=True).astype("float32") for tensor in tensor_list
-                        ]
-                    else:
-                        tensor_list = [paddle.Tensor(tensor, zero_copy=True) for tensor in tensor_list]
-                    if self.merge_config.base_model_path is not None:
-                        base_tensor = tensor_list.pop()
-                        tensor_list = [tensor - base_tensor for tensor in tensor_list]
-                    merge_tensor = self.merge_method.merge(tensor_list)
-                    if self.merge_config.base_model_path is not None:
-                        merge_tensor += base_tensor
-                    if is_bf16:
-                        merge_split.append(merge_tensor.astype("bfloat16").numpy())
-                    else:
-                        merge_split.append(merge_tensor.numpy())
-                merge_state_dict[k] = np.concatenate(merge_split, axis=0)
-            else:
+    def get_safetensor_sizes(self, model_path, index):
+        tensor_sizes = {}
+        for file in set(index["weight_map"].values()):
+            with fast_safe_open(os.path.join(model_path, file), framework="np") as f:
+                for key in f.keys():
+                    tensor_sizes[key] = int(f.get_slice(key).nbytes)
+        return tensor_sizes
+
+    def split_shard_plans(self, shard_plans, tensor_sizes):
+        """Splits the output shards of every process by `max_shard_size` and renames all of them in order."""
+        max_shard_size = convert_file_size_to_int(self.merge_config.max_shard_size)
+        split_key_lists = []
+        for plan in shard_plans:
+            key_lists, shard_size = [], 0
+            for _, keys in plan:
+                for key in keys:
+                    if not key_lists or (shard_size + tensor_sizes[key] > max_shard_size and key_lists[-1]):
+                        key_lists.append([])
+                        shard_size = 0
+                    key_lists[-1].append(key)
+                    shard_size += tensor_sizes[key]
+            split_key_lists.append(key_lists)
+
+        total = sum(len(key_lists) for key_lists in split_key_lists)
+        shard_plans = []
+        shard_id = 0
+        for key_lists in split_key_lists:
+            plan = []
+            for keys in key_lists:
+                shard_id += 1
+                plan.append((f"{self.merge_config.merge_prefix}-{shard_id:05d}-of-{total:05d}.safetensors", keys))
+            shard_plans.append(plan)
+        return shard_plans
+
+    def shard_merge(self, shard_plan, index_list):
+        """
+        Merges the tensors into the safetensors shards of `shard_plan`, a list of `(shard_file, key_list)`.
+
+        Every source shard is opened once. The tensors are read key by key, merged by a pool of `n_thread`
+        threads and streamed into the output shards in order, so only the tensors in flight are held in
+        memory instead of the whole shard.
+        """
+        model_path_list = self.merge_config.model_path_list.copy()
+        if self.merge_config.base_model_path is not None:
+            model_path_list += [self.merge_config.base_model_path]
+        merge_fn = self.merge_tensor_np if self.merge_config.tensor_type == "np" else self.merge_tensor_pd
+        n_thread = self.merge_config.n_thread
+
+        with contextlib.ExitStack() as stack:
+            safe_files = {}
+
+            def get_slice(i, key):
+                path = os.path.join(model_path_list[i], index_list[i]["weight_map"][key])
+                if path not in safe_files:
+                    safe_files[path] = stack.enter_context(fast_safe_open(path, framework="np"))
+                return safe_files[path].get_slice(key)
+
+            def load_tensors(key):
+                # the source tensors are copied since the sparsify methods modify them in place
+                return [get_slice(i, key).get() for i in range(len(model_path_list))]
+
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=n_thread)) if n_thread > 1 else None
+
+            def merged_tensors(key_list):
+                if executor is None:
+                    for key in key_list:
+                        yield key, merge_fn(load_tensors(key))
+                    return
+                pending = collections.deque()
+                for key in key_list:
+                    pending.append((key, executor.submit(merge_fn, load_tensors(key))))
+                    if len(pending) >= 2 * n_thread:
+                        key, future = pending.popleft()
+                        yield key, future.result()
+                while pending:
+                    key, future = pending.popleft()
+                    yield key, future.result()
+
+            for shard_file, key_list in shard_plan:
+                tensor_infos = {key: (get_slice(0, key).dtype, get_slice(0, key).shape) for key in key_list}
+                with SafeTensorsWriter(
+                    os.path.join(self.merge_config.output_path, shard_file), tensor_infos, metadata={"format": "np"}
+                ) as writer:
+                    for key, tensor in merged_tensors(key_list):
+                        writer.write(key, tensor.astype(tensor_infos[key][0], copy=False))
+
+    def merge_tensor_np(self, tensor_list):
+        """Merges the numpy tensors of a key, the tensor of the base model is the last one if it is given."""
+        dtype = tensor_list[0].dtype
+        # dtype==bfloat16: numpy(uint16) -> paddle(bfloat16) -> paddle(float32) -> numpy(float32)
+        tensor_list = [
+            paddle.Tensor(tensor, zero_copy=True).astype("float32").numpy() if tensor.dtype == np.uint16 else tensor
+            for tensor in tensor_list
+        ]
+        if self.merge_config.base_model_path is not None:
+            base_tensor = tensor_list.pop()
+            tensor_list = [tensor - base_tensor for tensor in tensor_list]
+        merge_tensor = self.merge_method.merge(tensor_list)
+        if self.merge_config.base_model_path is not None:
+            merge_tensor += base_tensor
+        # dtype==bfloat16: numpy(float32) -> paddle(float32) -> paddle(bfloat16) -> numpy(uint16)
+        if dtype == np.uint16:
+            merge_tensor = paddle.Tensor(merge_tensor, zero_copy=True).astype("bfloat16").numpy()
+        return merge_tensor
+
+    def merge_tensor_pd(self, tensor_list):
+        """Merges the tensors of a key with paddle, the tensor of the base model is the last one if it is given."""
+        is_bf16 = str(tensor_list[0].dtype) == "uint16"
+        tensor_mem = int(np.prod(tensor_list[0].shape) * self.numpy_dtype_map[str(tensor_list[0].dtype)]) / (1024**3)
+        if tensor_mem > self.merge_config.max_tensor_mem:
+            tensor_split_list = [
+                np.array_split(tensor, self.merge_config.split_pieces, axis=0) for tensor in tensor_list
+            ]
+            merge_split = []
+            for sp in range(self.merge_config.split_pieces):
+                tensor_list = [tensor_split[sp] for tensor_split in tensor_split_list]
                 if is_bf16:
                     tensor_list = [paddle.Tensor(tensor, zero_copy=True).astype("float32") for tensor in tensor_list]
                 else:
@@ -470,14 +502,24 @@ class MergeModel:
                 if self.merge_config.base_model_path is not None:
                     merge_tensor += base_tensor
                 if is_bf16:
-                    merge_state_dict[k] = merge_tensor.astype("bfloat16").numpy()
+                    merge_split.append(merge_tensor.astype("bfloat16").numpy())
                 else:
-                    merge_state_dict[k] = merge_tensor.numpy()
-        save_file(
-            merge_state_dict,
-            os.path.join(self.merge_config.output_path, shard_file),
-            metadata={"format": "np"},
-        )
+                    merge_split.append(merge_tensor.numpy())
+            return np.concatenate(merge_split, axis=0)
+
+        if is_bf16:
+            tensor_list = [paddle.Tensor(tensor, zero_copy=True).astype("float32") for tensor in tensor_list]
+        else:
+            tensor_list = [paddle.Tensor(tensor, zero_copy=True) for tensor in tensor_list]
+        if self.merge_config.base_model_path is not None:
+            base_tensor = tensor_list.pop()
+            tensor_list = [tensor - base_tensor for tensor in tensor_list]
+        merge_tensor = self.merge_method.merge(tensor_list)
+        if self.merge_config.base_model_path is not None:
+            merge_tensor += base_tensor
+        if is_bf16:
+            return merge_tensor.astype("bfloat16").numpy()
+        return merge_tensor.numpy()
 
     def check_model_path(self, model_path, lora_merge=False):
         if os.path.exists(os.path.join(model_path, self.safe_index_name())):
@@ -0,0 +1,243 @@
+# coding:utf-8
+# Copyright (c) 2024  PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from ..utils.log import logger
+
+BATCHABLE_KEYS = {"text", "text_pair"}
+
+
+def _as_list(text):
+    return [text] if isinstance(text, str) else list(text)
+
+
+def default_length_fn(data):
+    """Estimates the number of tokens of every example in `data` by its number of characters."""
+    text = _as_list(data["text"])
+    text_pair = data.get("text_pair")
+    if text_pair is None:
+        return [len(t) for t in text]
+    return [len(t) + len(p) for t, p in zip(text, _as_list(text_pair))]
+
+
+class _BatchRequest:
+    def __init__(self, data, parameters, lengths):
+        self.data = data
+        self.parameters = parameters
+        self.lengths = lengths
+        self.future = Future()
+        # only the requests with the same parameters and kind of inputs can be merged
+        has_pair = data.get("text_pair") is not None
+        self.key = json.dumps([parameters, has_pair], sort_keys=True, default=str)
+
+    @property
+    def num_examples(self):
+        return len(self.lengths)
+
+    @property
+    def max_length(self):
+        return max(self.lengths) if self.lengths else 0
+
+
+class BatchScheduler:
+    """
+    Merges the concurrent requests of a model server into one padded batch.
+
+    The requests are queued and collected by the worker threads until `max_batch_size` examples
+    are gathered or the first request has waited for `max_wait_ms`. The examples of the merged
+    requests are predicted by one call of `process_fn` and the results are scattered back to the
+    callers. Only the requests with the same `parameters` are merged together and the requests
+    whose `data` has other fields than `text` and `text_pair` are predicted alone.
+
+    Args:
+        process_fn (callable): Function to predict the merged `(data, parameters)`, it returns a dict.
+        per_example_keys (list[str]): The keys of the outputs of `process_fn` that are lists with one item
+            for each example, which are split between the merged requests. The other outputs are given
+            to every merged request as they are.
+        max_batch_size (int, optional): The max number of examples of a merged batch. Defaults to 32.
+        max_wait_ms (float, optional): The max time in milliseconds a request waits for others. Defaults to 5.
+        max_tokens (int, optional): The max number of tokens of a padded batch, i.e. number of examples
+            multiplied by the longest one. Defaults to None, which means unlimited.
+        length_fn (callable, optional): Function to get the length of every example of `data`.
+            Defaults to `default_length_fn`.
+        num_workers (int, optional): The number of worker threads, usually the number of predictors. Defaults to 1.
+    """
+
+    def __init__(
+        self,
+        process_fn,
+        per_example_keys,
+        max_batch_size=32,
+        max_wait_ms=5,
+        max_tokens=None,
+        length_fn=None,
+        num_workers=1,
+    ):
+        if max_batch_size < 1:
+            raise ValueError(f"`max_batch_size` must be positive, but got {max_batch_size}.")
+        self._process_fn = process_fn
+        self._per_example_keys = set(per_example_keys)
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait_ms / 1000.0
+        self._max_tokens = max_tokens
+        self._length_fn = length_fn or default_length_fn
+        self._queue = queue.Queue()
+        # the requests taken from the queue that did not fit into the previous batch
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._closed = False
+        self._workers = []
+        for i in range(num_workers):
+            worker = threading.Thread(target=self._run, name=f"BatchScheduler-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    @staticmethod
+    def is_batchable(data):
+        return isinstance(data, dict) and data.get("text") is not None and set(data.keys()) <= BATCHABLE_KEYS
+
+    def submit(self, data, parameters):
+        """Queues a request and returns the `concurrent.futures.Future` of its result."""
+        if self._closed:
+            raise RuntimeError("The BatchScheduler has been closed.")
+        parameters = parameters or {}
+        if not self.is_batchable(data):
+            future = Future()
+            try:
+                future.set_result(self._process_fn(data, parameters))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        request = _BatchRequest(data, parameters, self._length_fn(data))
+        self._queue.put(request)
+        return request.future
+
+    def predict(self, data, parameters):
+        return self.submit(data, parameters).result()
+
+    def close(self):
+        """Predicts the queued requests, then stops the worker threads."""
+        self._closed = True
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        # the requests queued after the workers stopped
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None:
+                request.future.set_exception(RuntimeError("The BatchScheduler has been closed."))
+
+    def _fits(self, batch, request):
+        num_examples = sum(r.num_examples for r in batch) + request.num_examples
+        if num_examples > self._max_batch_size:
+            return False
+        if self._max_tokens is not None:
+            max_length = max([r.max_length for r in batch] + [request.max_length])
+            if num_examples * max_length > self._max_tokens:
+                return False
+        return True
+
+    def _next_request(self, timeout):
+        with self._pending_lock:
+            if self._pending:
+                return self._pending.pop(0)
+        try:
+            if timeout is None:
+                return self._queue.get()
+            return self._queue.get(timeout=max(timeout, 0))
+        except queue.Empty:
+            return None
+
+    def _collect(self):
+        first = self._next_request(None)
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self._max_wait
+        skipped = []
+        while sum(r.num_examples for r in batch) < self._max_batch_size:
+            request = self._next_request(deadline - time.monotonic())
+            if request is None:
+                if self._closed:
+                    self._queue.put(None)
+                break
+            if request.key == first.key and self._fits(batch, request):
+                batch.append(request)
+            else:
+                skipped.append(request)
+                if request.key == first.key:
+                    # the batch is full for the requests of the same parameters
+                    break
+        if skipped:
+            with self._pending_lock:
+                self._pending = skipped + self._pending
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            self._process_batch(batch)
+
+    def _process_batch(self, batch):
+        if len(batch) == 1:
+            request = batch[0]
+            try:
+                request.future.set_result(self._process_fn(request.data, request.parameters))
+            except Exception as e:
+                request.future.set_exception(e)
+            return
+
+        has_pair = batch[0].data.get("text_pair") is not None
+        text, text_pair = [], []
+        for request in batch:
+            text.extend(_as_list(request.data["text"]))
+            if has_pair:
+                text_pair.extend(_as_list(request.data["text_pair"]))
+        data = {"text": text, "text_pair": text_pair} if has_pair else {"text": text}
+        parameters = dict(batch[0].parameters)
+        parameters["batch_size"] = len(text)
+
+        try:
+            output = self._process_fn(data, parameters)
+            for key in self._per_example_keys & output.keys():
+                if len(output[key]) != len(text):
+                    raise ValueError(
+                        f"The output `{key}` has {len(output[key])} items for a batch of {len(text)} examples."
+                    )
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            return
+        logger.debug("Merged {} requests into a batch of {} examples.".format(len(batch), len(text)))
+
+        start = 0
+        for request in batch:
+            end = start + request.num_examples
+            result = {
+                key: value[start:end] if key in self._per_example_keys else value for key, value in output.items()
+            }
+            request.future.set_result(result)
+            start = end
@@ -27,6 +27,10 @@ class BaseModelHandler(metaclass=ABCMeta):
 
 
 class BasePostHandler(metaclass=ABCMeta):
+    # The keys of the outputs that have one item for each example. Only the post handlers that
+    # set them can be used to merge the requests into batches, see `BatchScheduler`.
+    per_example_keys = None
+
     def __init__(self):
         super().__init__()
 
@@ -12,145 +12,196 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import threading
+from collections import OrderedDict
+
 import numpy as np
 
-from ...data import Pad, Tuple
+from ...data import Pad
 from .base_handler import BaseModelHandler
 
 
+class _EncodeCache:
+    """Thread-safe LRU cache of the encoded inputs of the repeated texts."""
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+
+_encode_cache = _EncodeCache()
+
+
+def _read_inputs(data):
+    text = None
+    if "text" in data:
+        text = data["text"]
+    if text is None:
+        return None, None
+    if isinstance(text, str):
+        text = [text]
+    text_pair = None
+    if "text_pair" in data and data["text_pair"] is not None:
+        text_pair = data["text_pair"]
+        if isinstance(text_pair, str):
+            text_pair = [text_pair]
+        if len(text) != len(text_pair):
+            raise ValueError("The length of text and text_pair must be same.")
+    return text, text_pair
+
+
+def _encode(tokenizer, text, text_pair, max_seq_len, input_names, use_cache=True):
+    """Encodes every example into a tuple of the `input_names` fields, the repeated texts are
+    looked up from the encode cache."""
+    examples = []
+    for idx in range(len(text)):
+        pair = text_pair[idx] if text_pair is not None else None
+        key = (id(tokenizer), max_seq_len, input_names, text[idx], pair)
+        example = _encode_cache.get(key) if use_cache else None
+        if example is None:
+            if pair is not None:
+                result = tokenizer(text=text[idx], text_pair=pair, max_length=max_seq_len)
+            else:
+                result = tokenizer(text=text[idx], max_length=max_seq_len)
+            example = tuple(result[name] for name in input_names)
+            if use_cache:
+                _encode_cache.put(key, example)
+        examples.append(example)
+    return examples
+
+
+def _make_batches(lengths, batch_size, max_tokens=None, sort_by_length=True):
+    """Splits the example indices into batches. If `sort_by_length`, the examples of similar lengths
+    are batched together to reduce padding. If `max_tokens` is set, a batch takes examples as long as
+    its padded size (number of examples multiplied by the longest one) is within `max_tokens` instead
+    of a fixed `batch_size`."""
+    indices = np.argsort(lengths, kind="stable").tolist() if sort_by_length else list(range(len(lengths)))
+    if max_tokens is None:
+        return [indices[i : i + batch_size] for i in range(0, len(indices), batch_size)]
+    batches = []
+    batch, longest = [], 0
+    for idx in indices:
+        new_longest = max(longest, lengths[idx])
+        if batch and (len(batch) + 1) * new_longest > max_tokens:
+            batches.append(batch)
+            batch, new_longest = [], lengths[idx]
+        batch.append(idx)
+        longest = new_longest
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _predict_batches(predictor, examples, batches, input_names, pad_vals):
+    """Runs the padded batches and returns the outputs in the original order of `examples`."""
+    pad_fns = [Pad(axis=0, pad_val=pad_val, dtype="int64") for pad_val in pad_vals]
+    results = [[] for _ in range(predictor._output_num)]
+    for batch in batches:
+        inputs = [pad_fn([examples[idx][i] for idx in batch]) for i, pad_fn in enumerate(pad_fns)]
+        if predictor._predictor_type == "paddle_inference":
+            for i, input_data in enumerate(inputs):
+                predictor._input_handles[i].copy_from_cpu(input_data)
+            predictor._predictor.run()
+            output = [output_handle.copy_to_cpu() for output_handle in predictor._output_handles]
+        else:
+            output = predictor._predictor.run(None, dict(zip(input_names, inputs)))
+        for i, out in enumerate(output):
+            results[i].append(out)
+
+    # Restore the original order of the examples
+    order = np.array([idx for batch in batches for idx in batch], dtype="int64")
+    results_concat = []
+    for i in range(0, len(results)):
+        result = np.concatenate(results[i], axis=0)
+        restored = np.empty_like(result)
+        restored[order] = result
+        results_concat.append(restored)
+    return results_concat
+
+
+def _process(predictor, tokenizer, data, parameters, input_names, pad_vals):
+    max_seq_len = 128
+    batch_size = 1
+    max_tokens = None
+    sort_by_length = True
+    use_cache = True
+    if "max_seq_len" in parameters:
+        max_seq_len = parameters["max_seq_len"]
+    if "batch_size" in parameters:
+        batch_size = parameters["batch_size"]
+    if "max_tokens" in parameters:
+        max_tokens = parameters["max_tokens"]
+    if "sort_by_length" in parameters:
+        sort_by_length = parameters["sort_by_length"]
+    if "encode_cache" in parameters:
+        use_cache = parameters["encode_cache"]
+    text, text_pair = _read_inputs(data)
+    if text is None:
+        return {}
+
+    # Get the result of tokenizer
+    examples = _encode(tokenizer, text, text_pair, max_seq_len, input_names, use_cache)
+
+    # Separates data into some batches.
+    lengths = [len(example[0]) for example in examples]
+    batches = _make_batches(lengths, batch_size, max_tokens, sort_by_length)
+    results_concat = _predict_batches(predictor, examples, batches, input_names, pad_vals)
+
+    # Resolve the logits result and get the predict label and confidence
+    out_dict = {"logits": results_concat[0].tolist(), "data": data}
+    for i in range(1, len(results_concat)):
+        out_dict[f"logits_{i}"] = results_concat[i].tolist()
+    return out_dict
+
+
 class CustomModelHandler(BaseModelHandler):
+    """
+    The model handler of the sequence models with `input_ids` and `token_type_ids` inputs.
+
+    Besides `max_seq_len` and `batch_size`, the `parameters` could set `max_tokens` to batch the
+    examples by the padded number of tokens instead of `batch_size`, `sort_by_length` (default True)
+    to batch the examples of similar lengths together and `encode_cache` (default True) to reuse the
+    encoded inputs of the repeated texts. The outputs are always in the order of the inputs.
+    """
+
     def __init__(self):
         super().__init__()
 
     @classmethod
     def process(cls, predictor, tokenizer, data, parameters):
-        max_seq_len = 128
-        batch_size = 1
-        if "max_seq_len" not in parameters:
-            max_seq_len = parameters["max_seq_len"]
-        if "batch_size" not in parameters:
-            batch_size = parameters["batch_size"]
-        text = None
-        if "text" in data:
-            text = data["text"]
-        if text is None:
-            return {}
-        if isinstance(text, str):
-            text = [text]
-        has_pair = False
-        if "text_pair" in data and data["text_pair"] is not None:
-            text_pair = data["text_pair"]
-            if isinstance(text_pair, str):
-                text_pair = [text_pair]
-            if len(text) != len(text_pair):
-                raise ValueError("The length of text and text_pair must be same.")
-            has_pair = True
-
-        # Get the result of tokenizer
-        examples = []
-        for idx, data in enumerate(text):
-            if has_pair:
-                result = tokenizer(text=text[idx], text_pair=text_pair[idx], max_length=max_seq_len)
-            else:
-                result = tokenizer(text=text[idx], max_length=max_seq_len)
-            examples.append((result["input_ids"], result["token_type_ids"]))
-
-        # Separates data into some batches.
-        batches = [examples[i : i + batch_size] for i in range(0, len(examples), batch_size)]
-
-        def batchify_fn(samples):
-            return Tuple(
-                Pad(axis=0, pad_val=tokenizer.pad_token_id, dtype="int64"),
-                Pad(axis=0, pad_val=tokenizer.pad_token_type_id, dtype="int64"),
-            )(samples)
-
-        results = [[]] * predictor._output_num
-        for batch in batches:
-            input_ids, token_type_ids = batchify_fn(batch)
-            if predictor._predictor_type == "paddle_inference":
-                predictor._input_handles[0].copy_from_cpu(input_ids)
-                predictor._input_handles[1].copy_from_cpu(token_type_ids)
-                predictor._predictor.run()
-                output = [output_handle.copy_to_cpu() for output_handle in predictor._output_handles]
-                for i, out in enumerate(output):
-                    results[i].append(out)
-            else:
-                predictor._predictor.run(None, {"input_ids": input_ids, "token_type_ids": token_type_ids})
-                for i, out in enumerate(output):
-                    results[i].append(out)
-
-        # Resolve the logits result and get the predict label and confidence
-        results_concat = []
-        for i in range(0, len(results)):
-            results_concat.append(np.concatenate(results[i], axis=0))
-        out_dict = {"logits": results_concat[0].tolist(), "data": data}
-        for i in range(1, len(results_concat)):
-            out_dict[f"logits_{i}"] = results_concat[i].tolist()
-        return out_dict
+        return _process(
+            predictor,
+            tokenizer,
+            data,
+            parameters,
+            ("input_ids", "token_type_ids"),
+            (tokenizer.pad_token_id, tokenizer.pad_token_type_id),
+        )
 
 
 class ERNIEMHandler(BaseModelHandler):
+    """
+    The model handler of ERNIE-M, which only takes `input_ids`. See `CustomModelHandler` for the `parameters`.
+    """
+
     def __init__(self):
         super().__init__()
 
     @classmethod
     def process(cls, predictor, tokenizer, data, parameters):
-        max_seq_len = 128
-        batch_size = 1
-        if "max_seq_len" not in parameters:
-            max_seq_len = parameters["max_seq_len"]
-        if "batch_size" not in parameters:
-            batch_size = parameters["batch_size"]
-        text = None
-        if "text" in data:
-            text = data["text"]
-        if text is None:
-            return {}
-        if isinstance(text, str):
-            text = [text]
-        has_pair = False
-        if "text_pair" in data and data["text_pair"] is not None:
-            text_pair = data["text_pair"]
-            if isinstance(text_pair, str):
-                text_pair = [text_pair]
-            if len(text) != len(text_pair):
-                raise ValueError("The length of text and text_pair must be same.")
-            has_pair = True
-
-        # Get the result of tokenizer
-        examples = []
-        for idx, data in enumerate(text):
-            if has_pair:
-                result = tokenizer(text=text[idx], text_pair=text_pair[idx], max_length=max_seq_len)
-            else:
-                result = tokenizer(text=text[idx], max_length=max_seq_len)
-            examples.append(result["input_ids"])
-
-        # Separates data into some batches.
-        batches = [examples[i : i + batch_size] for i in range(0, len(examples), batch_size)]
-
-        def batchify_fn(samples):
-            return Pad(axis=0, pad_val=tokenizer.pad_token_id, dtype="int64")(samples)
-
-        results = [[]] * predictor._output_num
-        for batch in batches:
-            input_ids = batchify_fn(batch)
-            if predictor._predictor_type == "paddle_inference":
-                predictor._input_handles[0].copy_from_cpu(input_ids)
-                predictor._predictor.run()
-                output = [output_handle.copy_to_cpu() for output_handle in predictor._output_handles]
-                for i, out in enumerate(output):
-                    results[i].append(out)
-            else:
-                predictor._predictor.run(None, {"input_ids": input_ids})
-                for i, out in enumerate(output):
-                    results[i].append(out)
-
-        # Resolve the logits result and get the predict label and confidence
-        results_concat = []
-        for i in range(0, len(results)):
-            results_concat.append(np.concatenate(results[i], axis=0))
-        out_dict = {"logits": results_concat[0].tolist(), "data": data}
-        for i in range(1, len(results_concat)):
-            out_dict[f"logits_{i}"] = results_concat[i].tolist()
-        return out_dict
+        return _process(predictor, tokenizer, data, parameters, ("input_ids",), (tokenizer.pad_token_id,))
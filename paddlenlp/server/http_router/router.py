@@ -12,15 +12,18 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import asyncio
 import hashlib
+import time
 import typing
 from typing import Optional
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Extra, create_model
 
 from ...utils.log import logger
 from ..base_router import BaseRouterManager
+from ..utils import QueueFullError
 
 
 class ResponseBase(BaseModel):
@@ -29,9 +32,30 @@ class ResponseBase(BaseModel):
 
 class RequestBase(BaseModel, extra=Extra.forbid):
     parameters: Optional[dict] = {}
+    # The max seconds to wait for the result, the request is cancelled if it is still queued after that.
+    timeout: Optional[float] = None
 
 
 class HttpRouterManager(BaseRouterManager):
+    async def _predict(self, predict_fn, inference_request):
+        """Runs `predict_fn` in the bounded executor of the app without blocking the event loop."""
+        timeout = inference_request.timeout
+        if timeout is None:
+            timeout = self._app._request_timeout
+        deadline = time.time() + timeout if timeout is not None else None
+        try:
+            future = self._app._executor.submit(
+                predict_fn, inference_request.data, inference_request.parameters, deadline=deadline
+            )
+        except QueueFullError as e:
+            raise HTTPException(status_code=429, detail=str(e))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except (asyncio.TimeoutError, TimeoutError):
+            # the queued request is dropped, a running one finishes in the background
+            future.cancel()
+            raise HTTPException(status_code=503, detail="The request is not finished before its deadline.")
+
     def register_models_router(self, task_name):
 
         # Url path to register the model
@@ -57,10 +81,14 @@ class HttpRouterManager(BaseRouterManager):
         )
 
         # Template predict endpoint function to dynamically serve different models
-        def predict(request: Request, inference_request: req_model):
-            result = self._app._model_manager.predict(inference_request.data, inference_request.parameters)
+        async def predict(request: Request, inference_request: req_model):
+            result = await self._predict(self._app._model_manager.predict, inference_request)
             return {"result": result}
 
+        # Queue depth, in-flight requests and latencies of the replicas
+        def metrics():
+            return self._app._model_manager.get_metrics()
+
         # Register the route and add to the app
         router = APIRouter()
         for path in paths:
@@ -73,6 +101,7 @@ class HttpRouterManager(BaseRouterManager):
                 response_model_exclude_unset=True,
                 response_model_exclude_none=True,
             )
+            router.add_api_route(path + "/metrics", metrics, methods=["get"], summary=f"{task_name.title()} Metrics")
         self._app.include_router(router)
 
     def register_taskflow_router(self, task_name):
@@ -100,10 +129,14 @@ class HttpRouterManager(BaseRouterManager):
         )
 
         # Template predict endpoint function to dynamically serve different models
-        def predict(request: Request, inference_request: req_model):
-            result = self._app._taskflow_manager.predict(inference_request.data, inference_request.parameters)
+        async def predict(request: Request, inference_request: req_model):
+            result = await self._predict(self._app._taskflow_manager.predict, inference_request)
             return {"result": result}
 
+        # Queue depth, in-flight requests and latencies of the replicas
+        def metrics():
+            return self._app._taskflow_manager.get_metrics()
+
         # Register the route and add to the app
         router = APIRouter()
         for path in paths:
@@ -116,4 +149,5 @@ class HttpRouterManager(BaseRouterManager):
                 response_model_exclude_unset=True,
                 response_model_exclude_none=True,
             )
+            router.add_api_route(path + "/metrics", metrics, methods=["get"], summary=f"{task_name.title()} Metrics")
         self._app.include_router(router)
@@ -13,18 +13,30 @@
 # see the license for the specific language governing permissions and
 # limitations under the license.
 
-import time
-
 from ..transformers import AutoTokenizer
 from ..utils.log import logger
 from ..utils.tools import get_env_device
+from .batch_scheduler import BatchScheduler
 from .handlers import BaseModelHandler, BasePostHandler
 from .predictor import Predictor
-from .utils import lock_predictor
+from .predictor_pool import PredictorPool
 
 
 class ModelManager:
-    def __init__(self, task_name, model_path, tokenizer_name, model_handler, post_handler, precision, device_id):
+    def __init__(
+        self,
+        task_name,
+        model_path,
+        tokenizer_name,
+        model_handler,
+        post_handler,
+        precision,
+        device_id,
+        max_batch_size=None,
+        max_wait_ms=5,
+        max_tokens=None,
+        warmup_data=None,
+    ):
         self._task_name = task_name
         self._model_path = model_path
         self._tokenizer_name = tokenizer_name
@@ -33,7 +45,26 @@ class ModelManager:
         self._precision = precision
         self._device_id = device_id
         self._tokenizer = None
+        self._batch_scheduler = None
+        per_example_keys = getattr(post_handler, "per_example_keys", None)
         self._register()
+        if warmup_data is not None:
+            self._predictor_pool.warmup(self._predict_on, warmup_data, {})
+        if max_batch_size is not None and max_batch_size > 1 and per_example_keys is None:
+            logger.warning(
+                "The requests are not merged into batches, since {} does not set `per_example_keys`.".format(
+                    post_handler.__name__
+                )
+            )
+        elif max_batch_size is not None and max_batch_size > 1:
+            self._batch_scheduler = BatchScheduler(
+                self._predict,
+                per_example_keys,
+                max_batch_size=max_batch_size,
+                max_wait_ms=max_wait_ms,
+                max_tokens=max_tokens,
+                num_workers=len(self._predictor_list),
+            )
 
     def _register(self):
         # Get the model handler
@@ -60,15 +91,10 @@ class ModelManager:
             predictor_list.append(predictor)
         elif isinstance(self._device_id, list):
             for device in self._device_id:
-                predictor = Predictor(
-                    self._model_path,
-                    self._model_class_or_name,
-                    self._input_spec,
-                    self._precision,
-                    "gpu:" + str(device),
-                )
+                predictor = Predictor(self._model_path, self._precision, "gpu:" + str(device))
                 predictor_list.append(predictor)
         self._predictor_list = predictor_list
+        self._predictor_pool = PredictorPool(predictor_list)
 
         # Get the tokenize of model
         self._get_tokenizer()
@@ -81,16 +107,18 @@ class ModelManager:
                 logger.error("The argrument of `tokenizer_name`  must be the name of tokenizer.")
         assert self._tokenizer is not None, "The tokenizer must be not register, you could set the class of Tokenizer"
 
-    def _get_predict_id(self):
-        t = time.time()
-        t = int(round(t * 1000))
-        predictor_id = t % len(self._predictor_list)
-        logger.info("The predictor id: {} is selected by running the model.".format(predictor_id))
-        return predictor_id
-
     def predict(self, data, parameters):
-        predictor_id = self._get_predict_id()
-        with lock_predictor(self._predictor_list[predictor_id]._lock):
-            model_output = self._model_handler(self._predictor_list[predictor_id], self._tokenizer, data, parameters)
-            final_output = self._post_handler(model_output, parameters)
-            return final_output
+        if self._batch_scheduler is not None:
+            return self._batch_scheduler.predict(data, parameters)
+        return self._predict(data, parameters)
+
+    def _predict(self, data, parameters):
+        return self._predictor_pool.run(self._predict_on, data, parameters)
+
+    def _predict_on(self, predictor, data, parameters):
+        model_output = self._model_handler(predictor, self._tokenizer, data, parameters)
+        final_output = self._post_handler(model_output, parameters)
+        return final_output
+
+    def get_metrics(self):
+        return self._predictor_pool.get_metrics()
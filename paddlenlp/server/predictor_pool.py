@@ -0,0 +1,147 @@
+# coding:utf-8
+# Copyright (c) 2024  PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import contextlib
+import threading
+import time
+
+import numpy as np
+
+from ..utils.log import logger
+from .utils import lock_predictor
+
+
+class _ReplicaStats:
+    def __init__(self, window):
+        self.in_flight = 0
+        self.num_requests = 0
+        self.num_errors = 0
+        self.latencies = collections.deque(maxlen=window)
+
+
+class PredictorPool:
+    """
+    Dispatches the requests to a list of replicas, e.g. the predictors or taskflows on different devices.
+
+    A request waits in the queue of the pool until one of the replicas is idle and takes the idle
+    replica which has served the fewest requests, so a busy replica is never chosen while another
+    one is idle. The pool keeps the number of in-flight requests of every replica and the recent
+    latencies, see `get_metrics`.
+
+    Args:
+        replicas (list): The replicas, each of them has a `_lock` which is held while predicting.
+        latency_window (int, optional): The number of recent requests used for the latency metrics.
+            Defaults to 1000.
+    """
+
+    def __init__(self, replicas, latency_window=1000):
+        if len(replicas) == 0:
+            raise ValueError("The PredictorPool needs at least one replica.")
+        self._replicas = list(replicas)
+        self._stats = [_ReplicaStats(latency_window) for _ in self._replicas]
+        self._wait_times = collections.deque(maxlen=latency_window)
+        self._cond = threading.Condition()
+        self._num_waiting = 0
+
+    def __len__(self):
+        return len(self._replicas)
+
+    def __getitem__(self, idx):
+        return self._replicas[idx]
+
+    def _select(self):
+        idle = [i for i, stats in enumerate(self._stats) if stats.in_flight == 0]
+        if not idle:
+            return None
+        return min(idle, key=lambda i: self._stats[i].num_requests)
+
+    @contextlib.contextmanager
+    def acquire(self):
+        """Waits for an idle replica and yields `(replica_id, replica)`."""
+        start_time = time.time()
+        with self._cond:
+            self._num_waiting += 1
+            try:
+                replica_id = self._select()
+                while replica_id is None:
+                    self._cond.wait()
+                    replica_id = self._select()
+            finally:
+                self._num_waiting -= 1
+            stats = self._stats[replica_id]
+            stats.in_flight += 1
+            stats.num_requests += 1
+        self._wait_times.append(time.time() - start_time)
+
+        replica = self._replicas[replica_id]
+        run_time = time.time()
+        try:
+            with lock_predictor(replica._lock):
+                yield replica_id, replica
+        except Exception:
+            stats.num_errors += 1
+            raise
+        finally:
+            stats.latencies.append(time.time() - run_time)
+            with self._cond:
+                stats.in_flight -= 1
+                self._cond.notify()
+
+    def run(self, fn, *args, **kwargs):
+        """Calls `fn(replica, *args, **kwargs)` on an idle replica."""
+        with self.acquire() as (replica_id, replica):
+            logger.debug("The replica id: {} is selected by running the model.".format(replica_id))
+            return fn(replica, *args, **kwargs)
+
+    def warmup(self, fn, *args, **kwargs):
+        """Calls `fn(replica, *args, **kwargs)` once on every replica, e.g. to initialize the predictors
+        before serving. The warmup calls are not counted in the metrics."""
+        for replica_id, replica in enumerate(self._replicas):
+            start_time = time.time()
+            with lock_predictor(replica._lock):
+                fn(replica, *args, **kwargs)
+            logger.info("Warmup of replica {} finished in {:.3f}s.".format(replica_id, time.time() - start_time))
+
+    @staticmethod
+    def _latency_metrics(latencies):
+        if len(latencies) == 0:
+            return {"mean_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0}
+        latencies = np.array(latencies) * 1000
+        return {
+            "mean_ms": float(latencies.mean()),
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p99_ms": float(np.percentile(latencies, 99)),
+        }
+
+    def get_metrics(self):
+        """Returns the queue depth, the in-flight requests and the latencies of the replicas."""
+        with self._cond:
+            replicas = [
+                {
+                    "in_flight": stats.in_flight,
+                    "num_requests": stats.num_requests,
+                    "num_errors": stats.num_errors,
+                    "latency": self._latency_metrics(list(stats.latencies)),
+                }
+                for stats in self._stats
+            ]
+            queue_depth = self._num_waiting
+        return {
+            "queue_depth": queue_depth,
+            "in_flight": sum(replica["in_flight"] for replica in replicas),
+            "wait": self._latency_metrics(list(self._wait_times)),
+            "replicas": replicas,
+        }
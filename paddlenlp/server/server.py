@@ -17,15 +17,26 @@ from fastapi import FastAPI
 from .http_router import HttpRouterManager
 from .model_manager import ModelManager
 from .taskflow_manager import TaskflowManager
+from .utils import BoundedExecutor
 from ..taskflow import Taskflow
 
 
 class SimpleServer(FastAPI):
-    def __init__(self, **kwargs):
+    def __init__(self, max_workers=None, max_queue_size=256, request_timeout=None, **kwargs):
         """
         Initial function for the PaddleNLP SimpleServer.
+
+        Args:
+            max_workers (int, optional): The number of threads running the predictions. Defaults to None, i.e.
+                the default of `concurrent.futures.ThreadPoolExecutor`.
+            max_queue_size (int, optional): The max number of requests waiting for a thread, the server responds
+                429 to the requests beyond that. Defaults to 256.
+            request_timeout (float, optional): The default deadline in seconds of a request, the server responds
+                503 to the requests not finished in time. Defaults to None, i.e. no deadline.
         """
         super().__init__(**kwargs)
+        self._executor = BoundedExecutor(max_workers, max_queue_size)
+        self._request_timeout = request_timeout
         self._router_manager = HttpRouterManager(self)
         self._taskflow_manager = None
         self._model_manager = None
@@ -33,7 +44,18 @@ class SimpleServer(FastAPI):
         self._service_type = None
 
     def register(
-        self, task_name, model_path, tokenizer_name, model_handler, post_handler, precision="fp32", device_id=0
+        self,
+        task_name,
+        model_path,
+        tokenizer_name,
+        model_handler,
+        post_handler,
+        precision="fp32",
+        device_id=0,
+        max_batch_size=None,
+        max_wait_ms=5,
+        max_tokens=None,
+        warmup_data=None,
     ):
         """
         The register function for the SimpleServer, the main register argrument as follows:
@@ -43,16 +65,32 @@ class SimpleServer(FastAPI):
             model_path (str):
             handler(str):
             device (int|list|str, optional):
+            max_batch_size (int, optional): If set greater than 1, the concurrent requests are merged into
+                batches of at most `max_batch_size` examples, see `BatchScheduler`. It requires the
+                `per_example_keys` of the post handler. Defaults to None.
+            max_wait_ms (float, optional): The max time in milliseconds a request waits to be merged. Defaults to 5.
+            max_tokens (int, optional): The max number of padded tokens of a merged batch. Defaults to None.
+            warmup_data (dict, optional): If given, every predictor runs once on it at registration. Defaults to None.
         """
         self._server_type = "models"
         model_manager = ModelManager(
-            task_name, model_path, tokenizer_name, model_handler, post_handler, precision, device_id
+            task_name,
+            model_path,
+            tokenizer_name,
+            model_handler,
+            post_handler,
+            precision,
+            device_id,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            max_tokens=max_tokens,
+            warmup_data=warmup_data,
         )
         self._model_manager = model_manager
         # Register transformers model server router
         self._router_manager.register_models_router(task_name)
 
-    def register_taskflow(self, task_name, task, taskflow_handler=None):
+    def register_taskflow(self, task_name, task, taskflow_handler=None, warmup_data=None):
         """
         The register function for the SimpleServer, the main register argrument as follows:
 
@@ -61,6 +99,7 @@ class SimpleServer(FastAPI):
             model_or_path (str):
             handler(str):
             device (int|list|str, optional):
+            warmup_data (dict, optional): If given, every taskflow runs once on it at registration. Defaults to None.
         """
         self._server_type = "server"
         check_flag = True
@@ -78,6 +117,6 @@ class SimpleServer(FastAPI):
             )
 
         # Register Taskflow server router
-        taskflow_manager = TaskflowManager(task, taskflow_handler)
+        taskflow_manager = TaskflowManager(task, taskflow_handler, warmup_data)
         self._taskflow_manager = taskflow_manager
         self._router_manager.register_taskflow_router(task_name)
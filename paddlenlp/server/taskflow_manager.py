@@ -13,10 +13,8 @@
 # see the license for the specific language governing permissions and
 # limitations under the license.
 
-import time
 from .handlers import TaskflowHandler
-from .utils import lock_predictor
-from ..utils.log import logger
+from .predictor_pool import PredictorPool
 
 
 class TaskflowManager:
@@ -24,17 +22,18 @@ class TaskflowManager:
     The TaskflowManager could predict the raw text.
     """
 
-    def __init__(self, task, taskflow_handler=None):
+    def __init__(self, task, taskflow_handler=None, warmup_data=None):
         self._task = task
         if taskflow_handler is None:
             self._handler_func = TaskflowHandler.process
         else:
             self._handler_func = taskflow_handler.process
+        self._task_pool = PredictorPool(task)
+        if warmup_data is not None:
+            self._task_pool.warmup(self._handler_func, warmup_data, {})
 
     def predict(self, data, parameters):
-        t = time.time()
-        t = int(round(t * 1000))
-        task_index = t % len(self._task)
-        logger.info("The predictor id: {} is selected by running the taskflow.".format(task_index))
-        with lock_predictor(self._task[task_index]._lock):
-            return self._handler_func(self._task[task_index], data, parameters)
+        return self._task_pool.run(self._handler_func, data, parameters)
+
+    def get_metrics(self):
+        return self._task_pool.get_metrics()
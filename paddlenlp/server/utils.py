@@ -14,6 +14,10 @@
 # limitations under the License.
 
 import contextlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 
 @contextlib.contextmanager
@@ -23,3 +27,61 @@ def lock_predictor(lock):
         yield
     finally:
         lock.release()
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class BoundedExecutor:
+    """
+    A thread pool which accepts at most `max_workers + max_queue_size` unfinished tasks, `submit`
+    raises `QueueFullError` instead of queueing more. A task whose `deadline` (seconds since epoch)
+    has passed when it is taken by a worker is cancelled without running.
+
+    Args:
+        max_workers (int, optional): The number of worker threads. Defaults to None, i.e. the default
+            of `concurrent.futures.ThreadPoolExecutor`.
+        max_queue_size (int, optional): The max number of tasks waiting for a worker. Defaults to 256.
+    """
+
+    def __init__(self, max_workers=None, max_queue_size=256):
+        if max_workers is None:
+            # the default of `concurrent.futures.ThreadPoolExecutor`
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="SimpleServer")
+        self._max_pending = max_workers + max_queue_size
+        self._num_pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def num_pending(self):
+        return self._num_pending
+
+    def _release(self, future):
+        with self._lock:
+            self._num_pending -= 1
+
+    def submit(self, fn, *args, deadline=None, **kwargs):
+        with self._lock:
+            if self._num_pending >= self._max_pending:
+                raise QueueFullError(f"Too many pending requests, the limit is {self._max_pending}.")
+            self._num_pending += 1
+
+        def run():
+            if deadline is not None and time.time() > deadline:
+                raise TimeoutError("The deadline of the request expired before it was processed.")
+            return fn(*args, **kwargs)
+
+        try:
+            future = self._executor.submit(run)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
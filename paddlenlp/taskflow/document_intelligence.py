@@ -16,7 +16,15 @@ import collections
 
 from ..transformers import AutoTokenizer
 from .task import Task
-from .utils import ImageReader, download_file, find_answer_pos, get_doc_pred, sort_res
+from .utils import (
+    OIB_LABEL_SCHEME,
+    ImageReader,
+    batch_viterbi_decode,
+    download_file,
+    find_answer_pos,
+    get_doc_pred,
+    sort_res,
+)
 
 usage = r"""
             from paddlenlp import Taskflow
@@ -113,7 +121,7 @@ class DocPromptTask(Task):
             else:
                 data_loader = self._reader.data_generator(ocr_result, doc_path, prompt, self._batch_size, ocr_type)
 
-                RawResult = collections.namedtuple("RawResult", ["unique_id", "seq_logits"])
+                RawResult = collections.namedtuple("RawResult", ["unique_id", "seq_logits", "best_path"])
 
                 all_results = []
                 for data in data_loader:
@@ -122,12 +130,15 @@ class DocPromptTask(Task):
                     self.predictor.run()
                     outputs = [output_handle.copy_to_cpu() for output_handle in self.output_handle]
                     unique_ids, seq_logits = outputs
+                    # decode the label paths of the whole batch at once
+                    _, best_paths = batch_viterbi_decode(seq_logits)
 
                     for idx in range(len(unique_ids)):
                         all_results.append(
                             RawResult(
                                 unique_id=int(unique_ids[idx]),
                                 seq_logits=seq_logits[idx],
+                                best_path="".join(OIB_LABEL_SCHEME[label] for label in best_paths[idx]),
                             )
                         )
 
@@ -163,7 +174,7 @@ class DocPromptTask(Task):
                         result = unique_id_to_result[feature.unique_id]
 
                         # find preds
-                        ans_pos = find_answer_pos(result.seq_logits, feature)
+                        ans_pos = find_answer_pos(result.seq_logits, feature, best_path=result.best_path)
                         preds.extend(
                             get_doc_pred(
                                 result, ans_pos, example, self._tokenizer, feature, True, all_key_probs, example_index
@@ -36,7 +36,7 @@ from ..utils.doc_parser import DocParser
 from ..utils.env import CONFIG_NAME, LEGACY_CONFIG_NAME
 from ..utils.ie_utils import map_offset, pad_image_data
 from ..utils.log import logger
-from ..utils.tools import get_bool_ids_greater_than, get_span
+from ..utils.tools import batch_get_span
 from .task import Task
 from .utils import DataCollatorGP, SchemaTree, dbc2sbc, get_id_and_prob, gp_decode
 
@@ -780,6 +780,8 @@ class UIETask(Task):
         self._ocr_lang = kwargs.get("ocr_lang", "ch")
         self._schema_lang = kwargs.get("schema_lang", "ch")
         self._expand_to_a4_size = False if self._custom_model else True
+        # The token ids and offsets of the texts and prompts during `_multi_stage_predict`
+        self._segment_cache = None
 
         if self.model in [
             "uie-m-base",
@@ -960,7 +962,10 @@ class UIETask(Task):
             raise TypeError("Invalid input format!")
         return input_list
 
-    def _single_stage_predict(self, inputs):
+    def _split_inputs(self, inputs):
+        """
+        Split the long texts of a single stage into short inputs which fit in `max_seq_len` together with the prompt.
+        """
         input_texts = [d["text"] for d in inputs]
         prompts = [d["prompt"] for d in inputs]
         # max predict length should exclude the length of prompt and summary tokens
@@ -999,10 +1004,75 @@ class UIETask(Task):
             short_inputs = [
                 {"text": short_input_texts[i], "prompt": short_texts_prompts[i]} for i in range(len(short_input_texts))
             ]
+        return short_inputs, short_input_texts, input_mapping
+
+    def _encode_segment(self, segment):
+        """
+        Tokenize a prompt or text without special tokens, the results are cached during `_multi_stage_predict`.
+        """
+        if segment not in self._segment_cache:
+            encoded_inputs = self._tokenizer(
+                text=segment,
+                add_special_tokens=False,
+                return_token_type_ids=False,
+                return_attention_mask=False,
+                return_offsets_mapping=True,
+            )
+            self._segment_cache[segment] = (encoded_inputs["input_ids"], encoded_inputs["offset_mapping"])
+        return self._segment_cache[segment]
+
+    def _shared_encode(self, prompt, text):
+        """
+        Build the inputs of `[CLS] prompt [SEP] text [SEP]` from the cached token ids and offsets of the prompt
+        and the text, so that a text is only tokenized once for all the prompts. Return None if the inputs
+        need truncation, which is left to the tokenizer.
+        """
+        prompt_ids, prompt_offsets = self._encode_segment(prompt)
+        text_ids, text_offsets = self._encode_segment(text)
+        input_ids = self._tokenizer.build_inputs_with_special_tokens(prompt_ids, text_ids)
+        if len(input_ids) > self._max_seq_len:
+            return None
+        encoded_inputs = {
+            "input_ids": input_ids,
+            "token_type_ids": self._tokenizer.create_token_type_ids_from_sequences(prompt_ids, text_ids),
+            "position_ids": list(range(len(input_ids))),
+            "offset_mapping": self._tokenizer.build_offset_mapping_with_special_tokens(prompt_offsets, text_offsets),
+        }
+        max_length = self._max_seq_len
+        if self._dynamic_max_length is not None:
+            max_length = get_dynamic_max_length(
+                examples=[encoded_inputs],
+                default_max_length=self._max_seq_len,
+                dynamic_max_length=self._dynamic_max_length,
+            )
+        encoded_inputs = self._tokenizer.pad(
+            encoded_inputs, padding="max_length", max_length=max_length, return_attention_mask=True
+        )
+        # Add the batch axis as the outputs of the tokenizer
+        return {k: [v] for k, v in encoded_inputs.items()}
+
+    def _single_stage_predict(self, inputs):
+        return self._batch_stage_predict([inputs])[0]
+
+    def _batch_stage_predict(self, input_groups):
+        """
+        Predict several groups of inputs, e.g. the inputs of the schema nodes of the same depth, in one pass.
+        Return the results of each group.
+        """
+        short_input_groups = [self._split_inputs(inputs) for inputs in input_groups]
+        short_inputs = [short_input for group in short_input_groups for short_input in group[0]]
+        use_shared_encoding = (
+            self._segment_cache is not None
+            and not self._tokenizer.is_fast
+            and hasattr(self._tokenizer, "build_offset_mapping_with_special_tokens")
+        )
 
         def text_reader(inputs):
             for example in inputs:
-                if self._dynamic_max_length is not None:
+                encoded_inputs = None
+                if use_shared_encoding:
+                    encoded_inputs = self._shared_encode(example["prompt"], example["text"])
+                if encoded_inputs is None and self._dynamic_max_length is not None:
                     temp_encoded_inputs = self._tokenizer(
                         text=[example["prompt"]],
                         text_pair=[example["text"]],
@@ -1029,7 +1099,7 @@ class UIETask(Task):
                         return_offsets_mapping=True,
                     )
                     logger.info("Inference with dynamic max length in {}".format(max_length))
-                else:
+                elif encoded_inputs is None:
                     encoded_inputs = self._tokenizer(
                         text=[example["prompt"]],
                         text_pair=[example["text"]],
@@ -1309,8 +1379,8 @@ class UIETask(Task):
                     self.input_handles[2].copy_from_cpu(pos_ids.numpy())
                     self.input_handles[3].copy_from_cpu(att_mask.numpy())
                 self.predictor.run()
-                start_prob = self.output_handle[0].copy_to_cpu().tolist()
-                end_prob = self.output_handle[1].copy_to_cpu().tolist()
+                start_prob = self.output_handle[0].copy_to_cpu()
+                end_prob = self.output_handle[1].copy_to_cpu()
             else:
                 if self._init_class in ["UIEX"]:
                     input_dict = {
@@ -1334,19 +1404,30 @@ class UIETask(Task):
                         "attention_mask": att_mask.numpy(),
                     }
                 start_prob, end_prob = self.predictor.run(None, input_dict)
-                start_prob = start_prob.tolist()
-                end_prob = end_prob.tolist()
 
-            start_ids_list = get_bool_ids_greater_than(start_prob, limit=self._position_prob, return_prob=True)
-            end_ids_list = get_bool_ids_greater_than(end_prob, limit=self._position_prob, return_prob=True)
-            for start_ids, end_ids, offset_map in zip(start_ids_list, end_ids_list, offset_maps.tolist()):
-                span_set = get_span(start_ids, end_ids, with_prob=True)
+            batch_ids, start_ids, end_ids, start_scores, end_scores = batch_get_span(
+                start_prob, end_prob, limit=self._position_prob
+            )
+            row_bounds = np.searchsorted(batch_ids, np.arange(len(start_prob) + 1)).tolist()
+            for i, offset_map in enumerate(offset_maps.tolist()):
+                lo, hi = row_bounds[i], row_bounds[i + 1]
+                span_set = zip(
+                    zip(start_ids[lo:hi].tolist(), start_scores[lo:hi]),
+                    zip(end_ids[lo:hi].tolist(), end_scores[lo:hi]),
+                )
                 sentence_id, prob = get_id_and_prob(span_set, offset_map)
                 sentence_ids.append(sentence_id)
                 probs.append(prob)
-        results = self._convert_ids_to_results(short_inputs, sentence_ids, probs)
-        results = self._auto_joiner(results, short_input_texts, input_mapping)
-        return results
+
+        group_results = []
+        start = 0
+        for short_inputs, short_input_texts, input_mapping in short_input_groups:
+            end = start + len(short_inputs)
+            results = self._convert_ids_to_results(short_inputs, sentence_ids[start:end], probs[start:end])
+            results = self._auto_joiner(results, short_input_texts, input_mapping)
+            group_results.append(results)
+            start = end
+        return group_results
 
     def _auto_joiner(self, short_results, short_inputs, input_mapping):
         concat_results = []
@@ -1456,103 +1537,123 @@ class UIETask(Task):
 
         # Copy to stay `self._schema_tree` unchanged
         schema_list = self._schema_tree.children[:]
-        while len(schema_list) > 0:
-            node = schema_list.pop(0)
-            examples = []
-            input_map = {}
-            cnt = 0
-            idx = 0
-            if not node.prefix:
-                for one_data in data:
-                    examples.append(
-                        {
-                            "text": one_data["text"],
-                            "bbox": one_data["bbox"],
-                            "image": one_data["image"],
-                            "prompt": dbc2sbc(node.name),
-                        }
-                    )
-                    input_map[cnt] = [idx]
-                    idx += 1
-                    cnt += 1
-            else:
-                for pre, one_data in zip(node.prefix, data):
-                    if len(pre) == 0:
-                        input_map[cnt] = []
-                    else:
-                        for p in pre:
-                            if self._is_en:
-                                if re.search(r"\[.*?\]$", node.name):
-                                    prompt_prefix = node.name[: node.name.find("[", 1)].strip()
-                                    cls_options = re.search(r"\[.*?\]$", node.name).group()
-                                    # Sentiment classification of xxx [positive, negative]
-                                    prompt = prompt_prefix + p + " " + cls_options
-                                else:
-                                    prompt = node.name + p
+        self._segment_cache = {}
+        try:
+            while len(schema_list) > 0:
+                # The nodes of the same depth only depend on their parents, so predict them in one pass
+                nodes = schema_list
+                schema_list = []
+                stage_inputs = [self._build_stage_examples(node, data) for node in nodes]
+                input_groups = [examples for examples, _ in stage_inputs if len(examples) > 0]
+                group_results = iter(self._batch_stage_predict(input_groups) if input_groups else [])
+                for node, (examples, input_map) in zip(nodes, stage_inputs):
+                    result_list = next(group_results) if len(examples) > 0 else []
+                    self._update_stage_results(node, data, results, input_map, result_list)
+                    schema_list.extend(node.children)
+        finally:
+            self._segment_cache = None
+        results = self._add_bbox_info(results, data)
+        return results
+
+    def _build_stage_examples(self, node, data):
+        """
+        Build the examples of a schema node, with the prompts from the results of its parent.
+        """
+        examples = []
+        input_map = {}
+        cnt = 0
+        idx = 0
+        if not node.prefix:
+            for one_data in data:
+                examples.append(
+                    {
+                        "text": one_data["text"],
+                        "bbox": one_data["bbox"],
+                        "image": one_data["image"],
+                        "prompt": dbc2sbc(node.name),
+                    }
+                )
+                input_map[cnt] = [idx]
+                idx += 1
+                cnt += 1
+        else:
+            for pre, one_data in zip(node.prefix, data):
+                if len(pre) == 0:
+                    input_map[cnt] = []
+                else:
+                    for p in pre:
+                        if self._is_en:
+                            if re.search(r"\[.*?\]$", node.name):
+                                prompt_prefix = node.name[: node.name.find("[", 1)].strip()
+                                cls_options = re.search(r"\[.*?\]$", node.name).group()
+                                # Sentiment classification of xxx [positive, negative]
+                                prompt = prompt_prefix + p + " " + cls_options
                             else:
-                                prompt = p + node.name
-                            examples.append(
-                                {
-                                    "text": one_data["text"],
-                                    "bbox": one_data["bbox"],
-                                    "image": one_data["image"],
-                                    "prompt": dbc2sbc(prompt),
-                                }
-                            )
-                        input_map[cnt] = [i + idx for i in range(len(pre))]
-                        idx += len(pre)
-                    cnt += 1
-            if len(examples) == 0:
-                result_list = []
-            else:
-                result_list = self._single_stage_predict(examples)
-            if not node.parent_relations:
-                relations = [[] for i in range(len(data))]
-                for k, v in input_map.items():
-                    for idx in v:
-                        if len(result_list[idx]) == 0:
-                            continue
-                        if node.name not in results[k].keys():
-                            results[k][node.name] = result_list[idx]
+                                prompt = node.name + p
                         else:
-                            results[k][node.name].extend(result_list[idx])
-                    if node.name in results[k].keys():
-                        relations[k].extend(results[k][node.name])
-            else:
-                relations = node.parent_relations
-                for k, v in input_map.items():
-                    for i in range(len(v)):
-                        if len(result_list[v[i]]) == 0:
-                            continue
-                        if "relations" not in relations[k][i].keys():
-                            relations[k][i]["relations"] = {node.name: result_list[v[i]]}
-                        elif node.name not in relations[k][i]["relations"].keys():
-                            relations[k][i]["relations"][node.name] = result_list[v[i]]
-                        else:
-                            relations[k][i]["relations"][node.name].extend(result_list[v[i]])
-                new_relations = [[] for i in range(len(data))]
-                for i in range(len(relations)):
-                    for j in range(len(relations[i])):
-                        if "relations" in relations[i][j].keys() and node.name in relations[i][j]["relations"].keys():
-                            for k in range(len(relations[i][j]["relations"][node.name])):
-                                new_relations[i].append(relations[i][j]["relations"][node.name][k])
-                relations = new_relations
+                            prompt = p + node.name
+                        examples.append(
+                            {
+                                "text": one_data["text"],
+                                "bbox": one_data["bbox"],
+                                "image": one_data["image"],
+                                "prompt": dbc2sbc(prompt),
+                            }
+                        )
+                    input_map[cnt] = [i + idx for i in range(len(pre))]
+                    idx += len(pre)
+                cnt += 1
+        return examples, input_map
 
-            prefix = [[] for _ in range(len(data))]
+    def _update_stage_results(self, node, data, results, input_map, result_list):
+        """
+        Merge the predictions of a schema node into `results` and pass the prompt prefixes and relations
+        to its children.
+        """
+        if not node.parent_relations:
+            relations = [[] for i in range(len(data))]
             for k, v in input_map.items():
                 for idx in v:
-                    for i in range(len(result_list[idx])):
-                        if self._is_en:
-                            prefix[k].append(" of " + result_list[idx][i]["text"])
-                        else:
-                            prefix[k].append(result_list[idx][i]["text"] + "的")
+                    if len(result_list[idx]) == 0:
+                        continue
+                    if node.name not in results[k].keys():
+                        results[k][node.name] = result_list[idx]
+                    else:
+                        results[k][node.name].extend(result_list[idx])
+                if node.name in results[k].keys():
+                    relations[k].extend(results[k][node.name])
+        else:
+            relations = node.parent_relations
+            for k, v in input_map.items():
+                for i in range(len(v)):
+                    if len(result_list[v[i]]) == 0:
+                        continue
+                    if "relations" not in relations[k][i].keys():
+                        relations[k][i]["relations"] = {node.name: result_list[v[i]]}
+                    elif node.name not in relations[k][i]["relations"].keys():
+                        relations[k][i]["relations"][node.name] = result_list[v[i]]
+                    else:
+                        relations[k][i]["relations"][node.name].extend(result_list[v[i]])
+            new_relations = [[] for i in range(len(data))]
+            for i in range(len(relations)):
+                for j in range(len(relations[i])):
+                    if "relations" in relations[i][j].keys() and node.name in relations[i][j]["relations"].keys():
+                        for k in range(len(relations[i][j]["relations"][node.name])):
+                            new_relations[i].append(relations[i][j]["relations"][node.name][k])
+            relations = new_relations
+
+        prefix = [[] for _ in range(len(data))]
+        for k, v in input_map.items():
+            for idx in v:
+                for i in range(len(result_list[idx])):
+                    if self._is_en:
+                        prefix[k].append(" of " + result_list[idx][i]["text"])
+                    else:
+                        prefix[k].append(result_list[idx][i]["text"] + "的")
 
-            for child in node.children:
-                child.prefix = prefix
-                child.parent_relations = relations
-                schema_list.append(child)
-        results = self._add_bbox_info(results, data)
-        return results
+        for child in node.children:
+            child.prefix = prefix
+            child.parent_relations = relations
 
     def _add_bbox_info(self, results, data):
         def _add_bbox(result, char_boxes):
@@ -23,6 +23,7 @@ import paddle
 from ..datasets import load_dataset
 from ..transformers import ErnieCtmNptagModel, ErnieCtmTokenizer, ErnieCtmWordtagModel
 from ..transformers.ernie_ctm.configuration import ErnieCtmConfig
+from ..utils.log import logger
 from .task import Task
 from .utils import (
     BurkhardKellerTree,
@@ -592,10 +593,20 @@ class NPTagTask(Task):
         name_dict_path = os.path.join(self._task_path, "name_category_map.json")
         with open(name_dict_path, encoding="utf-8") as fp:
             self._name_dict = json.load(fp)
-        self._tree = BurkhardKellerTree()
+        # The BK-Tree of the names is built once and reloaded from the cache file afterwards
+        tree_path = os.path.join(self._task_path, "name_category_map.bktree.json")
+        if os.path.exists(tree_path) and os.path.getmtime(tree_path) >= os.path.getmtime(name_dict_path):
+            self._tree = BurkhardKellerTree.load(tree_path)
+        else:
+            self._tree = BurkhardKellerTree()
+            for k in self._name_dict:
+                self._tree.add(k)
+            try:
+                self._tree.save(tree_path)
+            except OSError:
+                logger.warning("Failed to save the BK-Tree of names to {}.".format(tree_path))
         self._cls_vocabs = OrderedDict()
         for k in self._name_dict:
-            self._tree.add(k)
             for c in k:
                 if c not in self._cls_vocabs:
                     self._cls_vocabs[c] = len(self._cls_vocabs)
@@ -22,7 +22,7 @@ import paddle
 from ..data import JiebaTokenizer, Pad, Stack, Tuple, Vocab
 from ..datasets import load_dataset
 from ..transformers import UIE, AutoTokenizer, SkepTokenizer
-from ..utils.tools import get_bool_ids_greater_than, get_span
+from ..utils.tools import batch_get_span
 from .models import LSTMModel, SkepSequenceModel
 from .task import Task
 from .utils import SchemaTree, dbc2sbc, get_id_and_prob, static_mode_guard
@@ -640,8 +640,8 @@ class UIESentaTask(Task):
                 self.input_handles[2].copy_from_cpu(pos_ids.numpy())
                 self.input_handles[3].copy_from_cpu(att_mask.numpy())
                 self.predictor.run()
-                start_prob = self.output_handle[0].copy_to_cpu().tolist()
-                end_prob = self.output_handle[1].copy_to_cpu().tolist()
+                start_prob = self.output_handle[0].copy_to_cpu()
+                end_prob = self.output_handle[1].copy_to_cpu()
             else:
                 input_dict = {
                     "input_ids": input_ids.numpy(),
@@ -650,14 +650,17 @@ class UIESentaTask(Task):
                     "att_mask": att_mask.numpy(),
                 }
                 start_prob, end_prob = self.predictor.run(None, input_dict)
-                start_prob = start_prob.tolist()
-                end_prob = end_prob.tolist()
 
-            start_ids_list = get_bool_ids_greater_than(start_prob, limit=self._position_prob, return_prob=True)
-            end_ids_list = get_bool_ids_greater_than(end_prob, limit=self._position_prob, return_prob=True)
-
-            for start_ids, end_ids, offset_map in zip(start_ids_list, end_ids_list, offset_maps.tolist()):
-                span_set = get_span(start_ids, end_ids, with_prob=True)
+            batch_ids, start_ids, end_ids, start_scores, end_scores = batch_get_span(
+                start_prob, end_prob, limit=self._position_prob
+            )
+            row_bounds = np.searchsorted(batch_ids, np.arange(len(start_prob) + 1)).tolist()
+            for i, offset_map in enumerate(offset_maps.tolist()):
+                lo, hi = row_bounds[i], row_bounds[i + 1]
+                span_set = zip(
+                    zip(start_ids[lo:hi].tolist(), start_scores[lo:hi]),
+                    zip(end_ids[lo:hi].tolist(), end_scores[lo:hi]),
+                )
                 sentence_id, prob = get_id_and_prob(span_set, offset_map)
                 sentence_ids.append(sentence_id)
                 probs.append(prob)
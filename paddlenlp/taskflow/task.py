@@ -14,8 +14,11 @@
 # limitations under the License.
 
 import abc
+import copy
 import math
 import os
+import queue
+import threading
 from abc import abstractmethod
 from multiprocessing import cpu_count
 
@@ -371,7 +374,6 @@ class Task(metaclass=abc.ABCMeta):
                     self._construct_input_spec()
                     self._convert_dygraph_to_static()
 
-
         self._static_model_file = self.inference_model_path + PADDLE_INFERENCE_MODEL_SUFFIX
         self._static_params_file = self.inference_model_path + PADDLE_INFERENCE_WEIGHTS_SUFFIX
 
@@ -561,3 +563,114 @@ class Task(metaclass=abc.ABCMeta):
         outputs = self._run_model(inputs, **kwargs)
         results = self._postprocess(outputs)
         return results
+
+    def stream(self, inputs, chunk_size=64, prefetch=2, **kwargs):
+        """
+        Run the task over an iterable of inputs in a pipeline and yield the results one by one.
+
+        The inputs are split into chunks of `chunk_size`. While the model runs on a chunk in the
+        calling thread, the next chunks are preprocessed and the previous ones are postprocessed
+        in two worker threads, so that the predictor does not idle during the CPU stages.
+
+        Many tasks keep the state of a call on the task between the stages (e.g. `input_mapping`,
+        `_batchify_fn` or `_max_cls_len`), so each chunk runs its three stages on its own shallow
+        copy of the task, and the attributes assigned by one chunk do not leak into the others.
+        A task can be streamed as long as its stages do not modify in place the objects shared
+        by the copies (the models, tokenizers and their caches).
+
+        Args:
+            inputs (Iterable): The inputs of the task, e.g. a generator over the lines of a file.
+            chunk_size (int, optional): The number of inputs processed by each call of the stages. Defaults to 64.
+            prefetch (int, optional): The max number of chunks waiting between two stages. Defaults to 2.
+        """
+        stop = threading.Event()
+        pre_queue = queue.Queue(maxsize=prefetch)
+        post_queue = queue.Queue(maxsize=prefetch)
+        result_queue = queue.Queue()
+
+        def put(q, item):
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(q):
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return None
+
+        def preprocess(chunk):
+            task = copy.copy(self)
+            return task, task._preprocess((chunk,))
+
+        def preprocess_worker():
+            try:
+                chunk = []
+                for example in inputs:
+                    chunk.append(example)
+                    if len(chunk) == chunk_size:
+                        if not put(pre_queue, ("data", preprocess(chunk))):
+                            return
+                        chunk = []
+                if len(chunk) > 0:
+                    put(pre_queue, ("data", preprocess(chunk)))
+                put(pre_queue, ("end", None))
+            except Exception as e:
+                put(pre_queue, ("error", e))
+
+        def postprocess_worker():
+            while True:
+                item = get(post_queue)
+                if item is None:
+                    return
+                kind, payload = item
+                if kind == "data":
+                    try:
+                        task, outputs = payload
+                        payload = task._postprocess(outputs)
+                    except Exception as e:
+                        kind, payload = "error", e
+                result_queue.put((kind, payload))
+                if kind != "data":
+                    return
+
+        workers = [
+            threading.Thread(target=preprocess_worker, daemon=True),
+            threading.Thread(target=postprocess_worker, daemon=True),
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            model_done = False
+            while True:
+                if not model_done:
+                    kind, payload = get(pre_queue)
+                    if kind == "data":
+                        task, inputs = payload
+                        payload = task, task._run_model(inputs, **kwargs)
+                    put(post_queue, (kind, payload))
+                    model_done = kind != "data"
+                # Yield the finished results, and wait for all of them after the model is done
+                while True:
+                    try:
+                        kind, payload = result_queue.get(block=model_done)
+                    except queue.Empty:
+                        break
+                    if kind == "end":
+                        return
+                    if kind == "error":
+                        raise payload
+                    if isinstance(payload, list):
+                        yield from payload
+                    else:
+                        yield payload
+        finally:
+            stop.set()
+            for worker in workers:
+                worker.join()
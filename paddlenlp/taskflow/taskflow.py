@@ -886,6 +886,13 @@ class Taskflow(object):
         results = self.task_instance(inputs, **kwargs)
         return results
 
+    def stream(self, inputs, **kwargs):
+        """
+        Run the task over an iterable of inputs with preprocessing, inference and postprocessing overlapped,
+        and yield the results one by one. See `Task.stream` for the arguments.
+        """
+        return self.task_instance.stream(inputs, **kwargs)
+
     def help(self):
         """
         Return the task usage message.
@@ -13,6 +13,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import array
+import bisect
+import collections
 import contextlib
 import copy
 import csv
@@ -535,6 +538,39 @@ class TermTree(object):
                     print(node, file=fp)
 
 
+def _myers_peq(pattern: str) -> Dict[str, int]:
+    """Bit masks of the positions of each character in `pattern` for `_myers_distance`."""
+    peq = {}
+    for i, c in enumerate(pattern):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    return peq
+
+
+def _myers_distance(peq: Dict[str, int], m: int, text: str) -> int:
+    """Bit-parallel Levenstein distance (Myers / Hyyrö) between a pattern of length `m` with masks `peq` and `text`.
+    Python integers have arbitrary precision, so a pattern of any length fits in one bit vector."""
+    if m == 0:
+        return len(text)
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+    for c in text:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & full
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv
+    return score
+
+
 def levenstein_distance(s1: str, s2: str) -> int:
     """Calculate minimal Levenstein distance between s1 and s2.
 
@@ -545,23 +581,9 @@ def levenstein_distance(s1: str, s2: str) -> int:
     Returns:
         int: the minimal distance.
     """
-    m, n = len(s1) + 1, len(s2) + 1
-
-    # Initialize
-    dp = [[0] * n for i in range(m)]
-    dp[0][0] = 0
-    for i in range(1, m):
-        dp[i][0] = dp[i - 1][0] + 1
-    for j in range(1, n):
-        dp[0][j] = dp[0][j - 1] + 1
-
-    for i in range(1, m):
-        for j in range(1, n):
-            if s1[i - 1] != s2[j - 1]:
-                dp[i][j] = min(dp[i - 1][j], dp[i][j - 1], dp[i - 1][j - 1]) + 1
-            else:
-                dp[i][j] = dp[i - 1][j - 1]
-    return dp[m - 1][n - 1]
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    return _myers_distance(_myers_peq(s2), len(s2), s1)
 
 
 class BurkhardKellerNode(object):
@@ -583,55 +605,55 @@ class BurkhardKellerTree(object):
         self.root = None
         self.nodes = {}
 
-    def __add(self, cur_node: BurkhardKellerNode, word: str):
+    def add(self, word: str):
         """Insert a word into current tree. If tree is empty, set this word to root.
 
         Args:
             word (str): word to be inserted.
         """
         if self.root is None:
-            self.root = BurkhardKellerNode(word)
+            self.root = self.nodes[word] = BurkhardKellerNode(word)
             return
         if word in self.nodes:
             return
-        dist = levenstein_distance(word, cur_node.word)
-        if dist not in cur_node.next:
-            self.nodes[word] = cur_node.next[dist] = BurkhardKellerNode(word)
-        else:
-            self.__add(cur_node.next[dist], word)
-
-    def add(self, word: str):
-        """Insert a word into current tree. If tree is empty, set this word to root.
-
-        Args:
-            word (str): word to be inserted.
-        """
-        return self.__add(self.root, word)
-
-    def __search_similar_word(self, cur_node: BurkhardKellerNode, s: str, threshold: int = 2) -> List[str]:
+        peq = _myers_peq(word)
+        cur_node = self.root
+        while True:
+            dist = _myers_distance(peq, len(word), cur_node.word)
+            if dist not in cur_node.next:
+                self.nodes[word] = cur_node.next[dist] = BurkhardKellerNode(word)
+                return
+            cur_node = cur_node.next[dist]
+
+    def _search_similar_word(self, s: str, threshold: int = 2) -> List[Tuple[str, int]]:
         res = []
-        if cur_node is None:
+        if self.root is None:
             return res
-        dist = levenstein_distance(cur_node.word, s)
-        if dist <= threshold:
-            res.append((cur_node.word, dist))
-        start = max(dist - threshold, 1)
-        while start < dist + threshold:
-            tmp_res = self.__search_similar_word(cur_node.next.get(start, None), s)[:]
-            res.extend(tmp_res)
-            start += 1
+        peq = _myers_peq(s)
+        stack = [self.root]
+        while stack:
+            cur_node = stack.pop()
+            dist = _myers_distance(peq, len(s), cur_node.word)
+            if dist <= threshold:
+                res.append((cur_node.word, dist))
+            # By the triangle inequality, only the children within `threshold` of `dist` may match
+            for d in range(max(dist - threshold, 1), dist + threshold + 1):
+                child = cur_node.next.get(d, None)
+                if child is not None:
+                    stack.append(child)
         return res
 
-    def search_similar_word(self, word: str) -> List[str]:
+    def search_similar_word(self, word: str, threshold: int = 2) -> List[Tuple[str, int]]:
         """Search the most similar (minimal levenstain distance) word between `s`.
 
         Args:
             s (str): target word
+            threshold (int, optional): the max levenstain distance of the similar words. Defaults to 2.
 
         Returns:
-            List[str]: similar words.
+            List[Tuple[str, int]]: similar words and their distances.
         """
-        res = self.__search_similar_word(self.root, word)
+        res = self._search_similar_word(word, threshold)
 
         def max_prefix(s1: str, s2: str) -> int:
             res = 0
@@ -646,19 +668,165 @@ class BurkhardKellerTree(object):
         res.sort(key=lambda d: (d[1], -max_prefix(d[0], word)))
         return res
 
+    def search_similar_words(self, words: List[str], threshold: int = 2) -> List[List[Tuple[str, int]]]:
+        """Batch version of `search_similar_word`, the repeated words are only searched once."""
+        cache = {}
+        for word in words:
+            if word not in cache:
+                cache[word] = self.search_similar_word(word, threshold)
+        return [cache[word] for word in words]
+
+    def save(self, path: str):
+        """Save the tree to a json file, which could be loaded by `load` without computing any distance."""
+        words, parents, dists = [], [], []
+        if self.root is not None:
+            words.append(self.root.word)
+            parents.append(-1)
+            dists.append(0)
+            queue = collections.deque([(0, self.root)])
+            while queue:
+                idx, node = queue.popleft()
+                for dist, child in node.next.items():
+                    words.append(child.word)
+                    parents.append(idx)
+                    dists.append(dist)
+                    queue.append((len(words) - 1, child))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"words": words, "parents": parents, "dists": dists}, f, ensure_ascii=False)
 
-class TriedTree(object):
-    """Implementataion of TriedTree"""
+    @classmethod
+    def load(cls, path: str) -> "BurkhardKellerTree":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        tree = cls()
+        nodes = []
+        for word, parent, dist in zip(data["words"], data["parents"], data["dists"]):
+            node = BurkhardKellerNode(word)
+            if parent < 0:
+                tree.root = node
+            else:
+                nodes[parent].next[dist] = node
+            tree.nodes[word] = node
+            nodes.append(node)
+        return tree
 
-    def __init__(self):
-        self.tree = {}
+
+class AhoCorasick(object):
+    """
+    Compact Aho-Corasick automaton over a word list.
+
+    The goto table is stored in CSR form: the edges of node `i` are `edge_chars[edge_offsets[i]:edge_offsets[i + 1]]`
+    sorted by the code point of the character, with their targets in `edge_targets`. `fail` is the failure link of
+    each node, `word_len` the length of the word ending at the node (0 if none) and `output` the nearest node on the
+    failure chain (the node itself included) where a word ends (-1 if none). The automaton is built in bulk from
+    the sorted words and can be saved to and loaded from a `.npz` file.
+    """
+
+    def __init__(self, words=None):
+        self._words = set()
+        self._built = False
+        for word in words or []:
+            self.add_word(word)
 
     def add_word(self, word):
-        """add single word into TriedTree"""
-        self.tree[word] = len(word)
-        for i in range(1, len(word)):
-            wfrag = word[:i]
-            self.tree[wfrag] = self.tree.get(wfrag, None)
+        """add single word into the automaton, it takes effect after the next `build`."""
+        if self._words is None:
+            raise ValueError("Could not add words to the automaton loaded from file.")
+        if len(word) > 0:
+            self._words.add(word)
+            self._built = False
+
+    def build(self):
+        words = sorted(self._words)
+        # Insert the sorted words in the depth-first order, each word shares the path of its common prefix
+        # with the previous word.
+        parents, chars, word_len = [-1], [0], [0]
+        path = [0]
+        prev = ""
+        for word in words:
+            common = 0
+            max_common = min(len(prev), len(word))
+            while common < max_common and prev[common] == word[common]:
+                common += 1
+            del path[common + 1 :]
+            for ch in word[common:]:
+                parents.append(path[-1])
+                chars.append(ord(ch))
+                word_len.append(0)
+                path.append(len(parents) - 1)
+            word_len[path[-1]] = len(word)
+            prev = word
+
+        num_nodes = len(parents)
+        parents = np.array(parents, dtype="int64")
+        chars = np.array(chars, dtype="int64")
+        # Group the edges by parent, the children of a node are created in the order of their characters
+        edge_nodes = np.argsort(parents[1:], kind="stable") + 1
+        counts = np.bincount(parents[1:], minlength=num_nodes)
+        edge_offsets = np.concatenate([[0], np.cumsum(counts)])
+        self._set_tables(edge_offsets, chars[edge_nodes], edge_nodes, word_len)
+        self._build_fail()
+        self._built = True
+        return self
+
+    def _set_tables(self, edge_offsets, edge_chars, edge_targets, word_len, fail=None, output=None):
+        def to_array(values):
+            # `array.array` gives fast item access to python ints in the search loop
+            return array.array("q", np.asarray(values, dtype="int64").tobytes())
+
+        num_nodes = len(word_len)
+        self.edge_offsets = to_array(edge_offsets)
+        self.edge_chars = to_array(edge_chars)
+        self.edge_targets = to_array(edge_targets)
+        self.word_len = to_array(word_len)
+        self.fail = to_array(fail if fail is not None else np.zeros(num_nodes))
+        self.output = to_array(output if output is not None else np.full(num_nodes, -1))
+
+    def _goto(self, node, char):
+        lo, hi = self.edge_offsets[node], self.edge_offsets[node + 1]
+        idx = bisect.bisect_left(self.edge_chars, char, lo, hi)
+        if idx < hi and self.edge_chars[idx] == char:
+            return self.edge_targets[idx]
+        return -1
+
+    def _build_fail(self):
+        edge_offsets, edge_chars, edge_targets = self.edge_offsets, self.edge_chars, self.edge_targets
+        fail, output, word_len = self.fail, self.output, self.word_len
+        queue = collections.deque([0])
+        while queue:
+            node = queue.popleft()
+            for idx in range(edge_offsets[node], edge_offsets[node + 1]):
+                child, char = edge_targets[idx], edge_chars[idx]
+                if node == 0:
+                    fail[child] = 0
+                else:
+                    state = fail[node]
+                    target = self._goto(state, char)
+                    while target < 0 and state != 0:
+                        state = fail[state]
+                        target = self._goto(state, char)
+                    fail[child] = target if target >= 0 else 0
+                output[child] = child if word_len[child] > 0 else output[fail[child]]
+                queue.append(child)
+
+    def iter_matches(self, content):
+        """Yields `(start, end)` of all the occurrences of the words in `content` in the order of their ends."""
+        if not self._built:
+            self.build()
+        fail, output, word_len = self.fail, self.output, self.word_len
+        goto = self._goto
+        state = 0
+        for i, ch in enumerate(content):
+            char = ord(ch)
+            target = goto(state, char)
+            while target < 0 and state != 0:
+                state = fail[state]
+                target = goto(state, char)
+            state = target if target >= 0 else 0
+            node = output[state]
+            while node > 0:
+                yield i + 1 - word_len[node], i + 1
+                node = output[fail[node]]
 
     def search(self, content):
         """Backward maximum matching
@@ -670,16 +838,48 @@ class TriedTree(object):
                 the starting and ending position of the matching string.
         """
         result = []
-        length = len(content)
-        for start in range(length):
-            for end in range(start + 1, length + 1):
-                pos = self.tree.get(content[start:end], -1)
-                if pos == -1:
-                    break
-                if pos and (len(result) == 0 or end > result[-1][1]):
-                    result.append((start, end))
+        for start, end in sorted(self.iter_matches(content)):
+            if len(result) == 0 or end > result[-1][1]:
+                result.append((start, end))
         return result
 
+    def save(self, path, **extra_arrays):
+        """Saves the built automaton and `extra_arrays` to the `.npz` file `path`."""
+        if not self._built:
+            self.build()
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                edge_offsets=np.frombuffer(self.edge_offsets, dtype="int64"),
+                edge_chars=np.frombuffer(self.edge_chars, dtype="int64"),
+                edge_targets=np.frombuffer(self.edge_targets, dtype="int64"),
+                word_len=np.frombuffer(self.word_len, dtype="int64"),
+                fail=np.frombuffer(self.fail, dtype="int64"),
+                output=np.frombuffer(self.output, dtype="int64"),
+                **extra_arrays,
+            )
+
+    @classmethod
+    def load(cls, path):
+        """Loads the automaton saved by `save`, new words could not be added to it."""
+        tables = np.load(path)
+        automaton = cls()
+        automaton._words = None
+        automaton._set_tables(
+            tables["edge_offsets"],
+            tables["edge_chars"],
+            tables["edge_targets"],
+            tables["word_len"],
+            fail=tables["fail"],
+            output=tables["output"],
+        )
+        automaton._built = True
+        return automaton
+
+
+class TriedTree(AhoCorasick):
+    """Implementataion of TriedTree, which is backed by `AhoCorasick` now."""
+
 
 class Customization(object):
     """
@@ -690,13 +890,25 @@ class Customization(object):
         self.dictitem = {}
         self.ac = None
 
-    def load_customization(self, filename, sep=None):
-        """Load the custom vocab"""
-        self.ac = TriedTree()
+    def load_customization(self, filename, sep=None, cache_path=None):
+        """Load the custom vocab
+
+        Args:
+            filename (str): The custom vocab file.
+            sep (str, optional): The separator of the words in a line. Defaults to None, i.e. whitespaces.
+            cache_path (str, optional): If given, the built automaton is saved to this `.npz` file and
+                reloaded from it as long as it is newer than `filename`. Defaults to None.
+        """
+        if cache_path is not None and os.path.exists(cache_path):
+            if os.path.getmtime(cache_path) >= os.path.getmtime(filename):
+                self.ac = AhoCorasick.load(cache_path)
+                self.dictitem = json.loads(str(np.load(cache_path)["dictitem"]))
+                return
+
+        self.ac = AhoCorasick()
         with open(filename, "r", encoding="utf8") as f:
             for line in f:
-                if sep is None:
-                    words = line.strip().split()
+                words = line.strip().split(sep)
 
                 if len(words) == 0:
                     continue
@@ -718,6 +930,14 @@ class Customization(object):
 
                 self.dictitem[phrase] = (tags, offset)
                 self.ac.add_word(phrase)
+        self.ac.build()
+
+        if cache_path is not None:
+            self.save_customization(cache_path)
+
+    def save_customization(self, cache_path):
+        """Save the automaton and the custom vocab to the `.npz` file `cache_path`."""
+        self.ac.save(cache_path, dictitem=np.array(json.dumps(self.dictitem, ensure_ascii=False)))
 
     def parse_customization(self, query, lac_tags, prefix=False):
         """Use custom vocab to modify the lac results"""
@@ -2416,37 +2636,86 @@ def find_bio_pos(label):
     return cand_ans
 
 
+# OIB label 0:O, 1:I, 2:B
+OIB_LABEL_SCHEME = "OIB"
+# illegal matrix: [O, I ,B, start, end] * [O, I, B, start, end]
+OIB_ILLEGAL_TRANSITIONS = (
+    np.array([[0, -1, 0, -1, 0], [0, 0, 0, -1, 0], [0, 0, 0, 0, 0], [0, -1, 0, 0, 0], [-1, -1, -1, -1, -1]]) * 1000
+)
+
+
+def batch_viterbi_decode(logits, lengths=None, transitions=None, start_transitions=None):
+    """
+    Decodes the best label paths of a batch of sequences at once.
+
+    The scores of all the sequences and labels are updated together at every step and the best
+    previous labels are kept in a backpointer array, which is traced back after the last step.
+
+    Args:
+        logits (numpy.ndarray): The emission scores with shape [batch_size, seq_len, num_labels].
+        lengths (numpy.ndarray, optional): The lengths of the sequences with shape [batch_size].
+            Defaults to None, which means all the sequences have `seq_len` steps.
+        transitions (numpy.ndarray, optional): The transition scores with shape [num_labels, num_labels],
+            `transitions[i, j]` is the score from label `i` to label `j`. Defaults to the illegal
+            transitions of the OIB labels.
+        start_transitions (numpy.ndarray, optional): The scores of the first labels with shape [num_labels].
+            Defaults to the illegal start transitions of the OIB labels.
+
+    Returns:
+        tuple: The best scores with shape [batch_size] and the label ids of the best paths with shape
+        [batch_size, seq_len], the label ids after the length of a sequence are 0.
+    """
+    logits = np.asarray(logits, dtype="float64")
+    batch_size, seq_len, num_labels = logits.shape
+    if transitions is None:
+        transitions = OIB_ILLEGAL_TRANSITIONS[:num_labels, :num_labels]
+    if start_transitions is None:
+        start_transitions = OIB_ILLEGAL_TRANSITIONS[num_labels, :num_labels]
+    transitions = np.asarray(transitions, dtype="float64")
+    if lengths is None:
+        lengths = np.full([batch_size], seq_len, dtype="int64")
+    lengths = np.asarray(lengths, dtype="int64")
+
+    paths = np.zeros([batch_size, seq_len], dtype="int64")
+    if seq_len == 0:
+        return np.zeros([batch_size]), paths
+
+    scores = logits[:, 0] + np.asarray(start_transitions, dtype="float64")
+    backpointers = np.zeros([batch_size, seq_len, num_labels], dtype="int64")
+    for step in range(1, seq_len):
+        # [batch_size, previous label, current label]
+        cand_scores = transitions[None] + scores[:, :, None] + logits[:, step, None, :]
+        backpointers[:, step] = cand_scores.argmax(axis=1)
+        active = (step < lengths)[:, None]
+        scores = np.where(active, cand_scores.max(axis=1), scores)
+
+    batch_index = np.arange(batch_size)
+    best_scores = scores.max(axis=1)
+    last_labels = scores.argmax(axis=1)
+    labels = last_labels
+    for step in range(seq_len - 1, -1, -1):
+        # the sequences shorter than `step + 1` start from their last labels
+        labels = np.where(step == lengths - 1, last_labels, labels)
+        paths[:, step] = np.where(step < lengths, labels, 0)
+        if step > 0:
+            labels = backpointers[batch_index, step, labels]
+    return best_scores, paths
+
+
 def viterbi_decode(logits):
     np_logits = np.array(logits)  # shape: L * D
-    length, dim = np_logits.shape
-    f = np.zeros(np_logits.shape)
-    path = [["" for i in range(dim)] for j in range(length)]
-    label_scheme = "OIB"
-    # oib label 0:O, 1:I, 2:B
-    # illegal matrix: [O, I ,B, start, end] * [O, I, B, start, end]
-    illegal = np.array([[0, -1, 0, -1, 0], [0, 0, 0, -1, 0], [0, 0, 0, 0, 0], [0, -1, 0, 0, 0], [-1, -1, -1, -1, -1]])
-    illegal = illegal * 1000
-
-    f[0, :] = np_logits[0, :] + illegal[3, :3]
-    path[0] = [label_scheme[i] for i in range(dim)]
-
-    for step in range(1, length):
-        last_s = f[step - 1, :]
-        for d in range(dim):
-            cand_score = illegal[:3, d] + last_s + np_logits[step, d]
-            f[step, d] = np.max(cand_score)
-            path[step][d] = path[step - 1][np.argmax(cand_score)] + label_scheme[d]
-    final_path = path[-1][np.argmax(f[-1, :])]
-    return final_path
-
-
-def find_answer_pos(logits, feature):
+    _, paths = batch_viterbi_decode(np_logits[None])
+    return "".join(OIB_LABEL_SCHEME[label] for label in paths[0])
+
+
+def find_answer_pos(logits, feature, best_path=None):
     start_index = -1
     end_index = -1
     ans = []
     cand_ans = []
 
-    best_path = viterbi_decode(logits)
+    if best_path is None:
+        best_path = viterbi_decode(logits)
     cand_ans = find_bio_pos(best_path)
 
     for start_index, end_index in cand_ans:
@@ -76,6 +76,7 @@ from tqdm.auto import tqdm
 
 from ..data import (
     DataCollator,
+    DataCollatorWithBatchFetch,
     DataCollatorWithPadding,
     DistDataLoader,
     default_data_collator,
@@ -1650,10 +1651,15 @@ class Trainer:
             if self.args.distributed_dataloader:
                 logger.info("Training using DistDataLoader.")
                 additional_configs = {"pp_data_group": self._pp_data_group}
+            data_collator = self.data_collator
+            if isinstance(train_dataset, paddle.io.Dataset) and hasattr(train_dataset, "__getitems__"):
+                # paddle.io.DataLoader fetches one sample at a time, fetch the whole batch in the collate instead
+                data_collator = DataCollatorWithBatchFetch(train_dataset, data_collator)
+                train_dataset = data_collator.index_dataset()
             return _DataLoader(
                 train_dataset,
                 batch_sampler=train_sampler,
-                collate_fn=self.data_collator,
+                collate_fn=data_collator,
                 num_workers=self.args.dataloader_num_workers,
                 **additional_configs,
             )
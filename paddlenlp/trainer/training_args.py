@@ -918,10 +918,20 @@ class TrainingArguments:
                 "                            2. if master weights does not exist, convert model weights to master weights when needed\n"
                 "- remove_master_weight: same with `master_weight_compatible`, use in checkpoint quantization.\n"
                 "- async_save: enable asynchronous saving checkpoints to disk\n"
+                "- async_save_stream: with `async_save`, stream the checkpoints through shared memory slots that are\n"
+                "                     written while the rest is staged, instead of staging a full copy first\n"
                 "- enable_all_options: enable all optimization configurations\n"
             )
         },
     )
+    async_save_stream_buffer_size: int = field(
+        default=512,
+        metadata={
+            "help": "The size (MB) of each shared memory slot used by `async_save_stream` in "
+            "`unified_checkpoint_config`. Slots are allocated whenever the writer falls behind, so staging never "
+            "waits for the disk and uses at most the size of the largest state dict."
+        },
+    )
     ckpt_quant_stage: str = field(
         default="O0",
         metadata={
@@ -1776,12 +1786,14 @@ class TrainingArguments:
                         "master_weight_compatible",
                         "remove_master_weight",
                         "async_save",
+                        "async_save_stream",
                         "enable_all_options",
                         "ignore_merge_optimizer",
                     ]:
                         raise ValueError(
                             f"Found unknown unified_checkpoint config {x}, accpet config is skip_save_model_weight, "
-                            + "master_weight_compatible, async_save, enable_all_options, ignore_merge_optimizer."
+                            + "master_weight_compatible, async_save, async_save_stream, enable_all_options, "
+                            + "ignore_merge_optimizer."
                         )
             if "enable_all_options" in unified_checkpoint_config:
                 self.unified_checkpoint_config = [
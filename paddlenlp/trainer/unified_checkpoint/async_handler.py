@@ -15,9 +15,11 @@
 
 import multiprocessing
 import os
+import queue
 import time
 from multiprocessing import shared_memory
 
+import numpy as np
 import paddle
 import paddle.distributed as dist
 
@@ -35,11 +37,189 @@ from .shared_memory_utils import (
     _read_state_dict_from_shm,
     _traverse_copy_to_shm,
     create_meta_dict,
+    create_safetensors_header,
+    is_streamable_state_dict,
 )
 
 __all__ = ["AsyncCheckpointHandler"]
 
 
+def _stream_save_in_process(task_queue, free_queue, state_dict_type, global_rank):
+    """Writes the chunks staged in the shared memory slots into safetensors files."""
+    slots = {}
+    f = None
+    while True:
+        task = task_queue.get()
+        if task is None:  # stop process
+            break
+        if task[0] == "begin":
+            _, path, signal_path, header = task
+            logger.info(f"Start to async save {path}")
+            start_time = time.time()
+            write_time = 0.0
+            f = open(path, "wb")
+            f.write(header)
+        elif task[0] == "chunk":
+            _, slot, slot_name, nbytes = task
+            if slot not in slots:
+                slots[slot] = shared_memory.SharedMemory(name=slot_name)
+            t0 = time.time()
+            f.write(slots[slot].buf[:nbytes])
+            write_time += time.time() - t0
+            free_queue.put(slot)
+        elif task[0] == "end":
+            t0 = time.time()
+            f.flush()
+            os.fsync(f.fileno())
+            f.close()
+            f = None
+            fsync_time = time.time() - t0
+            saved_signal_path = os.path.join(signal_path, f".{state_dict_type}.done.{global_rank}")
+            paddle.save(global_rank, saved_signal_path)
+            logger.info(
+                f"Finish async save {path}, write: {write_time:.3f}s, fsync: {fsync_time:.3f}s, "
+                f"total: {time.time() - start_time:.3f}s"
+            )
+            free_queue.put("done")
+    for shm in slots.values():
+        shm.close()
+
+
+class ShmRingSaver:
+    """
+    Saves state dicts into safetensors files by streaming the tensors through shared memory slots of
+    `slot_size` bytes. While the training process copies tensors into a free slot, a background process
+    writes the filled slots and hands them back, so writing overlaps with staging.
+
+    Staging never waits for the disk: if no slot has been written back yet, a new slot is allocated. The
+    slots are kept and reused by the following saves, so the host memory used for staging is bounded by the
+    size of the largest saved state dict (rounded up to `slot_size`), the same as a full copy, and stays
+    much smaller when the disk keeps up with the device to host copies. `max_slots` caps the memory at
+    `max_slots * slot_size` bytes instead, at the cost of waiting for the writer once all the slots are
+    in use.
+
+    Args:
+        state_dict_type (str): The type of the saved state dicts, used in the name of the signal files.
+        global_rank (int): The global rank, used in the name of the signal files.
+        slot_size (int): The size of each shared memory slot in bytes.
+        max_slots (int, optional): The maximum number of shared memory slots. Defaults to None (unbounded).
+    """
+
+    def __init__(self, state_dict_type, global_rank, slot_size, max_slots=None):
+        self.state_dict_type = state_dict_type
+        self.slot_size = slot_size
+        self.max_slots = max_slots
+        # the first slot is created before the writer process starts, so that both share the resource tracker
+        # of the shared memory
+        self.slots = [shared_memory.SharedMemory(create=True, size=slot_size)]
+        self.free_slots = [0]
+        self.task_queue = multiprocessing.Queue()
+        self.free_queue = multiprocessing.Queue()
+        self.saving = False
+        self.process = multiprocessing.Process(
+            target=_stream_save_in_process,
+            args=(self.task_queue, self.free_queue, state_dict_type, global_rank),
+        )
+        self.process.start()
+
+    def _handle(self, message):
+        if message == "done":
+            self.saving = False
+        else:
+            self.free_slots.append(message)
+
+    def _receive(self):
+        while True:
+            try:
+                message = self.free_queue.get(timeout=0.5)
+            except queue.Empty:
+                if not self.process.is_alive():
+                    raise RuntimeError(f"The process that saves {self.state_dict_type} has been killed unexpectedly.")
+                continue
+            self._handle(message)
+            return
+
+    def _acquire_slot(self):
+        while len(self.free_slots) == 0:
+            try:
+                self._handle(self.free_queue.get_nowait())
+                continue
+            except queue.Empty:
+                pass
+            if self.max_slots is None or len(self.slots) < self.max_slots:
+                self.slots.append(shared_memory.SharedMemory(create=True, size=self.slot_size))
+                return len(self.slots) - 1
+            self._receive()
+        return self.free_slots.pop(0)
+
+    def _put_chunk(self, slot, nbytes):
+        self.task_queue.put(("chunk", slot, self.slots[slot].name, nbytes))
+
+    def wait(self):
+        """Waits until the previous state dict has been written."""
+        while self.saving or len(self.free_slots) < len(self.slots):
+            self._receive()
+
+    def save(self, state_dict, path, signal_path):
+        self.wait()
+        self.task_queue.put(("begin", path, signal_path, create_safetensors_header(state_dict, {"format": "np"})))
+        self.saving = True
+
+        d2h_time, copy_time, wait_time = 0.0, 0.0, 0.0
+        slot, filled = None, 0
+        for value in state_dict.values():
+            flat_value = value.reshape([-1]) if paddle.is_tensor(value) else value.reshape(-1)
+            element_size = value.element_size() if paddle.is_tensor(value) else value.itemsize
+            numel, start = flat_value.shape[0], 0
+            while start < numel:
+                if slot is None:
+                    t0 = time.time()
+                    slot, filled = self._acquire_slot(), 0
+                    wait_time += time.time() - t0
+                count = min(numel - start, (self.slot_size - filled) // element_size)
+                if count == 0:
+                    # no room for another element in the slot
+                    self._put_chunk(slot, filled)
+                    slot = None
+                    continue
+
+                t0 = time.time()
+                piece = flat_value[start : start + count]
+                if paddle.is_tensor(piece):
+                    piece = piece.cpu().numpy()
+                t1 = time.time()
+                shm_array = np.frombuffer(self.slots[slot].buf, dtype=np.uint8, count=piece.nbytes, offset=filled)
+                shm_array[:] = piece.view(np.uint8)
+                del shm_array
+                d2h_time += t1 - t0
+                copy_time += time.time() - t1
+
+                start += count
+                filled += piece.nbytes
+                if filled == self.slot_size:
+                    self._put_chunk(slot, filled)
+                    slot = None
+
+        if slot is not None:
+            if filled > 0:
+                self._put_chunk(slot, filled)
+            else:
+                self.free_slots.append(slot)
+        self.task_queue.put(("end",))
+        logger.info(
+            f"Staged {self.state_dict_type} of {path} in {len(self.slots)} slots, D2H: {d2h_time:.3f}s, "
+            f"shm copy: {copy_time:.3f}s, wait for writer: {wait_time:.3f}s"
+        )
+
+    def close(self):
+        self.wait()
+        self.task_queue.put(None)
+        self.process.join()
+        for shm in self.slots:
+            shm.close()
+            shm.unlink()
+
+
 class AsyncCheckpointHandler:
     def __init__(self, args):
         # Mainly for asynchronous saving.
@@ -59,6 +239,7 @@ class AsyncCheckpointHandler:
         self._shared_save_model_flag = None
         self._shared_save_master_weight_flag = None
         self._shared_save_optimizer_flag = None
+        self._ring_savers = {}
 
         if "async_save" in self.args.unified_checkpoint_config:
             self._lock = multiprocessing.Lock()
@@ -89,6 +270,14 @@ class AsyncCheckpointHandler:
                 paddle.save(self.global_rank, saved_signal_path)
                 return
 
+            if (
+                "async_save_stream" in self.args.unified_checkpoint_config
+                and not (state_dict_type == "optimizer_weight" and ckpt_quant_stage != "O0")
+                and is_streamable_state_dict(state_dict)
+            ):
+                self._get_ring_saver(state_dict_type).save(state_dict, path, signal_path)
+                return
+
             if state_dict_type == "model_weight":
                 if self._shm_model_weight is None:
                     self._meta_dict_model, buffer_size = create_meta_dict(state_dict)
@@ -220,6 +409,16 @@ class AsyncCheckpointHandler:
             time.sleep(0.5)
         shm.close()
 
+    def _get_ring_saver(self, state_dict_type):
+        if state_dict_type not in self._ring_savers:
+            signal_type = state_dict_type
+            if state_dict_type == "master_weight" and "skip_save_model_weight" in self.args.unified_checkpoint_config:
+                signal_type = "model_weight"
+            self._ring_savers[state_dict_type] = ShmRingSaver(
+                signal_type, self.global_rank, slot_size=self.args.async_save_stream_buffer_size * 1024 * 1024
+            )
+        return self._ring_savers[state_dict_type]
+
     def _reset_and_update(self, shared_array, new_value):
         # clear array
         for i in range(len(shared_array)):
@@ -250,6 +449,9 @@ class AsyncCheckpointHandler:
                     raise RuntimeError("The process that saves optimizer_weight has been killed unexpectedly.")
                 time.sleep(0.5)
             self._shared_save_optimizer_flag[0] = -1
+        for ring_saver in self._ring_savers.values():
+            ring_saver.close()
+        self._ring_savers = {}
 
         if self._shm_model_weight is not None:
             self._shm_model_weight.close()
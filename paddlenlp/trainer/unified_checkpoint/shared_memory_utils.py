@@ -13,6 +13,8 @@
 # limitations under the License.
 """Shared Memory Utils"""
 
+import json
+import struct
 from dataclasses import dataclass
 from typing import List, Mapping, Tuple
 
@@ -45,6 +47,59 @@ dtype_mapping = {
 }
 
 
+safetensors_dtype_mapping = {
+    np.dtype(np.float32): "F32",
+    np.dtype(np.float64): "F64",
+    np.dtype(np.float16): "F16",
+    np.dtype(np.int32): "I32",
+    np.dtype(np.int64): "I64",
+    np.dtype(np.uint8): "U8",
+    np.dtype(np.uint16): "U16",
+    np.dtype(np.bool_): "BOOL",
+}
+
+
+def _numpy_dtype(value):
+    if paddle.is_tensor(value):
+        return np.dtype(dtype_mapping[value.dtype]) if value.dtype in dtype_mapping else None
+    if isinstance(value, np.ndarray):
+        return value.dtype
+    return None
+
+
+def is_streamable_state_dict(state_dict):
+    """
+    Whether `state_dict` is a flat dict of tensors (or numpy arrays) whose dtypes can be saved in safetensors.
+    """
+    return isinstance(state_dict, Mapping) and all(
+        _numpy_dtype(value) in safetensors_dtype_mapping for value in state_dict.values()
+    )
+
+
+def create_safetensors_header(state_dict, metadata=None):
+    """
+    Creates the header of the safetensors file of `state_dict`, in which the tensors are laid out in the
+    order of `state_dict`, so that the data of the tensors can be written after the header one by one.
+    """
+    header = {}
+    if metadata is not None:
+        header["__metadata__"] = metadata
+    offset = 0
+    for key, value in state_dict.items():
+        dtype = _numpy_dtype(value)
+        nbytes = int(np.prod(value.shape, dtype=np.int64)) * dtype.itemsize
+        header[key] = {
+            "dtype": safetensors_dtype_mapping[dtype],
+            "shape": list(value.shape),
+            "data_offsets": [offset, offset + nbytes],
+        }
+        offset += nbytes
+    header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    # the data is aligned to 8 bytes
+    header += b" " * (-len(header) % 8)
+    return struct.pack("<Q", len(header)) + header
+
+
 def _write_shared_memory(value: paddle.Tensor, meta: TensorMeta, buffer):
     """
     Write a CPU tensor into the shared memory.
@@ -71,6 +71,7 @@ class UnifiedCheckpointOption(ExplicitEnum):
     "- master_weight_compatible: 1. if the master weights exist, only load when needed\n"
     "                            2. if master weights does not exist, convert model weights to master weights when needed\n"
     "- async_save: enable asynchronous saving checkpoints to disk\n"
+    "- async_save_stream: with async_save, stream checkpoints through a bounded shared memory ring\n"
     "- enable_all_options: enable all optimization configurations\n"
     """
 
@@ -78,6 +79,7 @@ class UnifiedCheckpointOption(ExplicitEnum):
     MASTER_WEIGHT_COMPATIBLE = "master_weight_compatible"
     REMOVE_MASTER_WEIGHT = "remove_master_weight"
     ASYNC_SAVE = "async_save"
+    ASYNC_SAVE_STREAM = "async_save_stream"
     IGNORE_MERGE_OPTIMIZER = "ignore_merge_optimizer"
 
 
@@ -13,27 +13,7 @@
 # limitations under the License.
 
 
-from .configuration_utils import PretrainedConfig
-from .model_utils import PretrainedModel, register_base_model
-from .tokenizer_utils import (
-    PretrainedTokenizer,
-    BPETokenizer,
-    tokenize_chinese_chars,
-    is_chinese_char,
-    AddedToken,
-    normalize_chars,
-    tokenize_special_chars,
-    convert_to_unicode,
-)
-from .tokenizer_utils_fast import PretrainedTokenizerFast
-from .processing_utils import ProcessorMixin
-from .feature_extraction_utils import BatchFeature, FeatureExtractionMixin
-from .image_processing_utils import ImageProcessingMixin
-from .attention_utils import create_bigbird_rand_mask_idx_list
-from .sequence_parallel_utils import AllGatherVarlenOp, sequence_parallel_sparse_mask_labels
-from .tensor_parallel_utils import parallel_matmul, parallel_linear, fused_head_and_loss_fn
-from .moe_gate import *
-from .moe_layer import *
+from ..utils.lazy_import import lazy_module
 
 try:
     from paddle.distributed.fleet.utils.sequence_parallel_utils import (
@@ -48,274 +28,1272 @@ try:
     )
 except:
     pass
-from .export import export_model
 
-# isort: split
-from .bert.modeling import *
-from .bert.tokenizer import *
-from .bert.configuration import *
+# `model_outputs` is imported at once since it patches paddle.nn.TransformerEncoder(Layer) and
+# paddle.nn.TransformerDecoder(Layer) to return all the hidden states and attentions.
+from . import model_outputs
 
-# isort: split
-from .albert.configuration import *
-from .albert.modeling import *
-from .albert.tokenizer import *
-from .artist.configuration import *
-from .artist.modeling import *
-from .artist.tokenizer import *
-from .auto.configuration import *
-from .auto.image_processing import *
-from .auto.modeling import *
-from .auto.processing import *
-from .auto.tokenizer import *
-from .bart.configuration import *
-from .bart.modeling import *
-from .bart.tokenizer import *
-from .bert_japanese.tokenizer import *
-from .bigbird.configuration import *
-from .bigbird.modeling import *
-from .bigbird.tokenizer import *
-from .bit.configuration import *
-from .bit.image_processing import *
-from .bit.modeling import *
-from .blenderbot.configuration import *
-from .blenderbot.modeling import *
-from .blenderbot.tokenizer import *
-from .blenderbot_small.configuration import *
-from .blenderbot_small.modeling import *
-from .blenderbot_small.tokenizer import *
-from .blip.configuration import *
-from .blip.image_processing import *
-from .blip.modeling import *
-from .blip.modeling_text import *
-from .blip.processing import *
-from .blip_2.configuration import *
-from .blip_2.modeling import *
-from .blip_2.processing import *
-from .bloom.configuration import *
-from .bloom.modeling import *
-from .bloom.tokenizer import *
-from .bloom.tokenizer_fast import *
-from .chatglm.configuration import *
-from .chatglm.modeling import *
-from .chatglm.tokenizer import *
-from .chatglm_v2.configuration import *
-from .chatglm_v2.modeling import *
-from .chatglm_v2.modeling_pp import *
-from .chatglm_v2.tokenizer import *
-from .chinesebert.configuration import *
-from .chinesebert.modeling import *
-from .chinesebert.tokenizer import *
-from .chineseclip.configuration import *
-from .chineseclip.feature_extraction import *
-from .chineseclip.image_processing import *
-from .chineseclip.modeling import *
-from .chineseclip.processing import *
-from .chineseclip.tokenizer import *
-from .clap.configuration import *
-from .clap.feature_extraction import *
-from .clap.modeling import *
-from .clap.processing import *
-from .clip.configuration import *
-from .clip.feature_extraction import *
-from .clip.image_processing import *
-from .clip.modeling import *
-from .clip.processing import *
-from .clip.tokenizer import *
-from .clipseg.configuration import *
-from .clipseg.image_processing import *
-from .clipseg.modeling import *
-from .clipseg.processing import *
-from .codegen.configuration import *
-from .codegen.modeling import *
-from .codegen.tokenizer import *
-from .convbert.configuration import *
-from .convbert.modeling import *
-from .convbert.tokenizer import *
-from .ctrl.configuration import *
-from .ctrl.modeling import *
-from .ctrl.tokenizer import *
-from .dallebart.configuration import *
-from .dallebart.modeling import *
-from .dallebart.tokenizer import *
-from .deberta.configuration import *
-from .deberta.modeling import *
-from .deberta.tokenizer import *
-from .deberta_v2.configuration import *
-from .deberta_v2.modeling import *
-from .deberta_v2.tokenizer import *
-from .deepseek_v2 import *
-from .deepseek_v3 import *
-from .distilbert.configuration import *
-from .distilbert.modeling import *
-from .distilbert.tokenizer import *
-from .dpt.configuration import *
-from .dpt.image_processing import *
-from .dpt.modeling import *
-from .electra.configuration import *
-from .electra.modeling import *
-from .electra.tokenizer import *
-from .ernie.configuration import *
-from .ernie.modeling import *
-from .ernie.tokenizer import *
-from .ernie_code.configuration import *
-from .ernie_code.modeling import *
-from .ernie_code.tokenizer import *
-from .ernie_ctm.configuration import *
-from .ernie_ctm.modeling import *
-from .ernie_ctm.tokenizer import *
-from .ernie_doc.configuration import *
-from .ernie_doc.modeling import *
-from .ernie_doc.tokenizer import *
-from .ernie_gen.modeling import ErnieForGeneration
-from .ernie_gram.configuration import *
-from .ernie_gram.modeling import *
-from .ernie_gram.tokenizer import *
-from .ernie_layout.configuration import *
-from .ernie_layout.modeling import *
-from .ernie_layout.tokenizer import *
-from .ernie_m.configuration import *
-from .ernie_m.modeling import *
-from .ernie_m.tokenizer import *
-from .ernie_vil.configuration import *
-from .ernie_vil.feature_extraction import *
-from .ernie_vil.image_processing import *
-from .ernie_vil.modeling import *
-from .ernie_vil.processing import *
-from .ernie_vil.tokenizer import *
-from .fnet.configuration import *
-from .fnet.modeling import *
-from .fnet.tokenizer import *
-from .funnel.configuration import *
-from .funnel.modeling import *
-from .funnel.tokenizer import *
-from .gau_alpha.configuration import *
-from .gau_alpha.modeling import *
-from .gau_alpha.tokenizer import *
-from .gemma import *
-from .glm.configuration import *
-from .glm.modeling import *
-from .glm.tokenizer import *
-from .gpt import *
-from .gptj.configuration import *
-from .gptj.modeling import *
-from .gptj.tokenizer import *
-from .jamba.configuration import *
-from .jamba.modeling import *
-from .jamba.tokenizer import *
-from .layoutlm.configuration import *
-from .layoutlm.modeling import *
-from .layoutlm.tokenizer import *
-from .layoutlmv2.configuration import *
-from .layoutlmv2.modeling import *
-from .layoutlmv2.tokenizer import *
-from .layoutxlm.configuration import *
-from .layoutxlm.modeling import *
-from .layoutxlm.tokenizer import *
-from .llama import *
-from .llm_embed.modeling import *
-from .luke.configuration import *
-from .luke.modeling import *
-from .luke.tokenizer import *
-from .mamba.configuration import *
-from .mamba.modeling import *
-from .mamba.tokenizer import *
-from .mbart.configuration import *
-from .mbart.modeling import *
-from .mbart.tokenizer import *
-from .megatronbert.configuration import *
-from .megatronbert.modeling import *
-from .megatronbert.tokenizer import *
-from .minigpt4.configuration import *
-from .minigpt4.image_processing import *
-from .minigpt4.modeling import *
-from .minigpt4.processing import *
-from .mistral.configuration import *
-from .mistral.modeling import *
-from .mixtral.configuration import *
-from .mixtral.modeling import *
-from .mobilebert.configuration import *
-from .mobilebert.modeling import *
-from .mobilebert.tokenizer import *
-from .mpnet.configuration import *
-from .mpnet.modeling import *
-from .mpnet.tokenizer import *
-from .mt5.configuration import *
-from .mt5.modeling import *
-from .nezha.configuration import *
-from .nezha.modeling import *
-from .nezha.tokenizer import *
-from .nv_embed.modeling import *
-from .nystromformer.configuration import *
-from .nystromformer.modeling import *
-from .nystromformer.tokenizer import *
-from .opt.configuration import *
-from .opt.modeling import *
-from .optimization import *
-from .pegasus.configuration import *
-from .pegasus.modeling import *
-from .pegasus.tokenizer import *
-from .ppminilm.modeling import *
-from .ppminilm.tokenizer import *
-from .prophetnet.configuration import *
-from .prophetnet.modeling import *
-from .prophetnet.tokenizer import *
-from .qwen import *
-from .qwen2 import *
-from .qwen2_moe import *
-from .reformer.configuration import *
-from .reformer.modeling import *
-from .reformer.tokenizer import *
-from .rembert.configuration import *
-from .rembert.modeling import *
-from .rembert.tokenizer import *
-from .roberta.configuration import *
-from .roberta.modeling import *
-from .roberta.tokenizer import *
-from .roformer.configuration import *
-from .roformer.modeling import *
-from .roformer.tokenizer import *
-from .roformerv2.configuration import *
-from .roformerv2.modeling import *
-from .roformerv2.tokenizer import *
-from .rw.configuration import *
-from .rw.modeling import *
-from .rw.tokenizer import *
-from .semantic_search.modeling import *
-from .skep.configuration import *
-from .skep.modeling import *
-from .skep.tokenizer import *
-from .speecht5.configuration import *
-from .speecht5.feature_extraction import *
-from .speecht5.modeling import *
-from .speecht5.processing import *
-from .speecht5.tokenizer import *
-from .squeezebert.configuration import *
-from .squeezebert.modeling import *
-from .squeezebert.tokenizer import *
-from .t5.configuration import *
-from .t5.modeling import *
-from .t5.tokenizer import *
-from .tinybert.configuration import *
-from .tinybert.modeling import *
-from .tinybert.tokenizer import *
-from .transformer.modeling import *
-from .unified_transformer.configuration import *
-from .unified_transformer.modeling import *
-from .unified_transformer.tokenizer import *
-from .unimo.configuration import *
-from .unimo.modeling import *
-from .unimo.tokenizer import *
-from .visualglm.configuration import *
-from .visualglm.image_processing import *
-from .visualglm.modeling import *
-from .visualglm.processing import *
-from .xlm.configuration import *
-from .xlm.modeling import *
-from .xlm.tokenizer import *
-from .xlnet.configuration import *
-from .xlnet.modeling import *
-from .xlnet.tokenizer import *
-from .xlm_roberta.modeling import *
-from .xlm_roberta.tokenizer import *
-from .xlm_roberta.configuration import *
-from .yuan import *
+# The names below are imported from the submodules on first access instead of `import paddlenlp.transformers`,
+# see `paddlenlp.utils.lazy_import`. A name exported by several submodules is taken from the first one,
+# unless a later submodule defines it, which is what the former `from .xxx import *` chain resolved to.
+import_structure = {
+    "configuration_utils": ["PretrainedConfig"],
+    "model_utils": ["PretrainedModel", "register_base_model"],
+    "tokenizer_utils": [
+        "PretrainedTokenizer",
+        "BPETokenizer",
+        "tokenize_chinese_chars",
+        "is_chinese_char",
+        "AddedToken",
+        "normalize_chars",
+        "tokenize_special_chars",
+        "convert_to_unicode",
+        "Trie",
+    ],
+    "tokenizer_utils_fast": ["PretrainedTokenizerFast"],
+    "tokenizer_utils_base": ["BatchEncoding", "PaddingStrategy"],
+    "processing_utils": ["ProcessorMixin"],
+    "feature_extraction_utils": ["BatchFeature", "FeatureExtractionMixin"],
+    "feature_extraction_sequence_utils": ["SequenceFeatureExtractor"],
+    "audio_utils": ["mel_filter_bank", "spectrogram", "window_function"],
+    "image_processing_utils": ["ImageProcessingMixin"],
+    "attention_utils": ["create_bigbird_rand_mask_idx_list"],
+    "activations": ["ACT2FN"],
+    "model_outputs": [
+        "BaseModelOutput",
+        "BaseModelOutputWithPast",
+        "BaseModelOutputWithPastAndCrossAttentions",
+        "CausalLMOutputWithPast",
+        "CausalLMOutputWithCrossAttentions",
+        "MoEModelOutputWithPast",
+        "MoECausalLMOutputWithPast",
+        "Seq2SeqModelOutput",
+        "Seq2SeqLMOutput",
+        "Seq2SeqSpectrogramOutput",
+    ],
+    "sequence_parallel_utils": ["AllGatherVarlenOp", "sequence_parallel_sparse_mask_labels"],
+    "tensor_parallel_utils": ["parallel_linear", "fused_head_and_loss_fn"],
+    "moe_gate": ["MoEGateMixin", "PretrainedMoEGate"],
+    "moe_layer": ["dispatching", "combining", "MoELayer"],
+    "export": ["export_model"],
+    "bert.modeling": [
+        "BertModel",
+        "BertPretrainedModel",
+        "BertForPretraining",
+        "BertPretrainingCriterion",
+        "BertPretrainingHeads",
+        "BertForSequenceClassification",
+        "BertForTokenClassification",
+        "BertForQuestionAnswering",
+        "BertForMultipleChoice",
+        "BertForMaskedLM",
+    ],
+    "bert.tokenizer": ["BasicTokenizer", "BertTokenizer", "WordpieceTokenizer"],
+    "bert.configuration": ["BERT_PRETRAINED_INIT_CONFIGURATION", "BertConfig", "BERT_PRETRAINED_RESOURCE_FILES_MAP"],
+    "albert.configuration": [
+        "ALBERT_PRETRAINED_INIT_CONFIGURATION",
+        "AlbertConfig",
+        "ALBERT_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "albert.modeling": [
+        "AlbertPretrainedModel",
+        "AlbertModel",
+        "AlbertForPretraining",
+        "AlbertForMaskedLM",
+        "AlbertForSequenceClassification",
+        "AlbertForTokenClassification",
+        "AlbertForQuestionAnswering",
+        "AlbertForMultipleChoice",
+    ],
+    "albert.tokenizer": ["AlbertTokenizer", "AlbertChineseTokenizer", "AlbertEnglishTokenizer"],
+    "artist.configuration": [
+        "ARTIST_PRETRAINED_INIT_CONFIGURATION",
+        "ARTIST_PRETRAINED_RESOURCE_FILES_MAP",
+        "ArtistConfig",
+    ],
+    "artist.modeling": ["ArtistModel", "ArtistForConditionalGeneration"],
+    "artist.tokenizer": ["ArtistTokenizer"],
+    "auto.configuration": ["AutoConfig"],
+    "auto.image_processing": ["AutoImageProcessor"],
+    "auto.modeling": [
+        "AutoBackbone",
+        "AutoModel",
+        "AutoModelForPretraining",
+        "AutoModelForSequenceClassification",
+        "AutoModelForTokenClassification",
+        "AutoModelForQuestionAnswering",
+        "AutoModelForMultipleChoice",
+        "AutoModelForMaskedLM",
+        "AutoModelForCausalLM",
+        "AutoInferenceModelForCausalLM",
+        "AutoModelForCausalLMPipe",
+        "AutoEncoder",
+        "AutoDecoder",
+        "AutoGenerator",
+        "AutoDiscriminator",
+        "AutoModelForConditionalGeneration",
+    ],
+    "auto.processing": ["AutoProcessor"],
+    "auto.tokenizer": ["AutoTokenizer"],
+    "bart.configuration": ["BART_PRETRAINED_INIT_CONFIGURATION", "BartConfig", "BART_PRETRAINED_RESOURCE_FILES_MAP"],
+    "bart.modeling": [
+        "BartModel",
+        "BartPretrainedModel",
+        "BartEncoder",
+        "BartDecoder",
+        "BartClassificationHead",
+        "BartForSequenceClassification",
+        "BartForQuestionAnswering",
+        "BartForConditionalGeneration",
+    ],
+    "bart.tokenizer": ["BartTokenizer"],
+    "bert_japanese.tokenizer": ["BertJapaneseTokenizer", "MecabTokenizer", "CharacterTokenizer"],
+    "bigbird.configuration": [
+        "BIGBIRD_PRETRAINED_INIT_CONFIGURATION",
+        "BigBirdConfig",
+        "BIGBIRD_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "bigbird.modeling": [
+        "BigBirdModel",
+        "BigBirdPretrainedModel",
+        "BigBirdForPretraining",
+        "BigBirdPretrainingCriterion",
+        "BigBirdForSequenceClassification",
+        "BigBirdPretrainingHeads",
+        "BigBirdForQuestionAnswering",
+        "BigBirdForTokenClassification",
+        "BigBirdForMultipleChoice",
+        "BigBirdForMaskedLM",
+        "BigBirdForCausalLM",
+    ],
+    "bigbird.tokenizer": ["BigBirdTokenizer"],
+    "bit.configuration": ["BitConfig"],
+    "bit.image_processing": ["BitImageProcessor"],
+    "bit.modeling": ["BitPretrainedModel", "BitModel", "BitForImageClassification", "BitBackbone"],
+    "blenderbot.configuration": [
+        "BLENDERBOT_PRETRAINED_INIT_CONFIGURATION",
+        "BlenderbotConfig",
+        "BLENDERBOT_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "blenderbot.modeling": [
+        "BlenderbotModel",
+        "BlenderbotPretrainedModel",
+        "BlenderbotEncoder",
+        "BlenderbotDecoder",
+        "BlenderbotForConditionalGeneration",
+        "BlenderbotForCausalLM",
+    ],
+    "blenderbot.tokenizer": ["BlenderbotTokenizer"],
+    "blenderbot_small.configuration": [
+        "BLENDERBOTSMALL_PRETRAINED_INIT_CONFIGURATION",
+        "BlenderbotSmallConfig",
+        "BLENDERBOTSMALL_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "blenderbot_small.modeling": [
+        "BlenderbotSmallModel",
+        "BlenderbotSmallPretrainedModel",
+        "BlenderbotSmallEncoder",
+        "BlenderbotSmallDecoder",
+        "BlenderbotSmallForConditionalGeneration",
+        "BlenderbotSmallForCausalLM",
+    ],
+    "blenderbot_small.tokenizer": ["BlenderbotSmallTokenizer"],
+    "blip.configuration": ["BlipTextConfig", "BlipVisionConfig", "BlipConfig"],
+    "blip.image_processing": ["BlipImageProcessor"],
+    "blip.modeling": [
+        "BlipPretrainedModel",
+        "BlipVisionModel",
+        "BlipModel",
+        "BlipForConditionalGeneration",
+        "BlipForQuestionAnswering",
+        "BlipForImageTextRetrieval",
+    ],
+    "blip.modeling_text": ["BlipTextPretrainedModel", "BlipTextModel", "BlipTextLMHeadModel"],
+    "blip.processing": ["BlipProcessor"],
+    "blip_2.configuration": ["Blip2VisionConfig", "Blip2QFormerConfig", "Blip2Config"],
+    "blip_2.modeling": [
+        "Blip2QFormerModel",
+        "Blip2Model",
+        "Blip2PretrainedModel",
+        "Blip2VisionModel",
+        "Blip2ForConditionalGeneration",
+    ],
+    "blip_2.processing": ["Blip2Processor"],
+    "bloom.configuration": [
+        "BLOOM_PRETRAINED_INIT_CONFIGURATION",
+        "BloomConfig",
+        "BLOOM_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "bloom.modeling": [
+        "BloomModel",
+        "BloomForPretraining",
+        "BloomForCausalLM",
+        "BloomForSequenceClassification",
+        "BloomForTokenClassification",
+        "BloomForGeneration",
+    ],
+    "bloom.tokenizer": ["BloomTokenizer"],
+    "bloom.tokenizer_fast": ["BloomTokenizerFast"],
+    "chatglm.configuration": ["ChatGLMConfig", "CHATGLM_PRETRAINED_RESOURCE_FILES_MAP"],
+    "chatglm.modeling": ["ChatGLMModel", "ChatGLMPretrainedModel", "ChatGLMForCausalLM"],
+    "chatglm.tokenizer": ["ChatGLMTokenizer"],
+    "chatglm_v2.configuration": ["CHATGLM_V2_PRETRAINED_RESOURCE_FILES_MAP", "ChatGLMv2Config"],
+    "chatglm_v2.modeling": ["ChatGLMv2Model", "ChatGLMv2PretrainedModel", "ChatGLMv2ForCausalLM"],
+    "chatglm_v2.modeling_pp": ["ChatGLMv2ForCausalLMPipe"],
+    "chatglm_v2.tokenizer": ["SPTokenizer", "ChatGLMv2Tokenizer"],
+    "chinesebert.configuration": [
+        "CHINESEBERT_PRETRAINED_INIT_CONFIGURATION",
+        "ChineseBertConfig",
+        "CHINESEBERT_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "chinesebert.modeling": [
+        "ChineseBertModel",
+        "ChineseBertPretrainedModel",
+        "ChineseBertForPretraining",
+        "ChineseBertPretrainingCriterion",
+        "ChineseBertForSequenceClassification",
+        "ChineseBertForTokenClassification",
+        "ChineseBertForQuestionAnswering",
+    ],
+    "chinesebert.tokenizer": ["ChineseBertTokenizer"],
+    "chineseclip.configuration": ["ChineseCLIPTextConfig", "ChineseCLIPVisionConfig", "ChineseCLIPConfig"],
+    "chineseclip.feature_extraction": ["ChineseCLIPFeatureExtractor"],
+    "chineseclip.image_processing": ["ChineseCLIPImageProcessor"],
+    "chineseclip.modeling": [
+        "ChineseCLIPTextModel",
+        "ChineseCLIPVisionModel",
+        "ChineseCLIPPretrainedModel",
+        "ChineseCLIPModel",
+        "ChineseCLIPTextModelWithProjection",
+        "ChineseCLIPVisionModelWithProjection",
+    ],
+    "chineseclip.processing": ["ChineseCLIPProcessor"],
+    "chineseclip.tokenizer": ["ChineseCLIPTokenizer"],
+    "clap.configuration": ["ClapTextConfig", "ClapAudioConfig", "ClapConfig"],
+    "clap.feature_extraction": ["ClapFeatureExtractor"],
+    "clap.modeling": [
+        "ClapTextModelWithProjection",
+        "ClapAudioModelWithProjection",
+        "ClapModel",
+        "ClapAudioModel",
+        "ClapTextModel",
+    ],
+    "clap.processing": ["ClapProcessor"],
+    "clip.configuration": ["CLIPTextConfig", "CLIPVisionConfig", "CLIPConfig"],
+    "clip.feature_extraction": ["CLIPFeatureExtractor"],
+    "clip.image_processing": ["CLIPImageProcessor"],
+    "clip.modeling": [
+        "ModifiedResNet",
+        "CLIPVisionTransformer",
+        "CLIPTextTransformer",
+        "CLIPTextModel",
+        "CLIPVisionModel",
+        "CLIPPretrainedModel",
+        "CLIPModel",
+        "CLIPTextModelWithProjection",
+        "CLIPVisionModelWithProjection",
+    ],
+    "clip.processing": ["CLIPProcessor"],
+    "clip.tokenizer": ["CLIPTokenizer"],
+    "clipseg.configuration": ["CLIPSegTextConfig", "CLIPSegVisionConfig", "CLIPSegConfig"],
+    "clipseg.image_processing": ["ViTImageProcessor"],
+    "clipseg.modeling": [
+        "CLIPSegPreTrainedModel",
+        "CLIPSegTextModel",
+        "CLIPSegVisionModel",
+        "CLIPSegModel",
+        "CLIPSegForImageSegmentation",
+    ],
+    "clipseg.processing": ["CLIPSegProcessor"],
+    "codegen.configuration": [
+        "CODEGEN_PRETRAINED_INIT_CONFIGURATION",
+        "CodeGenConfig",
+        "CODEGEN_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "codegen.modeling": [
+        "CODEGEN_PRETRAINED_MODEL_ARCHIVE_LIST",
+        "fixed_pos_embedding",
+        "rotate_every_two",
+        "duplicate_interleave",
+        "CodeGenAttention",
+        "CodeGenMLP",
+        "CodeGenBlock",
+        "CodeGenPreTrainedModel",
+        "CodeGenModel",
+        "CodeGenForCausalLM",
+    ],
+    "codegen.tokenizer": ["CodeGenTokenizer"],
+    "convbert.configuration": [
+        "CONVBERT_PRETRAINED_INIT_CONFIGURATION",
+        "ConvBertConfig",
+        "CONVBERT_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "convbert.modeling": [
+        "ConvBertModel",
+        "ConvBertForMaskedLM",
+        "ConvBertPretrainedModel",
+        "ConvBertForTotalPretraining",
+        "ConvBertDiscriminator",
+        "ConvBertGenerator",
+        "ConvBertClassificationHead",
+        "ConvBertForSequenceClassification",
+        "ConvBertForTokenClassification",
+        "ConvBertPretrainingCriterion",
+        "ConvBertForQuestionAnswering",
+        "ConvBertForMultipleChoice",
+        "ConvBertForPretraining",
+    ],
+    "convbert.tokenizer": ["ConvBertTokenizer"],
+    "ctrl.configuration": ["CTRL_PRETRAINED_INIT_CONFIGURATION", "CTRLConfig", "CTRL_PRETRAINED_RESOURCE_FILES_MAP"],
+    "ctrl.modeling": [
+        "CTRLPreTrainedModel",
+        "CTRLModel",
+        "CTRLLMHeadModel",
+        "CTRLForSequenceClassification",
+        "SinusoidalPositionalEmbedding",
+        "CTRLForCausalLM",
+    ],
+    "ctrl.tokenizer": ["CTRLTokenizer"],
+    "dallebart.configuration": [
+        "DALLEBART_PRETRAINED_INIT_CONFIGURATION",
+        "DalleBartConfig",
+        "DALLEBART_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "dallebart.modeling": [
+        "DalleBartModel",
+        "DalleBartPretrainedModel",
+        "DalleBartEncoder",
+        "DalleBartDecoder",
+        "DalleBartForConditionalGeneration",
+    ],
+    "dallebart.tokenizer": ["DalleBartTokenizer"],
+    "deberta.configuration": [
+        "DEBERTA_PRETRAINED_INIT_CONFIGURATION",
+        "DebertaConfig",
+        "DEBERTA_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "deberta.modeling": [
+        "DebertaModel",
+        "DebertaForSequenceClassification",
+        "DebertaForQuestionAnswering",
+        "DebertaForTokenClassification",
+        "DebertaPreTrainedModel",
+        "DebertaForMultipleChoice",
+    ],
+    "deberta.tokenizer": ["DebertaTokenizer"],
+    "deberta_v2.configuration": [
+        "DEBERTA_V2_PRETRAINED_INIT_CONFIGURATION",
+        "DebertaV2Config",
+        "DEBERTA_V2_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "deberta_v2.modeling": [
+        "DebertaV2Model",
+        "DebertaV2ForSequenceClassification",
+        "DebertaV2ForQuestionAnswering",
+        "DebertaV2ForTokenClassification",
+        "DebertaV2PreTrainedModel",
+        "DebertaV2ForMultipleChoice",
+    ],
+    "deberta_v2.tokenizer": ["DebertaV2Tokenizer"],
+    "deepseek_v2": [
+        "DeepseekV2Config",
+        "DeepseekV2LMHead",
+        "DeepseekV2PretrainingCriterion",
+        "DeepseekV2ForCausalLM",
+        "DeepseekV2ForSequenceClassification",
+        "DeepseekV2Model",
+        "DeepseekV2PretrainedModel",
+        "DeepseekV2LMHeadAuto",
+        "DeepseekV2ForCausalLMAuto",
+        "DeepseekV2ModelAuto",
+        "DeepseekV2PretrainedModelAuto",
+        "DeepseekV2ForCausalLMPipe",
+        "DeepseekTokenizerFast",
+    ],
+    "deepseek_v3": [
+        "DeepseekV3Config",
+        "DeepseekV3ForCausalLM",
+        "DeepseekV3ForSequenceClassification",
+        "DeepseekV3Model",
+        "DeepseekV3PretrainedModel",
+        "DeepseekV3LMHeadAuto",
+        "DeepseekV3ForCausalLMAuto",
+        "DeepseekV3ModelAuto",
+        "DeepseekV3PretrainedModelAuto",
+        "DeepseekV3ForCausalLMPipe",
+    ],
+    "distilbert.configuration": [
+        "DISTILBERT_PRETRAINED_INIT_CONFIGURATION",
+        "DistilBertConfig",
+        "DISTILBERT_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "distilbert.modeling": [
+        "DistilBertModel",
+        "DistilBertPretrainedModel",
+        "DistilBertForSequenceClassification",
+        "DistilBertForTokenClassification",
+        "DistilBertForQuestionAnswering",
+        "DistilBertForMaskedLM",
+    ],
+    "distilbert.tokenizer": ["DistilBertTokenizer"],
+    "dpt.configuration": ["DPTConfig"],
+    "dpt.image_processing": ["DPTImageProcessor"],
+    "dpt.modeling": ["DPTPretrainedModel", "DPTModel", "DPTForDepthEstimation", "DPTForSemanticSegmentation"],
+    "electra.configuration": [
+        "ElectraConfig",
+        "ELECTRA_PRETRAINED_INIT_CONFIGURATION",
+        "ELECTRA_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "electra.modeling": [
+        "ElectraModel",
+        "ElectraPretrainedModel",
+        "ElectraForTotalPretraining",
+        "ElectraDiscriminator",
+        "ElectraGenerator",
+        "ElectraClassificationHead",
+        "ElectraForSequenceClassification",
+        "ElectraForTokenClassification",
+        "ElectraPretrainingCriterion",
+        "ElectraForMultipleChoice",
+        "ElectraForQuestionAnswering",
+        "ElectraForMaskedLM",
+        "ElectraForPretraining",
+        "ErnieHealthForTotalPretraining",
+        "ErnieHealthPretrainingCriterion",
+        "ErnieHealthDiscriminator",
+    ],
+    "electra.tokenizer": ["ElectraTokenizer"],
+    "ernie.configuration": [
+        "ERNIE_PRETRAINED_INIT_CONFIGURATION",
+        "ErnieConfig",
+        "ERNIE_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "ernie.modeling": [
+        "ErnieModel",
+        "ErniePretrainedModel",
+        "ErnieForSequenceClassification",
+        "ErnieForTokenClassification",
+        "ErnieForQuestionAnswering",
+        "ErnieForPretraining",
+        "ErniePretrainingCriterion",
+        "ErnieForMaskedLM",
+        "ErnieForMultipleChoice",
+        "UIE",
+        "UTC",
+    ],
+    "ernie.tokenizer": ["ErnieTokenizer", "ErnieTinyTokenizer"],
+    "ernie_code.configuration": [
+        "ERNIECODE_PRETRAINED_INIT_CONFIGURATION",
+        "ErnieCodeConfig",
+        "ERNIECODE_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "ernie_code.modeling": [
+        "ErnieCodeModel",
+        "ErnieCodePretrainedModel",
+        "ErnieCodeForConditionalGeneration",
+        "ErnieCodeEncoderModel",
+        "ERNIECODE_PRETRAINED_MODEL_ARCHIVE_LIST",
+    ],
+    "ernie_code.tokenizer": ["ErnieCodeTokenizer"],
+    "ernie_ctm.configuration": [
+        "ERNIE_CTM_CONFIG",
+        "ERNIE_CTM_PRETRAINED_INIT_CONFIGURATION",
+        "ERNIE_CTM_PRETRAINED_RESOURCE_FILES_MAP",
+        "ErnieCtmConfig",
+    ],
+    "ernie_ctm.modeling": [
+        "ErnieCtmPretrainedModel",
+        "ErnieCtmModel",
+        "ErnieCtmWordtagModel",
+        "ErnieCtmNptagModel",
+        "ErnieCtmForTokenClassification",
+    ],
+    "ernie_ctm.tokenizer": ["ErnieCtmTokenizer"],
+    "ernie_doc.configuration": [
+        "ERNIE_DOC_PRETRAINED_INIT_CONFIGURATION",
+        "ErnieDocConfig",
+        "ERNIE_DOC_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "ernie_doc.modeling": [
+        "ErnieDocModel",
+        "ErnieDocPretrainedModel",
+        "ErnieDocForSequenceClassification",
+        "ErnieDocForTokenClassification",
+        "ErnieDocForQuestionAnswering",
+    ],
+    "ernie_doc.tokenizer": ["ErnieDocTokenizer", "ErnieDocBPETokenizer"],
+    "ernie_gen.modeling": ["ErnieGenPretrainedModel", "ErnieForGeneration", "ErnieGenModel"],
+    "ernie_gram.configuration": [
+        "ERNIE_GRAM_PRETRAINED_INIT_CONFIGURATION",
+        "ErnieGramConfig",
+        "ERNIE_GRAM_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "ernie_gram.modeling": [
+        "ErnieGramModel",
+        "ErnieGramPretrainedModel",
+        "ErnieGramForSequenceClassification",
+        "ErnieGramForTokenClassification",
+        "ErnieGramForQuestionAnswering",
+    ],
+    "ernie_gram.tokenizer": ["ErnieGramTokenizer"],
+    "ernie_layout.configuration": [
+        "ERNIE_LAYOUT_PRETRAINED_INIT_CONFIGURATION",
+        "ErnieLayoutConfig",
+        "ERNIE_LAYOUT_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "ernie_layout.modeling": [
+        "ErnieLayoutModel",
+        "ErnieLayoutPretrainedModel",
+        "ErnieLayoutForTokenClassification",
+        "ErnieLayoutForSequenceClassification",
+        "ErnieLayoutForPretraining",
+        "ErnieLayoutForQuestionAnswering",
+        "UIEX",
+    ],
+    "ernie_layout.tokenizer": ["ErnieLayoutTokenizer"],
+    "ernie_m.configuration": [
+        "ERNIE_M_PRETRAINED_INIT_CONFIGURATION",
+        "ErnieMConfig",
+        "ERNIE_M_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "ernie_m.modeling": [
+        "ErnieMModel",
+        "ErnieMPretrainedModel",
+        "ErnieMForSequenceClassification",
+        "ErnieMForTokenClassification",
+        "ErnieMForQuestionAnswering",
+        "ErnieMForMultipleChoice",
+        "UIEM",
+    ],
+    "ernie_m.tokenizer": ["ErnieMTokenizer"],
+    "ernie_vil.configuration": ["ErnieViLTextConfig", "ErnieViLVisionConfig", "ErnieViLConfig"],
+    "ernie_vil.feature_extraction": ["ErnieViLFeatureExtractor"],
+    "ernie_vil.image_processing": ["ErnieViLImageProcessor"],
+    "ernie_vil.modeling": ["ErnieViLModel", "ErnieViLTextModel", "ErnieViLVisionModel", "ErnieViLPretrainedModel"],
+    "ernie_vil.processing": ["ErnieViLProcessor"],
+    "ernie_vil.tokenizer": ["ErnieViLTokenizer"],
+    "fnet.configuration": ["FNET_PRETRAINED_INIT_CONFIGURATION", "FNET_PRETRAINED_RESOURCE_FILES_MAP", "FNetConfig"],
+    "fnet.modeling": [
+        "FNetPretrainedModel",
+        "FNetModel",
+        "FNetForSequenceClassification",
+        "FNetForPreTraining",
+        "FNetForMaskedLM",
+        "FNetForNextSentencePrediction",
+        "FNetForMultipleChoice",
+        "FNetForTokenClassification",
+        "FNetForQuestionAnswering",
+    ],
+    "fnet.tokenizer": ["FNetTokenizer"],
+    "funnel.configuration": [
+        "FUNNEL_PRETRAINED_INIT_CONFIGURATION",
+        "FUNNEL_PRETRAINED_RESOURCE_FILES_MAP",
+        "FunnelConfig",
+    ],
+    "funnel.modeling": [
+        "FunnelModel",
+        "FunnelForSequenceClassification",
+        "FunnelForTokenClassification",
+        "FunnelForQuestionAnswering",
+    ],
+    "funnel.tokenizer": ["FunnelTokenizer"],
+    "gau_alpha.configuration": [
+        "GAUAlPHA_PRETRAINED_INIT_CONFIGURATION",
+        "GAUAlphaConfig",
+        "GAUAlPHA_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "gau_alpha.modeling": [
+        "GAUAlphaModel",
+        "GAUAlphaForMaskedLM",
+        "GAUAlphaPretrainedModel",
+        "GAUAlphaForSequenceClassification",
+        "GAUAlphaForTokenClassification",
+        "GAUAlphaForQuestionAnswering",
+        "GAUAlphaForMultipleChoice",
+    ],
+    "gau_alpha.tokenizer": ["GAUAlphaTokenizer"],
+    "gemma": [
+        "GEMMA_PRETRAINED_INIT_CONFIGURATION",
+        "GemmaConfig",
+        "GEMMA_PRETRAINED_RESOURCE_FILES_MAP",
+        "math",
+        "warnings",
+        "partial",
+        "mpu",
+        "PyLayer",
+        "fleet",
+        "get_rng_state_tracker",
+        "recompute",
+        "fused_rotary_position_embedding",
+        "StateDictNameMapping",
+        "init_name_mappings",
+        "Linear",
+        "ReshardLayer",
+        "caculate_llm_per_token_flops",
+        "flash_attention",
+        "rms_norm_fused",
+        "assign_kv_heads",
+        "scaled_dot_product_attention",
+        "GemmaRMSNorm",
+        "GemmaRotaryEmbedding",
+        "GemmaMLP",
+        "GemmaAttention",
+        "GemmaDecoderLayer",
+        "GemmaPretrainedModel",
+        "GemmaModel",
+        "GemmaPretrainingCriterion",
+        "ConcatSePMaskedLoss",
+        "GemmaLMHead",
+        "GemmaForCausalLM",
+        "GemmaForCausalLMPipe",
+        "GemmaTokenizer",
+        "copyfile",
+        "processors",
+        "GemmaTokenizerFast",
+    ],
+    "glm.configuration": ["GLMConfig", "GLM_PRETRAINED_INIT_CONFIGURATION", "GLM_PRETRAINED_RESOURCE_FILES_MAP"],
+    "glm.modeling": ["GLMModel", "GLMPretrainedModel", "GLMForMultipleChoice", "GLMForConditionalGeneration"],
+    "glm.tokenizer": [
+        "GLMTokenizerMixin",
+        "GLMChineseTokenizer",
+        "GLMGPT2Tokenizer",
+        "GLMBertTokenizer",
+        "GLMTokenizer",
+    ],
+    "gpt": [
+        "GPT_PRETRAINED_INIT_CONFIGURATION",
+        "GPTConfig",
+        "GPT_PRETRAINED_RESOURCE_FILES_MAP",
+        "GPTModel",
+        "GPTPretrainedModel",
+        "GPTPretrainingCriterion",
+        "GPTForGreedyGeneration",
+        "GPTLMHeadModel",
+        "GPTForTokenClassification",
+        "GPTForSequenceClassification",
+        "GPTForCausalLM",
+        "GPTEmbeddings",
+        "GPTDecoderLayer",
+        "GPTLayerNorm",
+        "GPTModelAuto",
+        "GPTPretrainedModelAuto",
+        "GPTPretrainingCriterionAuto",
+        "GPTLMHeadModelAuto",
+        "GPTForCausalLMAuto",
+        "GPTEmbeddingsAuto",
+        "GPTDecoderLayerAuto",
+        "GPTModelNet",
+        "GPTPretrainedModelNet",
+        "GPTPretrainingCriterionNet",
+        "GPTLMHeadModelNet",
+        "GPTForCausalLMNet",
+        "GPTEmbeddingsNet",
+        "GPTDecoderLayerNet",
+        "GPTForCausalLMPipe",
+        "GPTTokenizer",
+        "GPTChineseTokenizer",
+        "pre_tokenizers",
+        "GPTTokenizerFast",
+    ],
+    "gptj.configuration": ["GPTJ_PRETRAINED_INIT_CONFIGURATION", "GPTJ_PRETRAINED_RESOURCE_FILES_MAP", "GPTJConfig"],
+    "gptj.modeling": [
+        "GPTJModel",
+        "GPTJPretrainedModel",
+        "GPTJForCausalLM",
+        "GPTJForSequenceClassification",
+        "GPTJForQuestionAnswering",
+    ],
+    "gptj.tokenizer": ["GPTJTokenizer"],
+    "jamba.configuration": ["JambaConfig"],
+    "jamba.modeling": [
+        "is_fast_path_available",
+        "is_autocast_enabled",
+        "get_triangle_upper_mask",
+        "is_casual_mask",
+        "load_balancing_loss_func",
+        "JambaRMSNorm",
+        "HybridMambaAttentionDynamicCache",
+        "JambaAttention",
+        "JambaFlashAttention2",
+        "JambaMambaMixer",
+        "JambaMLP",
+        "FakeMLPForwardBackward",
+        "JambaSparseMoeBlock",
+        "JambaAttentionDecoderLayer",
+        "JambaMambaDecoderLayer",
+        "JambaPretrainedModel",
+        "ALL_DECODER_LAYER_TYPES",
+        "JambaModel",
+        "JambaPretrainingCriterion",
+        "JambaLMHead",
+        "JambaForCausalLM",
+    ],
+    "jamba.tokenizer": ["JambaTokenizer"],
+    "layoutlm.configuration": [
+        "LAYOUTLM_PRETRAINED_INIT_CONFIGURATION",
+        "LayoutLMConfig",
+        "LAYOUTLM_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "layoutlm.modeling": [
+        "LayoutLMModel",
+        "LayoutLMPretrainedModel",
+        "LayoutLMForMaskedLM",
+        "LayoutLMForTokenClassification",
+        "LayoutLMForSequenceClassification",
+    ],
+    "layoutlm.tokenizer": ["LayoutLMTokenizer"],
+    "layoutlmv2.configuration": [
+        "LAYOUTLMV2_PRETRAINED_INIT_CONFIGURATION",
+        "LayoutLMv2Config",
+        "LAYOUTLMV2_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "layoutlmv2.modeling": [
+        "LayoutLMv2Model",
+        "LayoutLMv2PretrainedModel",
+        "LayoutLMv2ForTokenClassification",
+        "LayoutLMv2ForPretraining",
+        "LayoutLMv2ForRelationExtraction",
+    ],
+    "layoutlmv2.tokenizer": ["LayoutLMv2Tokenizer"],
+    "layoutxlm.configuration": [
+        "LAYOUTXLM_PRETRAINED_INIT_CONFIGURATION",
+        "LayoutXLMConfig",
+        "LAYOUTXLM_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "layoutxlm.modeling": [
+        "LayoutXLMModel",
+        "LayoutXLMPretrainedModel",
+        "LayoutXLMForTokenClassification",
+        "LayoutXLMForSequenceClassification",
+        "LayoutXLMForPretraining",
+        "LayoutXLMForRelationExtraction",
+        "LayoutXLMForQuestionAnswering",
+    ],
+    "layoutxlm.tokenizer": ["SPIECE_UNDERLINE", "LayoutXLMTokenizer"],
+    "llama": [
+        "LLAMA_PRETRAINED_INIT_CONFIGURATION",
+        "LlamaConfig",
+        "LLAMA_PRETRAINED_RESOURCE_FILES_MAP",
+        "LlamaModel",
+        "LlamaPretrainedModel",
+        "LlamaForCausalLM",
+        "LlamaPretrainingCriterion",
+        "LlamaForCausalLM3DAuto",
+        "LlamaPretrainingCriterion3DAuto",
+        "LlamaForCausalLMNet",
+        "LlamaPretrainingCriterionNet",
+        "LlamaForCausalLMPipe",
+        "LlamaTokenizer",
+        "Llama3Tokenizer",
+        "LlamaTokenizerFast",
+    ],
+    "llm_embed.modeling": ["BiEncoderModel"],
+    "luke.configuration": ["LUKE_PRETRAINED_INIT_CONFIGURATION", "LUKE_PRETRAINED_RESOURCE_FILES_MAP", "LukeConfig"],
+    "luke.modeling": [
+        "LukeModel",
+        "LukePretrainedModel",
+        "LukeForEntitySpanClassification",
+        "LukeForEntityPairClassification",
+        "LukeForEntityClassification",
+        "LukeForMaskedLM",
+        "LukeForQuestionAnswering",
+    ],
+    "luke.tokenizer": ["LukeTokenizer"],
+    "mamba.configuration": ["MambaConfig"],
+    "mamba.modeling": ["MambaMixer", "MambaBlock", "MambaModel", "MambaPretrainedModel", "MambaForCausalLM"],
+    "mamba.tokenizer": ["MambaTokenizer"],
+    "mbart.configuration": [
+        "MBART_PRETRAINED_INIT_CONFIGURATION",
+        "MBartConfig",
+        "MBART_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "mbart.modeling": [
+        "MBartModel",
+        "MBartPretrainedModel",
+        "MBartEncoder",
+        "MBartDecoder",
+        "MBartClassificationHead",
+        "MBartForSequenceClassification",
+        "MBartForQuestionAnswering",
+        "MBartForConditionalGeneration",
+    ],
+    "mbart.tokenizer": ["MBartTokenizer", "MBart50Tokenizer"],
+    "megatronbert.configuration": [
+        "MegatronBert_PRETRAINED_INIT_CONFIGURATION",
+        "MegatronBert_PRETRAINED_RESOURCE_FILES_MAP",
+        "MegatronBertConfig",
+    ],
+    "megatronbert.modeling": [
+        "MegatronBertModel",
+        "MegatronBertPretrainedModel",
+        "MegatronBertForQuestionAnswering",
+        "MegatronBertForSequenceClassification",
+        "MegatronBertForNextSentencePrediction",
+        "MegatronBertForCausalLM",
+        "MegatronBertForPreTraining",
+        "MegatronBertForMaskedLM",
+        "MegatronBertForMultipleChoice",
+        "MegatronBertForTokenClassification",
+    ],
+    "megatronbert.tokenizer": ["MegatronBertTokenizer"],
+    "minigpt4.configuration": ["MiniGPT4VisionConfig", "MiniGPT4QFormerConfig", "MiniGPT4Config"],
+    "minigpt4.image_processing": ["MiniGPT4ImageProcessor"],
+    "minigpt4.modeling": [
+        "MiniGPT4Model",
+        "MiniGPT4PretrainedModel",
+        "MiniGPT4QFormerModel",
+        "MiniGPT4VisionModel",
+        "MiniGPT4ForConditionalGeneration",
+    ],
+    "minigpt4.processing": ["MiniGPT4Processor"],
+    "mistral.configuration": ["MistralConfig"],
+    "mistral.modeling": [
+        "MistralRMSNorm",
+        "MistralRotaryEmbedding",
+        "apply_rotary_pos_emb",
+        "MistralMLP",
+        "repeat_kv",
+        "MistralAttention",
+        "MistralDecoderLayer",
+        "MistralPreTrainedModel",
+        "MistralModel",
+        "parallel_matmul",
+        "MistralLMHead",
+        "MistralPretrainingCriterion",
+        "MistralForCausalLM",
+    ],
+    "mixtral.configuration": ["MixtralConfig"],
+    "mixtral.modeling": [
+        "MixtralModel",
+        "MixtralPretrainedModel",
+        "MixtralForCausalLM",
+        "MixtralPretrainingCriterion",
+    ],
+    "mobilebert.configuration": [
+        "MOBILEBERT_PRETRAINED_INIT_CONFIGURATION",
+        "MobileBertConfig",
+        "MOBILEBERT_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "mobilebert.modeling": [
+        "MobileBertModel",
+        "MobileBertPretrainedModel",
+        "MobileBertForPreTraining",
+        "MobileBertForSequenceClassification",
+        "MobileBertForQuestionAnswering",
+    ],
+    "mobilebert.tokenizer": ["MobileBertTokenizer"],
+    "mpnet.configuration": ["MPNET_PRETRAINED_INIT_CONFIGURATION", "MPNetConfig"],
+    "mpnet.modeling": [
+        "MPNetModel",
+        "MPNetPretrainedModel",
+        "MPNetForMaskedLM",
+        "MPNetForSequenceClassification",
+        "MPNetForMultipleChoice",
+        "MPNetForTokenClassification",
+        "MPNetForQuestionAnswering",
+    ],
+    "mpnet.tokenizer": ["MPNetTokenizer"],
+    "mt5.configuration": ["MT5_PRETRAINED_INIT_CONFIGURATION", "MT5Config"],
+    "mt5.modeling": [
+        "MT5Model",
+        "MT5PretrainedModel",
+        "MT5ForConditionalGeneration",
+        "MT5EncoderModel",
+        "MT5_PRETRAINED_MODEL_ARCHIVE_LIST",
+    ],
+    "nezha.configuration": [
+        "NEZHA_PRETRAINED_INIT_CONFIGURATION",
+        "NeZhaConfig",
+        "NEZHA_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "nezha.modeling": [
+        "NeZhaModel",
+        "NeZhaPretrainedModel",
+        "NeZhaForPretraining",
+        "NeZhaForSequenceClassification",
+        "NeZhaForTokenClassification",
+        "NeZhaForQuestionAnswering",
+        "NeZhaForMultipleChoice",
+    ],
+    "nezha.tokenizer": ["NeZhaTokenizer"],
+    "nv_embed.modeling": ["NVEncodeModel"],
+    "nystromformer.configuration": [
+        "NYSTROMFORMER_PRETRAINED_INIT_CONFIGURATION",
+        "NYSTROMFORMER_PRETRAINED_RESOURCE_FILES_MAP",
+        "NystromformerConfig",
+    ],
+    "nystromformer.modeling": [
+        "NystromformerEmbeddings",
+        "NystromformerModel",
+        "NystromformerPretrainedModel",
+        "NystromformerForSequenceClassification",
+        "NystromformerForMaskedLM",
+        "NystromformerForTokenClassification",
+        "NystromformerForMultipleChoice",
+        "NystromformerForQuestionAnswering",
+    ],
+    "nystromformer.tokenizer": ["NystromformerTokenizer"],
+    "opt.configuration": ["OPT_PRETRAINED_INIT_CONFIGURATION", "OPT_PRETRAINED_RESOURCE_FILES_MAP", "OPTConfig"],
+    "opt.modeling": ["OPTModel", "OPTPretrainedModel", "OPTForCausalLM", "OPTForConditionalGeneration"],
+    "optimization": [
+        "LinearDecayWithWarmup",
+        "ConstScheduleWithWarmup",
+        "CosineDecayWithWarmup",
+        "PolyDecayWithWarmup",
+        "CosineAnnealingWithWarmupDecay",
+        "LinearAnnealingWithWarmupDecay",
+    ],
+    "pegasus.configuration": ["PEGASUS_PRETRAINED_INIT_CONFIGURATION", "PegasusConfig"],
+    "pegasus.modeling": [
+        "PegasusModel",
+        "PegasusPretrainedModel",
+        "PegasusEncoder",
+        "PegasusDecoder",
+        "PegasusForConditionalGeneration",
+    ],
+    "pegasus.tokenizer": ["PegasusChineseTokenizer"],
+    "ppminilm.modeling": [
+        "PPMiniLMModel",
+        "PPMiniLMPretrainedModel",
+        "PPMiniLMForSequenceClassification",
+        "PPMiniLMForQuestionAnswering",
+        "PPMiniLMForMultipleChoice",
+    ],
+    "ppminilm.tokenizer": ["PPMiniLMTokenizer"],
+    "ppminilm.configuration": [
+        "PPMINILM_PRETRAINED_INIT_CONFIGURATION",
+        "PPMiniLMConfig",
+        "PPMINILM_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "prophetnet.configuration": [
+        "PROPHETNET_PRETRAINED_INIT_CONFIGURATION",
+        "PROPHETNET_PRETRAINED_RESOURCE_FILES_MAP",
+        "ProphetNetConfig",
+    ],
+    "prophetnet.modeling": [
+        "ProphetNetModel",
+        "ProphetNetPretrainedModel",
+        "ProphetNetEncoder",
+        "ProphetNetDecoder",
+        "ProphetNetForConditionalGeneration",
+    ],
+    "prophetnet.tokenizer": [
+        "PRETRAINED_POSITIONAL_EMBEDDINGS_SIZES",
+        "load_vocab",
+        "create_trie",
+        "ProphetNetTokenizer",
+    ],
+    "qwen": [
+        "QWenConfig",
+        "QWenBlock",
+        "QWenForCausalLM",
+        "QWenLMHeadModel",
+        "QWenPretrainedModel",
+        "QWenModel",
+        "QWenLMHead",
+        "QWenPretrainingCriterion",
+        "QWenBlockAuto",
+        "QWenForCausalLM3DAuto",
+        "QWenPretrainedModelAuto",
+        "QWenModelAuto",
+        "QWenLMHeadAuto",
+        "QWenPretrainingCriterionAuto",
+        "QWenBlockNet",
+        "QWenForCausalLMNet",
+        "QWenPretrainedModelNet",
+        "QWenModelNet",
+        "QWenLMHeadNet",
+        "QWenPretrainingCriterionNet",
+        "QWenForCausalLMPipe",
+        "QWenTokenizer",
+    ],
+    "qwen2": [
+        "Qwen2Config",
+        "Qwen2Model",
+        "Qwen2PretrainedModel",
+        "Qwen2ForCausalLM",
+        "Qwen2PretrainingCriterion",
+        "Qwen2ForSequenceClassification",
+        "Qwen2ForTokenClassification",
+        "Qwen2SentenceEmbedding",
+        "Qwen2ForCausalLMPipe",
+        "VOCAB_FILES_NAMES",
+        "MAX_MODEL_INPUT_SIZES",
+        "Qwen2TokenizerFast",
+    ],
+    "qwen2_moe": [
+        "Qwen2Tokenizer",
+        "Qwen2MoeConfig",
+        "Qwen2MoeModel",
+        "Qwen2MoePretrainedModel",
+        "Qwen2MoeForCausalLM",
+        "Qwen2MoePretrainingCriterion",
+        "Qwen2MoeForCausalLMPipe",
+    ],
+    "reformer.configuration": [
+        "REFORMER_PRETRAINED_INIT_CONFIGURATION",
+        "ReformerConfig",
+        "REFORMER_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "reformer.modeling": [
+        "ReformerModel",
+        "ReformerPretrainedModel",
+        "ReformerForSequenceClassification",
+        "ReformerForQuestionAnswering",
+        "ReformerModelWithLMHead",
+        "ReformerForMaskedLM",
+        "ReformerLayer",
+    ],
+    "reformer.tokenizer": ["ReformerTokenizer"],
+    "rembert.configuration": [
+        "REMBERT_PRETRAINED_INIT_CONFIGURATION",
+        "REMBERT_PRETRAINED_RESOURCE_FILES_MAP",
+        "RemBertConfig",
+    ],
+    "rembert.modeling": [
+        "RemBertModel",
+        "RemBertForMaskedLM",
+        "RemBertForQuestionAnswering",
+        "RemBertForSequenceClassification",
+        "RemBertForMultipleChoice",
+        "RemBertPretrainedModel",
+        "RemBertForTokenClassification",
+    ],
+    "rembert.tokenizer": ["RemBertTokenizer"],
+    "roberta.configuration": ["RobertaConfig"],
+    "roberta.modeling": [
+        "RobertaModel",
+        "RobertaPretrainedModel",
+        "RobertaForSequenceClassification",
+        "RobertaForTokenClassification",
+        "RobertaForQuestionAnswering",
+        "RobertaForMaskedLM",
+        "RobertaForMultipleChoice",
+        "RobertaForCausalLM",
+    ],
+    "roberta.tokenizer": ["RobertaTokenizer", "RobertaChineseTokenizer", "RobertaBPETokenizer"],
+    "roformer.configuration": [
+        "ROFORMER_PRETRAINED_INIT_CONFIGURATION",
+        "RoFormerConfig",
+        "ROFORMER_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "roformer.modeling": [
+        "RoFormerModel",
+        "RoFormerPretrainedModel",
+        "RoFormerForSequenceClassification",
+        "RoFormerForTokenClassification",
+        "RoFormerForQuestionAnswering",
+        "RoFormerForMaskedLM",
+        "RoFormerForMultipleChoice",
+        "RoFormerForCausalLM",
+    ],
+    "roformer.tokenizer": ["RoFormerTokenizer", "JiebaBasicTokenizer"],
+    "roformerv2.configuration": [
+        "RoFormerv2Config",
+        "ROFORMERV2_PRETRAINED_INIT_CONFIGURATION",
+        "ROFORMERV2_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "roformerv2.modeling": [
+        "RoFormerv2Model",
+        "RoFormerv2ForMaskedLM",
+        "RoFormerv2PretrainedModel",
+        "RoFormerv2ForSequenceClassification",
+        "RoFormerv2ForTokenClassification",
+        "RoFormerv2ForQuestionAnswering",
+        "RoFormerv2ForMultipleChoice",
+    ],
+    "roformerv2.tokenizer": ["RoFormerv2Tokenizer"],
+    "rw.configuration": ["RW_PRETRAINED_INIT_CONFIGURATION", "RWConfig"],
+    "rw.modeling": [
+        "rotate_half",
+        "RotaryEmbedding",
+        "build_alibi_tensor",
+        "dropout_add",
+        "Attention",
+        "MLP",
+        "DecoderLayer",
+        "RWPreTrainedModel",
+        "RWModel",
+        "CausalLMHead",
+        "RWForCausalLM",
+    ],
+    "rw.tokenizer": ["RWTokenizer"],
+    "semantic_search.modeling": ["ErnieDualEncoder", "ErnieCrossEncoder", "ErnieEncoder"],
+    "skep.configuration": ["SKEP_PRETRAINED_INIT_CONFIGURATION", "SKEP_PRETRAINED_RESOURCE_FILES_MAP", "SkepConfig"],
+    "skep.modeling": [
+        "SkepModel",
+        "SkepPretrainedModel",
+        "SkepForSequenceClassification",
+        "SkepForTokenClassification",
+        "SkepCrfForTokenClassification",
+    ],
+    "skep.tokenizer": ["SkepTokenizer"],
+    "speecht5.configuration": ["SpeechT5Config", "SpeechT5HifiGanConfig"],
+    "speecht5.feature_extraction": ["SpeechT5FeatureExtractor"],
+    "speecht5.modeling": [
+        "SPEECHT5_PRETRAINED_MODEL_ARCHIVE_LIST",
+        "masked_fill",
+        "finfo",
+        "Parameter",
+        "shift_tokens_right",
+        "shift_spectrograms_right",
+        "SpeechT5NoLayerNormConvLayer",
+        "SpeechT5LayerNormConvLayer",
+        "SpeechT5GroupNormConvLayer",
+        "SpeechT5SinusoidalPositionalEmbedding",
+        "SpeechT5PositionalConvEmbedding",
+        "SpeechT5ScaledPositionalEncoding",
+        "SpeechT5RelativePositionalEncoding",
+        "SpeechT5SamePadLayer",
+        "SpeechT5FeatureEncoder",
+        "SpeechT5FeatureProjection",
+        "SpeechT5SpeechEncoderPrenet",
+        "SpeechT5SpeechDecoderPrenet",
+        "SpeechT5BatchNormConvLayer",
+        "SpeechT5SpeechDecoderPostnet",
+        "SpeechT5TextEncoderPrenet",
+        "SpeechT5TextDecoderPrenet",
+        "SpeechT5TextDecoderPostnet",
+        "SpeechT5Attention",
+        "SpeechT5FeedForward",
+        "SpeechT5EncoderLayer",
+        "SpeechT5DecoderLayer",
+        "SpeechT5PretrainedModel",
+        "SpeechT5Encoder",
+        "SpeechT5EncoderWithSpeechPrenet",
+        "SpeechT5EncoderWithTextPrenet",
+        "SpeechT5EncoderWithoutPrenet",
+        "SpeechT5Decoder",
+        "SpeechT5DecoderWithSpeechPrenet",
+        "SpeechT5DecoderWithTextPrenet",
+        "SpeechT5DecoderWithoutPrenet",
+        "SpeechT5GuidedMultiheadAttentionLoss",
+        "SpeechT5SpectrogramLoss",
+        "SpeechT5Model",
+        "SpeechT5ForSpeechToText",
+        "SpeechT5ForTextToSpeech",
+        "SpeechT5ForSpeechToSpeech",
+        "HifiGanResidualBlock",
+        "SpeechT5HifiGan",
+    ],
+    "speecht5.processing": ["SpeechT5Processor"],
+    "speecht5.tokenizer": ["SpeechT5Tokenizer"],
+    "squeezebert.configuration": [
+        "SQUEEZEBERT_PRETRAINED_INIT_CONFIGURATION",
+        "SqueezeBertConfig",
+        "SQUEEZEBERT_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "squeezebert.modeling": [
+        "SqueezeBertModel",
+        "SqueezeBertPreTrainedModel",
+        "SqueezeBertForSequenceClassification",
+        "SqueezeBertForTokenClassification",
+        "SqueezeBertForQuestionAnswering",
+    ],
+    "squeezebert.tokenizer": ["SqueezeBertTokenizer"],
+    "t5.configuration": ["T5_PRETRAINED_INIT_CONFIGURATION", "T5Config", "T5_PRETRAINED_RESOURCE_FILES_MAP"],
+    "t5.modeling": ["T5Model", "T5PretrainedModel", "T5ForConditionalGeneration", "T5EncoderModel"],
+    "t5.tokenizer": ["T5Tokenizer"],
+    "tinybert.configuration": [
+        "TINYBERT_PRETRAINED_INIT_CONFIGURATION",
+        "TinyBertConfig",
+        "TINYBERT_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "tinybert.modeling": [
+        "TinyBertModel",
+        "TinyBertPretrainedModel",
+        "TinyBertForPretraining",
+        "TinyBertForSequenceClassification",
+        "TinyBertForQuestionAnswering",
+        "TinyBertForMultipleChoice",
+    ],
+    "tinybert.tokenizer": ["TinyBertTokenizer"],
+    "transformer.modeling": [
+        "position_encoding_init",
+        "WordEmbedding",
+        "PositionalEmbedding",
+        "CrossEntropyCriterion",
+        "TransformerDecodeCell",
+        "TransformerBeamSearchDecoder",
+        "TransformerModel",
+        "InferTransformerModel",
+        "LabelSmoothedCrossEntropyCriterion",
+    ],
+    "unified_transformer.configuration": [
+        "UNIFIED_TRANSFORMER_PRETRAINED_INIT_CONFIGURATION",
+        "UnifiedTransformerConfig",
+        "UNIFIED_TRANSFORMER_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "unified_transformer.modeling": [
+        "UnifiedTransformerPretrainedModel",
+        "UnifiedTransformerModel",
+        "UnifiedTransformerLMHeadModel",
+        "UnifiedTransformerForMaskedLM",
+    ],
+    "unified_transformer.tokenizer": ["UnifiedTransformerTokenizer"],
+    "unimo.configuration": [
+        "UNIMO_PRETRAINED_INIT_CONFIGURATION",
+        "UNIMOConfig",
+        "UNIMO_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "unimo.modeling": [
+        "UNIMOPretrainedModel",
+        "UNIMOModel",
+        "UNIMOLMHeadModel",
+        "UNIMOForMaskedLM",
+        "UNIMOForConditionalGeneration",
+    ],
+    "unimo.tokenizer": ["UNIMOTokenizer"],
+    "visualglm.configuration": ["VisualGLMVisionConfig", "VisualGLMQFormerConfig", "VisualGLMConfig"],
+    "visualglm.image_processing": ["VisualGLMImageProcessor"],
+    "visualglm.modeling": [
+        "VisualGLMModel",
+        "VisualGLMPretrainedModel",
+        "VisualGLMQFormerModel",
+        "VisualGLMVisionModel",
+        "VisualGLMForConditionalGeneration",
+    ],
+    "visualglm.processing": ["VisualGLMProcessor"],
+    "xlm.configuration": ["XLM_PRETRAINED_INIT_CONFIGURATION", "XLM_PRETRAINED_RESOURCE_FILES_MAP", "XLMConfig"],
+    "xlm.modeling": [
+        "XLMModel",
+        "XLMPretrainedModel",
+        "XLMWithLMHeadModel",
+        "XLMForSequenceClassification",
+        "XLMForTokenClassification",
+        "XLMForQuestionAnsweringSimple",
+        "XLMForMultipleChoice",
+    ],
+    "xlm.tokenizer": ["XLMTokenizer"],
+    "xlnet.configuration": [
+        "XLNET_PRETRAINED_INIT_CONFIGURATION",
+        "XLNetConfig",
+        "XLNET_PRETRAINED_RESOURCE_FILES_MAP",
+    ],
+    "xlnet.modeling": [
+        "XLNetPretrainedModel",
+        "XLNetModel",
+        "XLNetForSequenceClassification",
+        "XLNetForTokenClassification",
+        "XLNetLMHeadModel",
+        "XLNetForMultipleChoice",
+        "XLNetForQuestionAnswering",
+        "XLNetForCausalLM",
+    ],
+    "xlnet.tokenizer": ["XLNetTokenizer"],
+    "xlm_roberta.modeling": [
+        "XLMRobertaModel",
+        "XLMRobertaPretrainedModel",
+        "XLMRobertaForSequenceClassification",
+        "XLMRobertaForTokenClassification",
+        "XLMRobertaForQuestionAnswering",
+        "XLMRobertaForMaskedLM",
+        "XLMRobertaForMultipleChoice",
+        "XLMRobertaForCausalLM",
+    ],
+    "xlm_roberta.tokenizer": ["XLMRobertaTokenizer"],
+    "xlm_roberta.configuration": ["PRETRAINED_INIT_CONFIGURATION", "XLMRobertaConfig"],
+    "yuan": ["YuanConfig", "YuanModel", "YuanPretrainedModel", "YuanForCausalLM", "YuanTokenizer"],
+}
+
+__getattr__, __dir__, __all__ = lazy_module(__name__, import_structure)
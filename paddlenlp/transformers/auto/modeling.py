@@ -20,7 +20,6 @@ from collections import OrderedDict
 
 from ...utils.download import resolve_file_path
 from ...utils.log import logger
-from .. import *  # noqa
 from ..configuration_utils import is_standard_config
 
 __all__ = [
@@ -64,6 +64,7 @@ try:
 except:
     pass
 
+from paddlenlp.generation import StaticCache, StaticLayerCache
 from paddlenlp.transformers.conversion_utils import (
     StateDictNameMapping,
     init_name_mappings,
@@ -1045,7 +1046,9 @@ class LlamaAttention(nn.Layer):
 
         kv_seq_len = key_states.shape[-3]
 
-        if past_key_value is not None:
+        if isinstance(past_key_value, StaticLayerCache):
+            kv_seq_len += past_key_value.seq_length
+        elif past_key_value is not None:
             kv_seq_len += past_key_value[0].shape[-3]
 
         if self.config.rope:
@@ -1092,7 +1095,10 @@ class LlamaAttention(nn.Layer):
                 query_states, key_states = apply_rotary_pos_emb(query_states, key_states, cos, sin, position_ids)
 
         # [bs, seq_len, num_head, head_dim]
-        if past_key_value is not None:
+        if isinstance(past_key_value, StaticLayerCache):
+            # write k, v in place, attention runs over the whole preallocated cache
+            key_states, value_states = past_key_value.update(key_states, value_states)
+        elif past_key_value is not None:
             # reuse k, v, self_attention
             key_states = paddle.concat([past_key_value[0], key_states], axis=1)
             value_states = paddle.concat([past_key_value[1], value_states], axis=1)
@@ -1690,6 +1696,7 @@ class LlamaModel(LlamaPretrainedModel):
         else:
             raise ValueError("You have to specify either decoder_input_ids or decoder_inputs_embeds")
 
+        static_cache = past_key_values if isinstance(past_key_values, StaticCache) else None
         if past_key_values is None:
             past_key_values = tuple([None] * len(self.layers))
         # NOTE: to make cache can be clear in-time
@@ -1697,7 +1704,10 @@ class LlamaModel(LlamaPretrainedModel):
 
         seq_length_with_past = seq_length
         cache_length = 0
-        if past_key_values[0] is not None:
+        if static_cache is not None:
+            cache_length = static_cache.seq_length
+            seq_length_with_past = static_cache.max_length
+        elif past_key_values[0] is not None:
             cache_length = past_key_values[0][0].shape[1]
             seq_length_with_past += cache_length
         if inputs_embeds is None:
@@ -1748,7 +1758,15 @@ class LlamaModel(LlamaPretrainedModel):
 
         use_casual_mask = get_use_casual_mask() and not self.config.alibi
 
-        if self.config.use_flash_attention_for_generation or use_casual_mask:
+        if static_cache is not None:
+            # the positions of the static cache that have not been written yet must always be masked
+            attention_mask = self._prepare_decoder_attention_mask(
+                static_cache.make_attention_mask(attention_mask, seq_length),
+                (batch_size, seq_length),
+                cache_length,
+                inputs_embeds.dtype,
+            )  # [bs, 1, seq_len, max_len]
+        elif self.config.use_flash_attention_for_generation or use_casual_mask:
             attention_mask = None
         elif attn_mask_startend_row_indices is None:
             attention_mask = self._prepare_decoder_attention_mask(
@@ -1762,7 +1780,9 @@ class LlamaModel(LlamaPretrainedModel):
             and self.config.use_flash_attention
             and get_env_device() not in ["gcu", "intel_hpu"]
         ):
-            if self.config.use_flash_attention_for_generation or use_casual_mask:
+            if static_cache is not None:
+                is_casual = False
+            elif self.config.use_flash_attention_for_generation or use_casual_mask:
                 is_casual = True
             else:
                 is_casual = is_casual_mask(attention_mask)
@@ -1835,6 +1855,9 @@ class LlamaModel(LlamaPretrainedModel):
         if output_hidden_states:
             all_hidden_states += (hidden_states,)
 
+        if static_cache is not None:
+            static_cache.advance(seq_length)
+            next_decoder_cache = static_cache
         next_cache = next_decoder_cache if use_cache else None
 
         if not return_dict:
@@ -2040,7 +2063,7 @@ class LlamaForCausalLM(LlamaPretrainedModel):
             position_ids = position_ids[:, -1].unsqueeze(-1)
 
         # if `inputs_embeds` are passed, we only want to use them in the 1st generation step
-        if inputs_embeds is not None and past_key_values is None:
+        if inputs_embeds is not None and not past_key_values:
             model_inputs = {"inputs_embeds": inputs_embeds}
         else:
             model_inputs = {"input_ids": input_ids}
@@ -2062,6 +2085,17 @@ class LlamaForCausalLM(LlamaPretrainedModel):
             "position_ids": paddle.static.InputSpec(shape=[None, None], dtype="int64"),
         }
 
+    def init_static_cache(self, batch_size, max_length):
+        self_attn = self.llama.layers[0].self_attn
+        return StaticCache(
+            num_layers=len(self.llama.layers),
+            batch_size=batch_size,
+            max_length=max_length,
+            num_key_value_heads=self_attn.num_key_value_heads,
+            head_dim=self_attn.head_dim,
+            dtype=self.llama.embed_tokens.weight.dtype,
+        )
+
     @staticmethod
     def update_model_kwargs_for_generation(outputs, model_kwargs, is_encoder_decoder=False):
         # update cache
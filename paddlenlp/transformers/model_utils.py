@@ -13,6 +13,7 @@
 # limitations under the License.
 from __future__ import annotations
 
+import collections
 import concurrent.futures
 import contextlib
 import copy
@@ -23,6 +24,7 @@ import os
 import re
 import sys
 import tempfile
+import time
 import warnings
 from contextlib import contextmanager
 from functools import partial
@@ -351,7 +353,12 @@ def _split_keys_evenly(keys: list, n: int) -> list:
 
 
 def _load_part_state_dict(
-    keys, checkpoint_file: Union[str, os.PathLike], tensor_parallel_split_mapping, fliter_dict_keys, device
+    keys,
+    checkpoint_file: Union[str, os.PathLike],
+    tensor_parallel_split_mapping,
+    fliter_dict_keys,
+    device,
+    mmap_mode=None,
 ):
     """load part state dict from checkpoint file.
 
@@ -360,6 +367,7 @@ def _load_part_state_dict(
         checkpoint_file (str): the path of checkpoint file
         tensor_parallel_split_mapping (dict): mapping from key to function
         fliter_dict_keys (list): filter keys in state dict
+        mmap_mode (str, optional): the mmap mode of `fast_safe_open`
 
     Returns:
         part_state_dict (dict): the part state dict
@@ -367,7 +375,8 @@ def _load_part_state_dict(
     """
     part_state_dict = {}
     scale_dict = {}
-    with safe_open(checkpoint_file, framework="np") as f:
+    open_kwargs = {"mmap_mode": mmap_mode} if mmap_mode is not None else {}
+    with safe_open(checkpoint_file, framework="np", **open_kwargs) as f:
         for key in keys:
             # 1. non-merge ckpt loading dont have filter key.
             # 2. merge ckpt will skip quant scale by `fliter_dict_keys`
@@ -411,13 +420,20 @@ def load_state_dict(
     fliter_dict_keys=None,
     device="cpu",
     ckpt_quant_stage="O0",
+    mmap_mode=None,
 ):
     """
     Reads a PaddlePaddle checkpoint file, returning properly formatted errors if they arise.
+
+    If `mmap_mode` ("r" or "c", see `fast_safe_open`) is set, the weights of a safetensors file which are
+    not split are backed by the memory-mapped file instead of being copied into new buffers.
     """
 
     if tensor_parallel_split_mapping is None:
         tensor_parallel_split_mapping = {}
+    if mmap_mode is not None and sys.platform.startswith("win"):
+        logger.warning("`mmap_mode` is not supported on Windows, the weights will be copied.")
+        mmap_mode = None
 
     if checkpoint_file.endswith(".safetensors") and is_safetensors_available():
         # Check format of the archive
@@ -446,6 +462,7 @@ def load_state_dict(
                         tensor_parallel_split_mapping,
                         fliter_dict_keys,
                         device,
+                        mmap_mode,
                     )
             else:
                 # Load state dict in multi-thread to speed up loading
@@ -460,6 +477,7 @@ def load_state_dict(
                             tensor_parallel_split_mapping,
                             fliter_dict_keys,
                             device,
+                            mmap_mode,
                         ): keys
                         for keys in keys_groups
                     }
@@ -484,6 +502,100 @@ def load_state_dict(
     return state_dict
 
 
+class ShardLoader:
+    """
+    Loads the shards of a checkpoint in background threads and yields them in order.
+
+    `load_fn(shard_file)` of the next shards runs in `num_workers` threads while the caller consumes
+    the current one, e.g. disk reads and tensor parallel splitting overlap with setting the weights
+    of the model. A shard is only scheduled if the total size of the shards that are loading or held
+    by the caller stays within `max_inflight_bytes`, but at least one shard is always scheduled.
+    The read time and throughput of every shard are recorded in `stats`.
+
+    Args:
+        shard_files (list): The paths of the shard files.
+        load_fn (callable): Function to load a shard file.
+        num_workers (int, optional): The number of background threads, 0 means loading every shard
+            in the caller when it is consumed. Defaults to 0.
+        max_inflight_bytes (int, optional): The max total size of the in-flight shards. Defaults to None,
+            which means only the number of workers limits the shards loaded ahead.
+    """
+
+    def __init__(self, shard_files, load_fn, num_workers=0, max_inflight_bytes=None):
+        self.shard_files = list(shard_files)
+        self.load_fn = load_fn
+        self.num_workers = num_workers
+        self.max_inflight_bytes = max_inflight_bytes
+        self.stats = []
+
+    def __len__(self):
+        return len(self.shard_files)
+
+    def _timed_load(self, shard_file):
+        start_time = time.time()
+        result = self.load_fn(shard_file)
+        return result, time.time() - start_time
+
+    def _record(self, shard_file, size, load_time, wait_time):
+        stats = {
+            "shard_file": shard_file,
+            "bytes": size,
+            "load_time": load_time,
+            "wait_time": wait_time,
+            "throughput": size / load_time if load_time > 0 else 0.0,
+        }
+        self.stats.append(stats)
+        logger.debug(
+            f"Loaded {os.path.basename(shard_file)}: {size / 2**20:.1f} MiB in {load_time:.2f}s "
+            f"({stats['throughput'] / 2**20:.1f} MiB/s), waited {wait_time:.2f}s"
+        )
+
+    def __iter__(self):
+        sizes = [os.path.getsize(f) if os.path.isfile(f) else 0 for f in self.shard_files]
+        if self.num_workers <= 0:
+            for shard_file, size in zip(self.shard_files, sizes):
+                result, load_time = self._timed_load(shard_file)
+                self._record(shard_file, size, load_time, load_time)
+                yield shard_file, result
+            return
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.num_workers)
+        futures = collections.deque()
+        next_idx = 0
+        inflight_bytes = 0
+
+        def _schedule():
+            nonlocal next_idx, inflight_bytes
+            futures.append(executor.submit(self._timed_load, self.shard_files[next_idx]))
+            inflight_bytes += sizes[next_idx]
+            next_idx += 1
+
+        try:
+            for idx, shard_file in enumerate(self.shard_files):
+                if not futures:
+                    _schedule()
+                wait_start = time.time()
+                result, load_time = futures.popleft().result()
+                wait_time = time.time() - wait_start
+                # load the next shards while the current one is consumed
+                while (
+                    next_idx < len(self.shard_files)
+                    and len(futures) < self.num_workers
+                    and (
+                        self.max_inflight_bytes is None or inflight_bytes + sizes[next_idx] <= self.max_inflight_bytes
+                    )
+                ):
+                    _schedule()
+                self._record(shard_file, sizes[idx], load_time, wait_time)
+                yield shard_file, result
+                del result
+                inflight_bytes -= sizes[idx]
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+
 def resolve_weight_file_from_hf_hub(
     repo_id: str, cache_dir: str, convert_from_torch: bool, subfolder=None, use_safetensors=False
 ):
@@ -848,7 +960,7 @@ def faster_set_state_dict(model, state_dict, strict_dtype=True):
     return error_msgs
 
 
-def _load_state_dict_into_model(model_to_load, state_dict, start_prefix):
+def _load_state_dict_into_model(model_to_load, state_dict, start_prefix, share_data=False):
     # torch will cast dtype in load_state_dict, but paddle strictly check dtype
     _convert_state_dict_dtype_and_shape(state_dict, model_to_load)
 
@@ -859,6 +971,22 @@ def _load_state_dict_into_model(model_to_load, state_dict, start_prefix):
             if key.startswith(start_prefix):
                 state_dict[key.replace(start_prefix, "")] = state_dict.pop(key)
 
+    if share_data:
+        # The CPU parameters share the buffers of the matched weights, e.g. the memory-mapped
+        # checkpoint files, instead of copying them. The others are still set by `set_state_dict`.
+        shared_state_dict = {}
+        for key, param in model_to_load.state_dict().items():
+            value = state_dict.get(key, None)
+            if (
+                isinstance(value, paddle.Tensor)
+                and param.place.is_cpu_place()
+                and value.place.is_cpu_place()
+                and param.dtype == value.dtype
+                and list(param.shape) == list(value.shape)
+            ):
+                shared_state_dict[key] = state_dict.pop(key)
+        error_msgs.extend(faster_set_state_dict(model_to_load, shared_state_dict))
+
     # TODO: add return status to state_dict
     with warnings.catch_warnings(record=True) as w:
         warnings.resetwarnings()
@@ -1901,6 +2029,7 @@ class PretrainedModel(Layer, GenerationMixin, ConversionMixin):
         dtype=None,
         keep_in_fp32_modules=None,
         quantization_linear_list=None,
+        mmap_mode=None,
     ) -> Tuple[List[str]]:
         """load the state_dict into model, and do the following things:
 
@@ -1912,6 +2041,7 @@ class PretrainedModel(Layer, GenerationMixin, ConversionMixin):
             loaded_keys (List[str]):
             ignore_mismatched_sizes (bool, optional): whether ignore error when tensor size mismatched. Defaults to False.
             dtype (_type_, optional): the dtype of model state dict. Defaults to None.
+            mmap_mode (str, optional): if set, the CPU parameters share the memory-mapped safetensors weights. Defaults to None.
 
         Returns:
             Tuple[List[str]]: _description_
@@ -2100,7 +2230,9 @@ class PretrainedModel(Layer, GenerationMixin, ConversionMixin):
                     keep_in_fp32_modules=keep_in_fp32_modules,
                 )
             else:
-                error_msgs = _load_state_dict_into_model(model_to_load, state_dict, start_prefix)
+                error_msgs = _load_state_dict_into_model(
+                    model_to_load, state_dict, start_prefix, share_data=mmap_mode is not None
+                )
         else:
             # Sharded checkpoint or whole but low_cpu_mem_usage==True
 
@@ -2111,10 +2243,15 @@ class PretrainedModel(Layer, GenerationMixin, ConversionMixin):
             error_msgs = []
             mismatched_keys = []
             resume_state_dict = {}
-            if len(resolved_archive_file) > 1:
-                resolved_archive_file = tqdm(resolved_archive_file, desc="Loading checkpoint shards")
-
-            for shard_file in resolved_archive_file:
+            # The safetensors shards can be read and split for tensor parallel as numpy arrays in background
+            # threads, while the loaded shards are converted and set to the model in the current thread.
+            # Every thread holds one more shard in the host memory, so it is disabled by default.
+            load_in_threads = all(f.endswith(".safetensors") for f in resolved_archive_file)
+            num_workers = int(os.environ.get("LOAD_SHARDS_THREAD_NUM", "0")) if load_in_threads else 0
+            max_inflight_gb = os.environ.get("LOAD_SHARDS_MAX_INFLIGHT_GB", None)
+            device = "np" if num_workers > 0 else "cpu"
+
+            def _load_shard(shard_file):
                 pre_tensor_parallel_split = False
                 if (
                     shard_file.endswith(".safetensors")
@@ -2157,7 +2294,27 @@ class PretrainedModel(Layer, GenerationMixin, ConversionMixin):
                     shard_file,
                     tp_actions if pre_tensor_parallel_split else None,
                     filter_dict_keys,
+                    device=device,
+                    mmap_mode=mmap_mode,
                 )
+                return state_dict, pre_tensor_parallel_split
+
+            shard_loader = ShardLoader(
+                resolved_archive_file,
+                _load_shard,
+                num_workers=num_workers,
+                max_inflight_bytes=int(float(max_inflight_gb) * 2**30) if max_inflight_gb else None,
+            )
+            shard_iter = iter(shard_loader)
+            if len(resolved_archive_file) > 1:
+                shard_iter = tqdm(shard_iter, total=len(shard_loader), desc="Loading checkpoint shards")
+
+            start_time = time.time()
+            for shard_file, (state_dict, pre_tensor_parallel_split) in shard_iter:
+                if device == "np":
+                    for k in list(state_dict.keys()):
+                        with device_guard():
+                            state_dict[k] = paddle.Tensor(state_dict.pop(k), zero_copy=True)
 
                 # convert for fusing or splitting weights
                 state_dict, resume_state_dict, fused_keys, new_keys = _fuse_or_split_keys(
@@ -2210,12 +2367,23 @@ class PretrainedModel(Layer, GenerationMixin, ConversionMixin):
                     )
                     error_msgs += new_error_msgs
                 else:
-                    error_msgs += _load_state_dict_into_model(model_to_load, state_dict, start_prefix)
+                    error_msgs += _load_state_dict_into_model(
+                        model_to_load, state_dict, start_prefix, share_data=mmap_mode is not None
+                    )
 
                 # force memory release
                 del state_dict
                 gc.collect()
 
+            if len(shard_loader.stats) > 1:
+                total_gb = sum(stats["bytes"] for stats in shard_loader.stats) / 2**30
+                elapsed = time.time() - start_time
+                wait_time = sum(stats["wait_time"] for stats in shard_loader.stats)
+                logger.info(
+                    f"Loaded {len(shard_loader.stats)} checkpoint shards ({total_gb:.2f} GiB) in {elapsed:.2f}s "
+                    f"({total_gb / max(elapsed, 1e-6):.2f} GiB/s), waited {wait_time:.2f}s for reading the shards."
+                )
+
         if len(error_msgs) > 0:
             error_msg = "\n\t".join(error_msgs)
             if " but the expected shape is" in error_msg:
@@ -2308,6 +2476,19 @@ class PretrainedModel(Layer, GenerationMixin, ConversionMixin):
                 temporary tensors in addition to the model weights, which
                 doubles the memory usage . Thus it is suggested to use `True`
                 for big models on GPU. Default to `False`.
+            mmap_mode (str, optional): If set, the safetensors weights are memory-mapped and the parameters
+                on CPU share the mapped pages instead of copying them, so the processes loading the same model
+                on one host keep one copy of the weights in the page cache. `"r"` maps the files read-only,
+                writing to the parameters is not allowed, and `"c"` maps them copy-on-write. The files should
+                not be modified while the model is in use. Defaults to the environment variable
+                `LOAD_STATE_DICT_MMAP_MODE` or None.
+
+        The shards of a sharded safetensors checkpoint can be read ahead in background threads while the
+        previous shard is set to the model, see `ShardLoader`. It is configured by the environment variables
+        `LOAD_SHARDS_THREAD_NUM`, the number of threads, which defaults to 0, i.e. every shard is read when it
+        is set to the model, and `LOAD_SHARDS_MAX_INFLIGHT_GB`, the max total size of the shards read ahead
+        or being set, which defaults to no limit. Reading ahead holds up to `LOAD_SHARDS_THREAD_NUM` more
+        shards in the host memory unless `LOAD_SHARDS_MAX_INFLIGHT_GB` is set.
 
         Returns:
             PretrainedModel: An instance of `PretrainedModel`.
@@ -2346,6 +2527,7 @@ class PretrainedModel(Layer, GenerationMixin, ConversionMixin):
         low_cpu_mem_usage = kwargs.pop("low_cpu_mem_usage", False)
         convert_from_torch = kwargs.pop("convert_from_torch", None)
         load_state_as_np = kwargs.pop("load_state_as_np", None)
+        mmap_mode = kwargs.pop("mmap_mode", os.environ.get("LOAD_STATE_DICT_MMAP_MODE", None) or None)
         if load_state_as_np is not None:
             logger.warning("`load_state_as_np` is deprecated,  please delete it!")
 
@@ -2478,9 +2660,9 @@ class PretrainedModel(Layer, GenerationMixin, ConversionMixin):
                 with safe_open(resolved_archive_file, framework="np", device="cpu") as f:
                     loaded_keys = f.keys()
                 tp_actions = cls.get_tensor_parallel_convert_actions(config, loaded_keys)
-                state_dict = load_state_dict(resolved_archive_file, tp_actions)
+                state_dict = load_state_dict(resolved_archive_file, tp_actions, mmap_mode=mmap_mode)
             else:
-                state_dict = load_state_dict(resolved_archive_file)
+                state_dict = load_state_dict(resolved_archive_file, mmap_mode=mmap_mode)
 
             logger.info("Loaded weights file from disk, setting weights to model.")
 
@@ -2547,6 +2729,7 @@ class PretrainedModel(Layer, GenerationMixin, ConversionMixin):
             dtype=dtype,
             keep_in_fp32_modules=keep_in_fp32_modules,
             quantization_linear_list=quantization_linear_list,
+            mmap_mode=mmap_mode,
         )
 
         # load generation_config.json
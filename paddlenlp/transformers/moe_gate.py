@@ -22,6 +22,8 @@ import paddle.nn.functional as F
 
 from ..utils.log import logger
 
+__all__ = ["MoEGateMixin", "PretrainedMoEGate"]
+
 
 class MoEGateMixin:
     def gate_score_func(self, logits: paddle.Tensor) -> paddle.Tensor:
@@ -25,6 +25,8 @@ from paddle.distributed.communication.group import Group
 
 from .moe_gate import PretrainedMoEGate
 
+__all__ = ["dispatching", "combining", "MoELayer"]
+
 
 def dispatching(x, dispatch_mask, scatter_index, num_experts, capacity):
     """
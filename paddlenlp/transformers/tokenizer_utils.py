@@ -17,13 +17,18 @@
 from __future__ import annotations
 
 import bisect
+import heapq
 import io
 import itertools
 import json
+import math
 import os
+import pickle
 import re
 import unicodedata
+import weakref
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import asdict, dataclass
 from typing import Any, Dict, List, Literal, Optional, Tuple, Union
 
@@ -77,6 +82,49 @@ __all__ = [
 ]
 
 
+# Starting the processes and sending the tokenizer to them only pays off for large batches, the smaller
+# batches are encoded in the current process even if `num_workers` is given.
+MIN_PARALLEL_ENCODE_BATCH_SIZE = 512
+
+_encode_worker_tokenizer = None
+
+# The process pool of each tokenizer: (state, executor, finalizer). A pool is created on first use and reused
+# by the following calls, its workers receive the tokenizer once when they start. It is shut down when the
+# tokenizer is garbage collected or at exit, and replaced if the vocabulary of the tokenizer has changed.
+_encode_pools = weakref.WeakKeyDictionary()
+
+
+def _init_encode_worker(tokenizer_bytes):
+    global _encode_worker_tokenizer
+    _encode_worker_tokenizer = pickle.loads(tokenizer_bytes)
+
+
+def _get_encode_pool(tokenizer, num_workers):
+    state = (
+        num_workers,
+        len(tokenizer),
+        tuple(sorted(tokenizer.get_added_vocab().items())),
+        tuple(sorted(tokenizer.special_tokens_map_extended.items(), key=lambda item: item[0])),
+    )
+    if tokenizer in _encode_pools:
+        pool_state, executor, finalizer = _encode_pools[tokenizer]
+        if pool_state == state:
+            return executor
+        finalizer()
+    # the tokenizer is sent pickled, so that the pool does not keep it alive
+    executor = ProcessPoolExecutor(
+        max_workers=num_workers, initializer=_init_encode_worker, initargs=(pickle.dumps(tokenizer),)
+    )
+    finalizer = weakref.finalize(tokenizer, executor.shutdown)
+    _encode_pools[tokenizer] = (state, executor, finalizer)
+    return executor
+
+
+def _encode_worker(args):
+    batch_text_or_text_pairs, kwargs = args
+    return dict(_encode_worker_tokenizer._batch_encode_plus(batch_text_or_text_pairs, **kwargs))
+
+
 def convert_to_unicode(text):
     """
     Converts `text` to Unicode (if it's not already), assuming utf-8 input.
@@ -1434,8 +1482,38 @@ class PretrainedTokenizer(ChatTemplateMixin, PretrainedTokenizerBase):
         return_offsets_mapping: bool = False,
         return_length: bool = False,
         verbose: bool = True,
+        num_workers: Optional[int] = None,
         **kwargs
     ) -> BatchEncoding:
+        if (
+            num_workers is not None
+            and num_workers > 1
+            and len(batch_text_or_text_pairs) >= max(MIN_PARALLEL_ENCODE_BATCH_SIZE, 2)
+        ):
+            return self._parallel_batch_encode_plus(
+                batch_text_or_text_pairs,
+                num_workers=num_workers,
+                add_special_tokens=add_special_tokens,
+                padding_strategy=padding_strategy,
+                truncation_strategy=truncation_strategy,
+                max_length=max_length,
+                stride=stride,
+                is_split_into_words=is_split_into_words,
+                pad_to_multiple_of=pad_to_multiple_of,
+                padding_side=padding_side,
+                return_position_ids=return_position_ids,
+                return_tensors=return_tensors,
+                return_token_type_ids=return_token_type_ids,
+                return_attention_mask=return_attention_mask,
+                return_overflowing_tokens=return_overflowing_tokens,
+                return_special_tokens_mask=return_special_tokens_mask,
+                return_dict=return_dict,
+                return_offsets_mapping=return_offsets_mapping,
+                return_length=return_length,
+                verbose=verbose,
+                **kwargs,
+            )
+
         def get_input_ids(text):
             if isinstance(text, str):
                 tokens = self.tokenize(text, **kwargs)
@@ -1508,6 +1586,64 @@ class PretrainedTokenizer(ChatTemplateMixin, PretrainedTokenizerBase):
 
         return batch_outputs
 
+    def _parallel_batch_encode_plus(
+        self,
+        batch_text_or_text_pairs,
+        num_workers: int,
+        padding_strategy: PaddingStrategy = PaddingStrategy.DO_NOT_PAD,
+        max_length: Optional[int] = None,
+        pad_to_multiple_of: Optional[int] = None,
+        padding_side: Optional[Literal["right", "left"]] = None,
+        return_tensors: Optional[Union[str, TensorType]] = None,
+        return_attention_mask: Optional[bool] = None,
+        return_dict: bool = True,
+        **kwargs
+    ) -> BatchEncoding:
+        """
+        Encodes chunks of the batch by `_batch_encode_plus` in the `num_workers` processes of the pool of the
+        tokenizer, then pads the whole batch in order as `_batch_prepare_for_model` does.
+        """
+        chunk_size = math.ceil(len(batch_text_or_text_pairs) / (num_workers * 4))
+        chunk_starts = range(0, len(batch_text_or_text_pairs), chunk_size)
+        chunk_kwargs = dict(
+            kwargs,
+            padding_strategy=PaddingStrategy.DO_NOT_PAD,  # we pad in batch afterward
+            max_length=max_length,
+            return_attention_mask=False,  # we pad in batch afterward
+            return_tensors=None,
+            return_dict=True,
+        )
+        chunk_outputs = _get_encode_pool(self, num_workers).map(
+            _encode_worker,
+            [(batch_text_or_text_pairs[start : start + chunk_size], chunk_kwargs) for start in chunk_starts],
+        )
+
+        batch_outputs = {}
+        for start, outputs in zip(chunk_starts, chunk_outputs):
+            for key, value in outputs.items():
+                if key == "overflow_to_sample":
+                    value = [start + example_id for example_id in value]
+                batch_outputs.setdefault(key, []).extend(value)
+
+        batch_outputs = self.pad(
+            batch_outputs,
+            padding=padding_strategy.value,
+            max_length=max_length,
+            pad_to_multiple_of=pad_to_multiple_of,
+            padding_side=padding_side,
+            return_attention_mask=return_attention_mask,
+        )
+        if return_dict:
+            return BatchEncoding(batch_outputs, tensor_type=return_tensors)
+        batch_outputs_list = []
+        for k, v in batch_outputs.items():
+            for i in range(len(v)):
+                if i >= len(batch_outputs_list):
+                    batch_outputs_list.append({k: v[i]})
+                else:
+                    batch_outputs_list[i][k] = v[i]
+        return batch_outputs_list
+
     def _batch_prepare_for_model(
         self,
         batch_ids_pairs: List[Union[PreTokenizedInputPair, Tuple[List[int], None]]],
@@ -1882,6 +2018,107 @@ class PretrainedTokenizer(ChatTemplateMixin, PretrainedTokenizerBase):
             return text
 
 
+class BPECache:
+    """
+    Size-bounded LRU cache of the BPE results of words, which also counts hits and misses.
+
+    Args:
+        maxsize (int, optional):
+            The max number of cached words, the least recently used ones are evicted.
+            If None, the cache is unbounded. Defaults to 100000.
+    """
+
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+
+    def get(self, key, default=None):
+        if key in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        self.misses += 1
+        return default
+
+    def __contains__(self, key):
+        return key in self._cache
+
+    def __getitem__(self, key):
+        if key not in self._cache:
+            self.misses += 1
+            raise KeyError(key)
+        return self.get(key)
+
+    def __setitem__(self, key, value):
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        if self.maxsize is not None and len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def __len__(self):
+        return len(self._cache)
+
+    def clear(self):
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def cache_info(self):
+        return {"hits": self.hits, "misses": self.misses, "maxsize": self.maxsize, "currsize": len(self._cache)}
+
+
+def bpe_merge(word, bpe_ranks):
+    """
+    Merges the symbols of `word` by `bpe_ranks`, i.e. repeatedly merges all the occurrences of the
+    lowest ranked pair from left to right. The candidate pairs are kept in a heap and the symbols in
+    a linked list, so only the neighbours of a merge are updated instead of rescanning all pairs.
+
+    Args:
+        word (tuple[str]): The symbols of the word.
+        bpe_ranks (dict): The ranks of the pairs to merge.
+
+    Returns:
+        tuple[str]: The merged symbols.
+    """
+    symbols = list(word)
+    if len(symbols) < 2:
+        return tuple(symbols)
+    next_idx = list(range(1, len(symbols))) + [-1]
+    prev_idx = list(range(-1, len(symbols) - 1))
+
+    heap = []
+    for i in range(len(symbols) - 1):
+        rank = bpe_ranks.get((symbols[i], symbols[i + 1]))
+        if rank is not None:
+            heap.append((rank, i))
+    heapq.heapify(heap)
+
+    while heap:
+        rank, i = heapq.heappop(heap)
+        positions = {i}
+        while heap and heap[0][0] == rank:
+            positions.add(heapq.heappop(heap)[1])
+        # merge all the occurrences of the pair from left to right, skip the outdated ones
+        for i in sorted(positions):
+            j = next_idx[i]
+            if symbols[i] is None or j == -1 or bpe_ranks.get((symbols[i], symbols[j])) != rank:
+                continue
+            symbols[i] += symbols[j]
+            symbols[j] = None
+            next_idx[i] = next_idx[j]
+            if next_idx[i] != -1:
+                prev_idx[next_idx[i]] = i
+            for left in (prev_idx[i], i):
+                right = next_idx[left] if left != -1 else -1
+                if right != -1:
+                    new_rank = bpe_ranks.get((symbols[left], symbols[right]))
+                    if new_rank is not None:
+                        heapq.heappush(heap, (new_rank, left))
+    return tuple(symbol for symbol in symbols if symbol is not None)
+
+
 class BPETokenizer(PretrainedTokenizer):
     """
     The base class for all bpe tokenizers. It mainly provides common tokenize
@@ -1913,14 +2150,21 @@ class BPETokenizer(PretrainedTokenizer):
     """
 
     class Encoder(object):
-        def __init__(self, encoder, bpe_merges, errors="replace", special_tokens=["[SEP]", "[p]", "[q]", "[/q]"]):
+        def __init__(
+            self,
+            encoder,
+            bpe_merges,
+            errors="replace",
+            special_tokens=["[SEP]", "[p]", "[q]", "[/q]"],
+            cache_size=100000,
+        ):
             self.encoder = encoder
             self.decoder = {v: k for k, v in self.encoder.items()}
             self.errors = errors  # how to handle errors in decoding
             self.byte_encoder = self._bytes_to_unicode()
             self.byte_decoder = {v: k for k, v in self.byte_encoder.items()}
             self.bpe_ranks = dict(zip(bpe_merges, range(len(bpe_merges))))
-            self.cache = {}
+            self.cache = BPECache(maxsize=cache_size)
             self.re = try_import("regex")
             self.special_tokens = special_tokens
 
@@ -1971,47 +2215,17 @@ class BPETokenizer(PretrainedTokenizer):
             return pairs
 
         def bpe(self, token):
-            if token in self.cache:
-                return self.cache[token]
-            word = tuple(token)
-            pairs = self._get_pairs(word)
-
-            if not pairs:
-                return token
-
-            while True:
-                bigram = min(pairs, key=lambda pair: self.bpe_ranks.get(pair, float("inf")))
-                if bigram not in self.bpe_ranks:
-                    break
-                first, second = bigram
-                new_word = []
-                i = 0
-                while i < len(word):
-                    try:
-                        j = word.index(first, i)
-                        new_word.extend(word[i:j])
-                        i = j
-                    except:  # noqa: E722
-                        new_word.extend(word[i:])
-                        break
-
-                    if word[i] == first and i < len(word) - 1 and word[i + 1] == second:
-                        new_word.append(first + second)
-                        i += 2
-                    else:
-                        new_word.append(word[i])
-                        i += 1
-                new_word = tuple(new_word)
-                word = new_word
-                if len(word) == 1:
-                    break
-                else:
-                    pairs = self._get_pairs(word)
-            word = " ".join(word)
-            self.cache[token] = word
-
+            word = self.cache.get(token)
+            if word is None:
+                word = " ".join(bpe_merge(tuple(token), self.bpe_ranks))
+                self.cache[token] = word
             return word
 
+        def batch_bpe(self, tokens):
+            """Returns the bpe results of `tokens`, each distinct token is only merged once."""
+            words = {token: self.bpe(token) for token in dict.fromkeys(tokens)}
+            return [words[token] for token in tokens]
+
         def tokenize(self, text):
             tokens = text.split(" ")
             sub_tokens = []
@@ -2052,10 +2266,29 @@ class BPETokenizer(PretrainedTokenizer):
                 return [self.encoder[bpe_token] for bpe_token in self.bpe(token).split(" ")]
 
         def encode(self, text):
-            bpe_tokens = []
-            for token in self.tokenize(text):
-                bpe_tokens.extend(self.tokenize_bpe(token))
-            return bpe_tokens
+            return self.batch_encode([text])[0]
+
+        def batch_encode(self, texts):
+            """Encodes `texts` with the bpe of the words across all the texts deduplicated."""
+            all_tokens = [self.tokenize(text) for text in texts]
+            words = [
+                "".join(self.byte_encoder[b] for b in token.encode("utf-8"))
+                for tokens in all_tokens
+                for token in tokens
+                if not self.is_special_token(token)
+            ]
+            words = iter(self.batch_bpe(words))
+
+            batch_bpe_tokens = []
+            for tokens in all_tokens:
+                bpe_tokens = []
+                for token in tokens:
+                    if self.is_special_token(token):
+                        bpe_tokens.append(token.strip())  # remove space for convert_to_ids
+                    else:
+                        bpe_tokens.extend(self.encoder[bpe_token] for bpe_token in next(words).split(" "))
+                batch_bpe_tokens.append(bpe_tokens)
+            return batch_bpe_tokens
 
         def decode(self, tokens):
             pre_token_i = 0
@@ -2105,7 +2338,7 @@ class BPETokenizer(PretrainedTokenizer):
         text = " ".join(text.split())  # remove duplicate whitespace
         if is_sentencepiece:
             sents = self.nltk.tokenize.sent_tokenize(text)
-            bpe_ids = sum([self.encoder.encode(sent) for sent in sents], [])
+            bpe_ids = sum(self.encoder.batch_encode(sents), [])
         else:
             bpe_ids = self.encoder.encode(text)
         tokens = [str(bpe_id) for bpe_id in bpe_ids]
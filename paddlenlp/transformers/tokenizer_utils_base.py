@@ -2345,6 +2345,12 @@ class PretrainedTokenizerBase(SpecialTokensMixin):
                 Defaults to `None`.
             verbose (bool, optional):
                 Whether or not to print more information and warnings. Defaults to True.
+            num_workers (int, optional):
+                The number of processes used to encode batch inputs with slow (python) tokenizers.
+                The batch is split into chunks which are encoded by the worker processes and then
+                padded together, which pays off for large batches. The batches smaller than
+                `MIN_PARALLEL_ENCODE_BATCH_SIZE` (512) are still encoded in the current process.
+                Defaults to `None`, encoding in the current process.
 
         Returns:
             dict or list[dict] (for batch input):
@@ -23,6 +23,7 @@ import re
 import shutil
 import sys
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import ExitStack
 from io import StringIO
 from pathlib import Path
@@ -687,7 +688,6 @@ def get_checkpoint_shard_files(
         return shard_filenames, sharded_metadata
 
     # At this stage pretrained_model_name_or_path is a model identifier on the Hub
-    cached_filenames = []
     # Check if the model is already cached or not. We only try the last checkpoint, this should cover most cases of
     # downloaded (if interrupted).
     last_shard = try_to_load_from_cache(
@@ -697,7 +697,8 @@ def get_checkpoint_shard_files(
     )
 
     show_progress_bar = last_shard is None
-    for shard_filename in tqdm.tqdm(shard_filenames, desc="Downloading shards", disable=not show_progress_bar):
+
+    def _resolve_shard(shard_filename):
         try:
             cached_filename = resolve_file_path(
                 pretrained_model_name_or_path,
@@ -722,8 +723,19 @@ def get_checkpoint_shard_files(
                 f"We couldn't connect to '{HUGGINGFACE_CO_RESOLVE_ENDPOINT}' to load {shard_filename}. You should try"
                 " again after checking your internet connection."
             )
-
-        cached_filenames.append(cached_filename)
+        return cached_filename
+
+    # the shards are downloaded concurrently, each of them holds its own file lock
+    num_workers = min(int(os.getenv("DOWNLOAD_SHARDS_THREAD_NUM", "4")), len(shard_filenames))
+    with ThreadPoolExecutor(max_workers=max(num_workers, 1)) as executor:
+        cached_filenames = list(
+            tqdm.tqdm(
+                executor.map(_resolve_shard, shard_filenames),
+                total=len(shard_filenames),
+                desc="Downloading shards",
+                disable=not show_progress_bar,
+            )
+        )
 
     return cached_filenames, sharded_metadata
 
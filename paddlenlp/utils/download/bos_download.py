@@ -15,9 +15,6 @@
 import logging
 import os
 import re
-import tempfile
-from contextlib import contextmanager
-from functools import partial
 from pathlib import Path
 from typing import Dict, Literal, Optional, Union
 
@@ -29,9 +26,11 @@ from huggingface_hub.utils import (
     RepositoryNotFoundError,
     RevisionNotFoundError,
 )
+from requests import HTTPError
 
 logger = logging.getLogger(__name__)
 
+from paddlenlp.utils.downloader import DOWNLOAD_RETRY_LIMIT, download_file
 from paddlenlp.utils.env import MODEL_HOME
 
 from .common import (
@@ -39,10 +38,8 @@ from .common import (
     DEFAULT_REQUEST_TIMEOUT,
     AistudioBosFileMetadata,
     _as_int,
-    _chmod_and_replace,
     _normalize_etag,
     _request_wrapper,
-    http_get,
     raise_for_status,
 )
 
@@ -214,40 +211,21 @@ def bos_download(
             # Even if returning early like here, the lock will be released.
             return file_path
 
-        if resume_download:
-            incomplete_path = file_path + ".incomplete"
-
-            @contextmanager
-            def _resumable_file_manager():
-                with open(incomplete_path, "ab") as f:
-                    yield f
-
-            temp_file_manager = _resumable_file_manager
-            if os.path.exists(incomplete_path):
-                resume_size = os.stat(incomplete_path).st_size
-            else:
-                resume_size = 0
-        else:
-            temp_file_manager = partial(  # type: ignore
-                tempfile.NamedTemporaryFile, mode="wb", dir=cache_dir, delete=False
-            )
-            resume_size = 0
-
-        # Download to temporary file, then copy to cache dir once finished.
-        # Otherwise you get corrupt cache entries if the download gets interrupted.
-        with temp_file_manager() as temp_file:
-            logger.info("downloading %s to %s", url_to_download, temp_file.name)
-
-            http_get(
-                url_to_download,
-                temp_file,
-                proxies=proxies,
-                resume_size=resume_size,
-                headers=headers,
-            )
-
-        logger.info("storing %s in cache at %s", url_to_download, file_path)
-        _chmod_and_replace(temp_file.name, file_path)
+        # The file is downloaded to `<file_path>_tmp` with parallel range requests and moved to the cache once
+        # finished, so the cache entry is never corrupt. The finished parts of an interrupted download are always
+        # resumed if the remote file is unchanged, whatever `resume_download` is.
+        logger.info("downloading %s to %s", url_to_download, file_path)
+        for retry_cnt in range(DOWNLOAD_RETRY_LIMIT):
+            try:
+                download_file(url_to_download, file_path, headers=headers, proxies=proxies)
+                break
+            except HTTPError as e:
+                raise_for_status(e.response)
+            except IOError as e:
+                # connection errors, timeouts and incomplete responses
+                if retry_cnt == DOWNLOAD_RETRY_LIMIT - 1:
+                    raise
+                logger.warning("Error while downloading from %s: %s\nTrying to resume download...", url_to_download, e)
     try:
         os.remove(lock_path)
     except OSError:
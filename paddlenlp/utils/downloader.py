@@ -15,13 +15,13 @@ import hashlib
 import json
 import os
 import os.path as osp
-import shutil
 import tarfile
 import threading
 import time
 import uuid
 import zipfile
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Union
 
 import paddle.distributed as dist
@@ -49,6 +49,11 @@ COMMUNITY_MODEL_PREFIX = os.getenv("COMMUNITY_MODEL_PREFIX", "https://bj.bcebos.
 WEIGHTS_HOME = osp.expanduser("~/.cache/paddle/hapi/weights")
 DOWNLOAD_RETRY_LIMIT = 3
 DOWNLOAD_CHECK = False
+# the number of parallel range requests of one file
+DOWNLOAD_THREAD_NUM = int(os.getenv("DOWNLOAD_THREAD_NUM", "8"))
+DOWNLOAD_PART_SIZE = 32 * 1024 * 1024
+DOWNLOAD_BUFFER_SIZE = 1024 * 1024
+DOWNLOAD_TIMEOUT = 60
 
 nlp_models = OrderedDict(
     (
@@ -179,6 +184,206 @@ def get_path_from_url_with_filelock(
     return result
 
 
+def _probe_url(url, headers=None, proxies=None):
+    """Returns the size, the validator (ETag or Last-Modified) and whether the server of `url` supports range requests."""
+    try:
+        r = requests.head(url, headers=headers, proxies=proxies, allow_redirects=True, timeout=DOWNLOAD_TIMEOUT)
+    except requests.RequestException:
+        return None, None, False
+    if r.status_code != 200:
+        return None, None, False
+    size = r.headers.get("Content-Length")
+    size = int(size) if size is not None and r.headers.get("Content-Encoding", "identity") == "identity" else None
+    validator = r.headers.get("ETag") or r.headers.get("Last-Modified")
+    return size, validator, r.headers.get("Accept-Ranges", "").lower() == "bytes"
+
+
+def _load_download_state(state_path):
+    try:
+        with open(state_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_download_state(state_path, state):
+    tmp_state_path = state_path + ".tmp"
+    with open(tmp_state_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_state_path, state_path)
+
+
+def _update_md5(md5, f, start, end):
+    f.seek(start)
+    while start < end:
+        chunk = f.read(min(DOWNLOAD_BUFFER_SIZE, end - start))
+        if not chunk:
+            raise IOError("Unexpected end of file {} at {}.".format(f.name, start))
+        md5.update(chunk)
+        start += len(chunk)
+
+
+def _write_response(response, f, pbar, md5=None, max_size=None):
+    """Writes the body of `response` to `f` in large chunks and returns the number of written bytes."""
+    written = 0
+    for chunk in response.iter_content(chunk_size=DOWNLOAD_BUFFER_SIZE):
+        if max_size is not None and written + len(chunk) > max_size:
+            raise IOError("Received more than {} bytes from {}.".format(max_size, response.url))
+        f.write(chunk)
+        if md5 is not None:
+            md5.update(chunk)
+        written += len(chunk)
+        pbar.update(len(chunk))
+    return written
+
+
+def _download_parts(url, tmp_fullname, state, state_path, headers, proxies, num_threads, md5):
+    size, part_size = state["size"], state["part_size"]
+    parts = [(start, min(start + part_size, size)) for start in range(0, size, part_size)]
+    finished = set(state["parts"])
+    if not osp.exists(tmp_fullname):
+        with open(tmp_fullname, "wb") as f:
+            f.truncate(size)
+
+    state_lock = threading.Lock()
+    downloaded = sum(end - start for i, (start, end) in enumerate(parts) if i in finished)
+    pbar = tqdm(total=size, initial=downloaded, unit="B", unit_scale=True, unit_divisor=1024)
+
+    def fetch(i):
+        start, end = parts[i]
+        part_headers = dict(headers, Range="bytes={}-{}".format(start, end - 1))
+        with requests.get(url, headers=part_headers, proxies=proxies, stream=True, timeout=DOWNLOAD_TIMEOUT) as r:
+            r.raise_for_status()
+            if r.status_code != 206:
+                raise IOError("The range request of {} is not supported by the server.".format(url))
+            with open(tmp_fullname, "r+b") as f:
+                f.seek(start)
+                written = _write_response(r, f, pbar, max_size=end - start)
+        if written != end - start:
+            raise IOError("Incomplete part [{}, {}) of {}: {} bytes received.".format(start, end, url, written))
+        with state_lock:
+            state["parts"].append(i)
+            _save_download_state(state_path, state)
+
+    executor = ThreadPoolExecutor(max_workers=num_threads)
+    futures = {i: executor.submit(fetch, i) for i in range(len(parts)) if i not in finished}
+    try:
+        with open(tmp_fullname, "rb") as f:
+            # the parts are hashed in order once they are finished, while the later parts are still downloading
+            for i, (start, end) in enumerate(parts):
+                if i in futures:
+                    futures[i].result()
+                if md5 is not None:
+                    _update_md5(md5, f, start, end)
+    finally:
+        for future in futures.values():
+            future.cancel()
+        executor.shutdown(wait=True)
+        pbar.close()
+    return md5
+
+
+def _download_stream(url, tmp_fullname, state, headers, proxies, accept_ranges, md5):
+    size = state["size"]
+    offset = osp.getsize(tmp_fullname) if accept_ranges and osp.exists(tmp_fullname) else 0
+    if size is not None and offset > size:
+        offset = 0
+    if md5 is not None and offset > 0:
+        with open(tmp_fullname, "rb") as f:
+            _update_md5(md5, f, 0, offset)
+    if size is not None and offset == size:
+        return md5
+
+    stream_headers = dict(headers, Range="bytes={}-".format(offset)) if offset > 0 else headers
+    with requests.get(url, headers=stream_headers, proxies=proxies, stream=True, timeout=DOWNLOAD_TIMEOUT) as r:
+        r.raise_for_status()
+        if offset > 0 and r.status_code != 206:
+            # the server ignores the range, start over
+            offset = 0
+            md5 = hashlib.md5() if md5 is not None else None
+        total = size
+        if total is None and r.headers.get("content-length"):
+            total = offset + int(r.headers["content-length"])
+        with open(tmp_fullname, "ab" if offset > 0 else "wb") as f:
+            with tqdm(
+                total=total, initial=offset, unit="B", unit_scale=True, unit_divisor=1024, disable=total is None
+            ) as pbar:
+                written = _write_response(r, f, pbar, md5=md5)
+    if size is not None and offset + written != size:
+        raise IOError("Incomplete download of {}: {} of {} bytes received.".format(url, offset + written, size))
+    return md5
+
+
+def download_file(url, fullname, md5sum=None, num_threads=None, part_size=None, headers=None, proxies=None):
+    """
+    Downloads `url` to `fullname`, resuming the partial download of a previous attempt.
+
+    The file is downloaded to `<fullname>_tmp` and moved to `fullname` when it is complete. If the
+    server supports range requests, the file is split into parts of `part_size` bytes which are
+    downloaded by `num_threads` threads in parallel, otherwise it is streamed over one connection.
+    The progress is recorded in `<fullname>_tmp.json`, so the next attempt only downloads the missing
+    parts (or the rest of the stream) if the remote file is unchanged, i.e. it has the same size and
+    ETag (or Last-Modified). The md5 is computed while downloading instead of reading the file again
+    afterwards.
+
+    Args:
+        url (str): The url of the file.
+        fullname (str): The local path of the file.
+        md5sum (str, optional): The expected md5 of the file. Defaults to None.
+        num_threads (int, optional): The number of parallel range requests. Defaults to `DOWNLOAD_THREAD_NUM`.
+        part_size (int, optional): The number of bytes of each range request. Defaults to `DOWNLOAD_PART_SIZE`.
+        headers (dict, optional): The headers of the requests. Defaults to None.
+        proxies (dict, optional): The proxies of the requests. Defaults to None.
+
+    Returns:
+        str: The local path of the file.
+
+    Raises:
+        requests.HTTPError: If the server responds with an error.
+        IOError: If the download is interrupted or the md5 check fails, the download can be resumed
+            by calling this function again in the former case.
+    """
+    num_threads = DOWNLOAD_THREAD_NUM if num_threads is None else num_threads
+    part_size = part_size or DOWNLOAD_PART_SIZE
+    # the size of compressed response does not match the file, which breaks the range requests
+    headers = dict(headers or {}, **{"Accept-Encoding": "identity"})
+    tmp_fullname = fullname + "_tmp"
+    state_path = tmp_fullname + ".json"
+
+    size, validator, accept_ranges = _probe_url(url, headers, proxies)
+    parallel = accept_ranges and size is not None and num_threads > 1 and size > part_size
+    state = {"url": url, "size": size, "validator": validator, "parallel": parallel, "part_size": part_size}
+    saved_state = _load_download_state(state_path)
+    if (
+        validator is not None
+        and saved_state is not None
+        and all(saved_state.get(key) == value for key, value in state.items())
+        and osp.exists(tmp_fullname)
+    ):
+        state = saved_state
+        logger.info("Resuming the download of {}".format(fullname))
+    else:
+        state["parts"] = []
+        for path in [tmp_fullname, state_path]:
+            if osp.exists(path):
+                os.remove(path)
+        _save_download_state(state_path, state)
+
+    md5 = hashlib.md5() if md5sum is not None else None
+    if parallel:
+        md5 = _download_parts(url, tmp_fullname, state, state_path, headers, proxies, num_threads, md5)
+    else:
+        md5 = _download_stream(url, tmp_fullname, state, headers, proxies, accept_ranges, md5)
+
+    if md5 is not None and md5.hexdigest() != md5sum:
+        for path in [tmp_fullname, state_path]:
+            os.remove(path)
+        raise IOError("File {} md5 check failed, {}(calc) != {}(base)".format(fullname, md5.hexdigest(), md5sum))
+    os.replace(tmp_fullname, fullname)
+    os.remove(state_path)
+    return fullname
+
+
 def _download(url, path, md5sum=None):
     """
     Download from url, save to path.
@@ -189,38 +394,19 @@ def _download(url, path, md5sum=None):
 
     fname = osp.split(url)[-1]
     fullname = osp.join(path, fname)
-    retry_cnt = 0
-
-    while not (osp.exists(fullname) and _md5check(fullname, md5sum)):
-        if retry_cnt < DOWNLOAD_RETRY_LIMIT:
-            retry_cnt += 1
-        else:
-            raise RuntimeError("Download from {} failed. " "Retry limit reached".format(url))
+    if osp.exists(fullname) and _md5check(fullname, md5sum):
+        return fullname
 
+    for _ in range(DOWNLOAD_RETRY_LIMIT):
         logger.info("Downloading {} from {}".format(fname, url))
-
-        req = requests.get(url, stream=True)
-        if req.status_code != 200:
-            raise RuntimeError("Downloading from {} failed with code " "{}!".format(url, req.status_code))
-
-        # For protecting download interupted, download to
-        # tmp_fullname firstly, move tmp_fullname to fullname
-        # after download finished
-        tmp_fullname = fullname + "_tmp"
-        total_size = req.headers.get("content-length")
-        with open(tmp_fullname, "wb") as f:
-            if total_size:
-                with tqdm(total=int(total_size), unit="B", unit_scale=True, unit_divisor=1024) as pbar:
-                    for chunk in req.iter_content(chunk_size=1024):
-                        f.write(chunk)
-                        pbar.update(len(chunk))
-            else:
-                for chunk in req.iter_content(chunk_size=1024):
-                    if chunk:
-                        f.write(chunk)
-        shutil.move(tmp_fullname, fullname)
-
-    return fullname
+        try:
+            return download_file(url, fullname, md5sum)
+        except requests.HTTPError as e:
+            raise RuntimeError("Downloading from {} failed with code {}!".format(url, e.response.status_code))
+        except (requests.RequestException, IOError) as e:
+            # the finished part of the download is kept and resumed by the next retry
+            logger.warning("Downloading from {} failed: {}".format(url, e))
+    raise RuntimeError("Download from {} failed. " "Retry limit reached".format(url))
 
 
 def _md5check(fullname, md5sum=None):
@@ -0,0 +1,82 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib
+import sys
+
+from .env import _get_bool_env
+
+__all__ = ["is_lazy_import_enabled", "lazy_module"]
+
+
+def is_lazy_import_enabled():
+    """Lazy import is enabled unless the environment variable `PADDLENLP_LAZY_IMPORT` is set to false."""
+    return _get_bool_env("PADDLENLP_LAZY_IMPORT", "1")
+
+
+def lazy_module(module_name, import_structure):
+    """
+    Makes the names of a package importing from its submodules on first access.
+
+    `import_structure` maps the submodules (relative to the package, e.g. `"bert.modeling"`) to the
+    names imported from them, the submodules with no names are only imported as attributes. The
+    returned functions are used as the `__getattr__` and `__dir__` of the package (PEP 562), the
+    imported names are cached in the package, so every submodule is imported at most once.
+
+    If lazy import is disabled by `PADDLENLP_LAZY_IMPORT=0`, all the submodules are imported in the
+    order of `import_structure` at once.
+
+    Args:
+        module_name (str): The name of the package, i.e. `__name__`.
+        import_structure (dict): Mapping from the submodules to the names imported from them.
+
+    Returns:
+        tuple: The `__getattr__`, `__dir__` and `__all__` of the package.
+    """
+    name_to_module = {}
+    for submodule, names in import_structure.items():
+        for name in names:
+            name_to_module[name] = submodule
+    submodules = list(dict.fromkeys(submodule.split(".")[0] for submodule in import_structure))
+    all_names = list(dict.fromkeys(submodules + list(name_to_module)))
+
+    def _import(submodule):
+        return importlib.import_module("." + submodule, module_name)
+
+    def __getattr__(name):
+        if name in name_to_module:
+            value = getattr(_import(name_to_module[name]), name)
+        elif name.startswith("__"):
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        else:
+            try:
+                value = _import(name)
+            except ModuleNotFoundError as e:
+                if e.name != f"{module_name}.{name}":
+                    raise
+                raise AttributeError(f"module {module_name!r} has no attribute {name!r}") from None
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(sys.modules[module_name].__dict__) | set(all_names))
+
+    if not is_lazy_import_enabled():
+        module = sys.modules[module_name]
+        for submodule, names in import_structure.items():
+            imported = _import(submodule)
+            for name in names:
+                setattr(module, name, getattr(imported, name))
+
+    return __getattr__, __dir__, all_names
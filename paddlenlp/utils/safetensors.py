@@ -22,6 +22,7 @@ import numpy as np
 __all__ = [
     "fast_safe_open",
     "fast_load_file",
+    "SafeTensorsWriter",
 ]
 
 
@@ -64,6 +65,9 @@ numpy_dtype = {
 }
 
 
+safetensors_dtype = {np.dtype(v): k for k, v in numpy_dtype.items() if not isinstance(v, int)}
+
+
 def getSize(fileobject):
     fileobject.seek(0, 2)  # move the cursor to the end of the file
     size = fileobject.tell()
@@ -122,11 +126,13 @@ def readinto_numpy(meta, buffer, base_ptr):
 
 
 class PySafeSlice:
-    def __init__(self, info, bufferfile, base_ptr, buffermmap):
+    def __init__(self, info, bufferfile, base_ptr, buffermmap, zero_copy=False):
         self.info = info
         self.bufferfile = bufferfile
         self.buffermmap = buffermmap
         self.base_ptr = base_ptr
+        # return the arrays backed by the pages of `buffermmap` instead of reading into new buffers
+        self.zero_copy = zero_copy
 
         self.start = [0 for dim in self.shape]
         self.stop = [dim for dim in self.shape]
@@ -213,6 +219,9 @@ class PySafeSlice:
                 last_end = end
         if last_start != -1:
             merge_indices.append((last_start, last_end))
+        if self.zero_copy and len(merge_indices) == 1:
+            start, end = merge_indices[0]
+            return self._view(start, end).reshape(target_shape)
         tensor = np.empty(shape=[1] if len(target_shape) == 0 else np.prod(target_shape), dtype=self.dtype)
 
         tensor_view = memoryview(tensor.view(np.uint8).reshape(-1))
@@ -237,7 +246,14 @@ class PySafeSlice:
 
         return tensor.reshape(target_shape)
 
+    def _view(self, start, end):
+        return np.frombuffer(
+            self.buffermmap, dtype=self.dtype, count=(end - start) // self.bits, offset=self.start_offset + start
+        )
+
     def get(self, *args, **kwargs):
+        if self.zero_copy:
+            return self._view(0, self.nbytes).reshape(self.shape)
         tensor = np.empty(shape=self.shape, dtype=self.dtype)
         self.bufferfile.seek(self.start_offset)
         self.bufferfile.readinto(memoryview(tensor))
@@ -273,22 +289,47 @@ class PySafeSlice:
 
 # a simple file writer object
 class fast_safe_open:
-    def __init__(self, filename, framework=None, device="cpu"):
+    """
+    Opens a safetensors file to read its tensors as numpy arrays.
+
+    Args:
+        filename (str): The path of the safetensors file.
+        mmap_mode (str, optional): If set, the tensors and the contiguous slices are numpy arrays backed by
+            the memory-mapped pages of the file instead of copies, so the processes loading the same file
+            share one copy in the page cache. `"r"` maps the file read-only and the arrays are not writeable,
+            `"c"` maps it copy-on-write and only the pages written to are copied. Defaults to None.
+    """
+
+    def __init__(self, filename, framework=None, device="cpu", mmap_mode=None):
+        if mmap_mode not in (None, "r", "c"):
+            raise ValueError(f"`mmap_mode` should be None, 'r' or 'c', but got {mmap_mode}.")
         self.filename = filename
         self.framework = framework
         self.file = open(self.filename, "rb")
-        self.file_mmap = mmap.mmap(self.file.fileno(), 0, flags=mmap.MAP_PRIVATE)
+        if mmap_mode == "r":
+            self.file_mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.file_mmap = mmap.mmap(self.file.fileno(), 0, flags=mmap.MAP_PRIVATE)
+        if mmap_mode is not None and hasattr(self.file_mmap, "madvise"):
+            # start reading the pages ahead of the first accesses
+            self.file_mmap.madvise(mmap.MADV_WILLNEED)
         self.base, self.tensors_decs, self.__metadata__ = read_metadata(self.file)
         self.tensors = OrderedDict()
         for key, info in self.tensors_decs.items():
-            self.tensors[key] = PySafeSlice(info, self.file, self.base, self.file_mmap)
+            self.tensors[key] = PySafeSlice(
+                info, self.file, self.base, self.file_mmap, zero_copy=mmap_mode is not None
+            )
             self.tensors[key].key = key
 
     def __enter__(self):
         return self
 
     def __exit__(self, *args):
-        self.file_mmap.close()
+        try:
+            self.file_mmap.close()
+        except BufferError:
+            # the zero-copy arrays still refer to the mapping, it is unmapped after they are released
+            pass
         self.file.close()
 
     def metadata(self):
@@ -304,9 +345,82 @@ class fast_safe_open:
         return self.tensors[name]
 
 
-def fast_load_file(filename):
+def fast_load_file(filename, mmap_mode=None):
     result = {}
-    with fast_safe_open(filename, framework="np") as f:
+    with fast_safe_open(filename, framework="np", mmap_mode=mmap_mode) as f:
         for k in f.keys():
             result[k] = f.get_tensor(k)
     return result
+
+
+class SafeTensorsWriter:
+    """
+    Writes a safetensors file tensor by tensor, so the tensors do not have to be held in memory at once.
+
+    The names, dtypes and shapes of all the tensors are given up front to write the header, then the
+    tensors are appended in the same order by `write`.
+
+    Args:
+        filename (str): The path of the safetensors file.
+        tensor_infos (dict): Mapping from the names of the tensors to their `(dtype, shape)`, dtype is a
+            numpy dtype.
+        metadata (dict, optional): The metadata of the file, the values should be str. Defaults to None.
+    """
+
+    def __init__(self, filename, tensor_infos, metadata=None):
+        header = OrderedDict()
+        if metadata is not None:
+            header["__metadata__"] = metadata
+        offset = 0
+        for name, (dtype, shape) in tensor_infos.items():
+            dtype = np.dtype(dtype)
+            if dtype not in safetensors_dtype:
+                raise ValueError(f"Unsupported dtype {dtype} of tensor {name}.")
+            nbytes = int(np.prod(shape)) * dtype.itemsize
+            header[name] = {
+                "dtype": safetensors_dtype[dtype],
+                "shape": [int(dim) for dim in shape],
+                "data_offsets": [offset, offset + nbytes],
+            }
+            offset += nbytes
+        header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        # the data is aligned to 8 bytes
+        header_bytes += b" " * (-len(header_bytes) % 8)
+
+        self.filename = filename
+        self.tensor_infos = [(name, np.dtype(dtype), tuple(shape)) for name, (dtype, shape) in tensor_infos.items()]
+        self.num_written = 0
+        self.file = open(filename, "wb")
+        self.file.write(np.uint64(len(header_bytes)).tobytes())
+        self.file.write(header_bytes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *args):
+        if exc_type is None:
+            self.close()
+        else:
+            self.file.close()
+
+    def write(self, name, tensor):
+        if self.num_written >= len(self.tensor_infos):
+            raise ValueError(f"Tensor {name} is not in the header of {self.filename}.")
+        expected_name, dtype, shape = self.tensor_infos[self.num_written]
+        if name != expected_name:
+            raise ValueError(f"Expect tensor {expected_name} to be written to {self.filename}, but got {name}.")
+        if tensor.dtype != dtype or tuple(tensor.shape) != shape:
+            raise ValueError(
+                f"Tensor {name} should be {dtype} with shape {shape}, but got {tensor.dtype} with shape {tensor.shape}."
+            )
+        self.file.write(np.ascontiguousarray(tensor).reshape(-1).view(np.uint8).data)
+        self.num_written += 1
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.close()
+        if self.num_written != len(self.tensor_infos):
+            raise ValueError(
+                f"Only {self.num_written} of {len(self.tensor_infos)} tensors are written to {self.filename}."
+            )
@@ -195,14 +195,10 @@ def get_bool_ids_greater_than(probs, limit=0.5, return_prob=False):
             result.append(get_bool_ids_greater_than(p, limit, return_prob))
         return result
     else:
-        result = []
-        for i, p in enumerate(probs):
-            if p > limit:
-                if return_prob:
-                    result.append((i, p))
-                else:
-                    result.append(i)
-        return result
+        ids = np.nonzero(probs > limit)[0]
+        if return_prob:
+            return list(zip(ids.tolist(), probs[ids]))
+        return ids.tolist()
 
 
 def get_span(start_ids, end_ids, with_prob=False):
@@ -253,6 +249,49 @@ def get_span(start_ids, end_ids, with_prob=False):
     return result
 
 
+def batch_get_bool_ids_greater_than(probs, limit=0.5):
+    """
+    Vectorized version of `get_bool_ids_greater_than` over a batch of probability arrays.
+
+    Args:
+        probs (numpy.ndarray): The probability arrays with shape [batch_size, seq_len].
+        limit (float): The limitation for probability.
+    Returns:
+        tuple: The batch indices, the position indices and the probabilities of the positions
+        which meet the conditions, all of them are 1D arrays sorted by batch and position.
+    """
+    probs = np.asarray(probs)
+    batch_ids, ids = np.nonzero(probs > limit)
+    return batch_ids, ids, probs[batch_ids, ids]
+
+
+def batch_get_span(start_probs, end_probs, limit=0.5):
+    """
+    Vectorized version of `get_bool_ids_greater_than` followed by `get_span` with probabilities over a batch.
+
+    Like `get_span`, each end position is paired with the last start position which is not after it and
+    after the previous end position, and the end positions without such a start are dropped.
+
+    Args:
+        start_probs (numpy.ndarray): The probabilities of start positions with shape [batch_size, seq_len].
+        end_probs (numpy.ndarray): The probabilities of end positions with shape [batch_size, seq_len].
+        limit (float): The limitation for probability.
+    Returns:
+        tuple: The batch indices, start indices, end indices, start probabilities and end probabilities
+        of the spans, all of them are 1D arrays sorted by batch and end index.
+    """
+    start_probs = np.asarray(start_probs, dtype="float64")
+    end_probs = np.asarray(end_probs, dtype="float64")
+    positions = np.arange(start_probs.shape[-1])
+    # the last start / end position at or before each position, -1 if there is none
+    last_start = np.maximum.accumulate(np.where(start_probs > limit, positions, -1), axis=-1)
+    last_end = np.maximum.accumulate(np.where(end_probs > limit, positions, -1), axis=-1)
+    prev_end = np.concatenate([np.full_like(last_end[..., :1], -1), last_end[..., :-1]], axis=-1)
+    batch_ids, end_ids = np.nonzero((end_probs > limit) & (last_start > prev_end))
+    start_ids = last_start[batch_ids, end_ids]
+    return batch_ids, start_ids, end_ids, start_probs[batch_ids, start_ids], end_probs[batch_ids, end_ids]
+
+
 class DataConverter(object):
     """DataConverter to convert data export from annotation platform"""
 
@@ -0,0 +1,67 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Measures the import time of paddlenlp with and without lazy import, e.g.
+
+    python scripts/import_time_benchmark.py --repeat 5
+
+Every statement is timed in a new interpreter, so nothing is cached by the previous runs
+except the files in the page cache. `import paddle` is timed alone as the baseline.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = [
+    "import paddle",
+    "import paddlenlp",
+    "from paddlenlp.transformers import AutoTokenizer",
+    "from paddlenlp.transformers import LlamaForCausalLM",
+    "from paddlenlp import Taskflow",
+]
+
+TIMER = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def time_statement(statement, lazy):
+    env = dict(os.environ, PADDLENLP_LAZY_IMPORT="1" if lazy else "0")
+    output = subprocess.check_output([sys.executable, "-c", TIMER.format(statement=statement)], env=env, text=True)
+    return float(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="The number of runs of every statement.")
+    parser.add_argument("--statement", action="append", help="The statements to time, defaults to all.")
+    args = parser.parse_args()
+
+    print(f"{'statement':<55}{'eager (s)':>12}{'lazy (s)':>12}{'speedup':>10}")
+    for statement in args.statement or STATEMENTS:
+        # warm up the page cache and the .pyc files
+        time_statement(statement, lazy=False)
+        eager = statistics.median(time_statement(statement, lazy=False) for _ in range(args.repeat))
+        lazy = statistics.median(time_statement(statement, lazy=True) for _ in range(args.repeat))
+        print(f"{statement:<55}{eager:>12.3f}{lazy:>12.3f}{eager / lazy:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import paddle
+from parameterized import parameterized
+
+from paddlenlp.data import DataCollatorWithBatchFetch, default_data_collator
+from paddlenlp.data.causal_dataset import (
+    GPTDataset,
+    _build_doc_idx,
+    _build_sample_idx,
+    _build_sample_idx_np,
+    _num_epochs,
+)
+from paddlenlp.data.indexed_dataset import (
+    MMapIndexedDataset,
+    MMapIndexedDatasetBuilder,
+    data_file_path,
+    index_file_path,
+    loss_mask_file_path,
+)
+
+
+class TestBuildSampleIdx(unittest.TestCase):
+    @parameterized.expand(
+        [
+            (16, 2, 10, 1),
+            (64, 8, 100, 2),
+            (128, 32, 500, 3),
+        ]
+    )
+    def test_build_sample_idx_np(self, num_documents, seq_length, num_samples, seed):
+        np_rng = np.random.RandomState(seed)
+        # include empty documents, which are skipped by the sample index
+        sizes = np_rng.randint(0, 64, size=num_documents).astype(np.int32)
+        sizes[0] = 1
+        documents = np.arange(num_documents, dtype=np.int32)
+        tokens_per_epoch = int(np.sum(sizes))
+        num_epochs = _num_epochs(tokens_per_epoch, seq_length, num_samples)
+        doc_idx = _build_doc_idx(documents, num_epochs, np_rng, False)
+
+        expected = _build_sample_idx(sizes, doc_idx, seq_length, num_epochs, tokens_per_epoch)
+        sample_idx = _build_sample_idx_np(sizes, doc_idx, seq_length, num_epochs, tokens_per_epoch, chunk_size=7)
+        self.assertEqual(sample_idx.dtype, expected.dtype)
+        self.assertTrue(np.array_equal(sample_idx, expected))
+
+
+class TestGPTDatasetBatchFetch(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.data_prefix = os.path.join(self.tempdir.name, "corpus")
+        np_rng = np.random.RandomState(42)
+
+        builder = MMapIndexedDatasetBuilder(
+            data_file_path(self.data_prefix), np.uint16, loss_mask_file=loss_mask_file_path(self.data_prefix)
+        )
+        for _ in range(32):
+            length = np_rng.randint(1, 50)
+            builder.add_item(np_rng.randint(0, 50000, size=length))
+            builder.flush_loss_mask_item([np_rng.randint(0, 2, size=length)])
+            builder.end_document()
+        builder._loss_mask_file.close()
+        builder.finalize(index_file_path(self.data_prefix))
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    @parameterized.expand([(False,), (True,)])
+    def test_getitems(self, return_doc_ids):
+        indexed_dataset = MMapIndexedDataset(self.data_prefix, skip_warmup=True)
+        documents = np.arange(len(indexed_dataset.sizes), dtype=np.int32)
+        dataset = GPTDataset(
+            "train", self.data_prefix, documents, indexed_dataset, "1,0,0", 64, 16, 1234, return_doc_ids
+        )
+
+        indices = [0, 5, 3, len(dataset) - 1, 5]
+        samples = dataset.__getitems__(indices)
+        self.assertEqual(len(samples), len(indices))
+        for idx, sample in zip(indices, samples):
+            expected = dataset[idx]
+            self.assertEqual(sorted(sample.keys()), sorted(expected.keys()))
+            for key in expected:
+                self.assertEqual(sample[key].dtype, expected[key].dtype)
+                self.assertTrue(np.array_equal(sample[key], expected[key]))
+
+        batch = dataset.get_batch(indices)
+        self.assertEqual(batch["text"].shape, (len(indices), 17))
+        self.assertEqual(batch["mask"].shape, (len(indices), 17))
+
+    def test_gather(self):
+        indexed_dataset = MMapIndexedDataset(self.data_prefix, skip_warmup=True)
+        idxs = np.array([3, 0, 7, 3])
+        offsets = np.array([0, 0, 2, 1])
+        lengths = np.minimum(indexed_dataset.sizes[idxs] - offsets, 5)
+        out = np.empty([int(lengths.sum())], dtype=np.int64)
+        mask_out = np.empty_like(out)
+        indexed_dataset.gather(idxs, offsets, lengths, out, mask_out)
+
+        expected = [indexed_dataset.get(i, offset=o, length=n) for i, o, n in zip(idxs, offsets, lengths)]
+        np.testing.assert_array_equal(out, np.concatenate([tokens for tokens, _ in expected]))
+        np.testing.assert_array_equal(mask_out, np.concatenate([mask for _, mask in expected]))
+
+        with self.assertRaises(ValueError):
+            indexed_dataset.gather(idxs, offsets, lengths, np.empty([2, int(lengths.sum())], dtype=np.int64)[0])
+
+    def test_batch_fetch_collator(self):
+        indexed_dataset = MMapIndexedDataset(self.data_prefix, skip_warmup=True)
+        documents = np.arange(len(indexed_dataset.sizes), dtype=np.int32)
+        dataset = GPTDataset("train", self.data_prefix, documents, indexed_dataset, "1,0,0", 64, 16, 1234, False)
+
+        batch_sampler = paddle.io.BatchSampler(dataset=dataset, batch_size=3, shuffle=False)
+        data_collator = DataCollatorWithBatchFetch(dataset, lambda features: default_data_collator(features, "np"))
+        dataloader = paddle.io.DataLoader(
+            data_collator.index_dataset(), batch_sampler=batch_sampler, collate_fn=data_collator
+        )
+        batches = list(dataloader)
+        self.assertEqual(len(batches), len(batch_sampler))
+        for batch, indices in zip(batches, batch_sampler):
+            expected = default_data_collator([dataset[idx] for idx in indices], "np")
+            self.assertEqual(sorted(batch.keys()), sorted(expected.keys()))
+            for key in expected:
+                np.testing.assert_array_equal(batch[key], expected[key])
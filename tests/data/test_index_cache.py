@@ -0,0 +1,130 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from paddlenlp.data.index_cache import IndexCacheEntry
+
+
+class TestIndexCacheEntry(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.tempdir.name, "corpus.bin")
+        with open(self.data_file, "wb") as f:
+            f.write(b"\x00" * 16)
+        self.cache_dir = os.path.join(self.tempdir.name, "index-cache")
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def _entry(self, desc_hash="abc"):
+        return IndexCacheEntry(
+            self.cache_dir, desc_hash, {"desc": desc_hash + ".dsc", "idx": desc_hash + "_idx.npy"}, [self.data_file]
+        )
+
+    def _build(self, entry):
+        with entry.lock():
+            entry.save_text("desc", "desc")
+            entry.save("idx", np.arange(10))
+            entry.mark_ready()
+
+    def _build_other(self, entry):
+        with entry.lock():
+            entry.save("idx", np.arange(10))
+            entry.mark_ready()
+
+    def test_build_and_load(self):
+        entry = self._entry()
+        self.assertFalse(entry.is_ready())
+        self._build(entry)
+        self.assertTrue(entry.is_ready())
+        self.assertTrue(np.array_equal(np.load(entry.paths["idx"]), np.arange(10)))
+        self.assertEqual([f for f in os.listdir(self.cache_dir) if ".tmp." in f], [])
+
+    def test_legacy_entry_without_marker(self):
+        entry = self._entry()
+        os.makedirs(self.cache_dir)
+        with open(entry.paths["desc"], "wt") as f:
+            f.write("desc")
+        np.save(entry.paths["idx"], np.arange(10))
+        self.assertTrue(entry.is_ready())
+
+    def test_stale_entry(self):
+        stale_entry = self._entry("stale")
+        self._build(stale_entry)
+        with open(self.data_file, "ab") as f:
+            f.write(b"\x01")
+        self.assertFalse(stale_entry.is_ready())
+
+        entry = self._entry()
+        self._build(entry)
+        removed = entry.gc()
+        self.assertIn(stale_entry.paths["idx"], removed)
+        self.assertFalse(os.path.exists(stale_entry.ready_path))
+        # other processes may still be waiting on the lock file
+        self.assertTrue(os.path.exists(stale_entry.lock_path))
+        self.assertTrue(entry.is_ready())
+
+    def test_fingerprint_ignores_mtime(self):
+        entry = self._entry()
+        self._build(entry)
+        os.utime(self.data_file, ns=(0, 0))
+        self.assertTrue(entry.is_ready())
+
+        with open(self.data_file, "r+b") as f:
+            f.write(b"\x01")
+        self.assertFalse(entry.is_ready())
+
+    def test_gc_keeps_entries_of_other_hosts(self):
+        other_data_file = os.path.join(self.tempdir.name, "other.bin")
+        with open(other_data_file, "wb") as f:
+            f.write(b"\x00" * 16)
+        other_entry = IndexCacheEntry(self.cache_dir, "other", {"idx": "other_idx.npy"}, [other_data_file])
+        self._build_other(other_entry)
+        # the data files of the entry only exist on the host of another job
+        os.remove(other_data_file)
+
+        entry = self._entry()
+        self._build(entry)
+        self.assertEqual(entry.gc(), [])
+        self.assertTrue(os.path.exists(other_entry.paths["idx"]))
+        self.assertTrue(os.path.exists(other_entry.ready_path))
+
+    def test_wait(self):
+        entry = self._entry()
+        started = threading.Event()
+
+        def build():
+            with entry.lock():
+                started.set()
+                time.sleep(0.5)
+                entry.save_text("desc", "desc")
+                entry.save("idx", np.arange(10))
+                entry.mark_ready()
+
+        thread = threading.Thread(target=build)
+        thread.start()
+        started.wait()
+        entry.wait(timeout=10)
+        self.assertTrue(entry.is_ready())
+        thread.join()
+
+        with self.assertRaises(TimeoutError):
+            self._entry("missing").wait(timeout=0.1)
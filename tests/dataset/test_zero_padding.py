@@ -24,6 +24,7 @@ from paddlenlp.datasets import (
     ZeroPaddingMapDataset,
     load_dataset,
 )
+from paddlenlp.datasets.zero_padding_dataset import generate_best_fit_packs
 from paddlenlp.transformers import AutoTokenizer
 from tests.testing_utils import get_tests_dir
 
@@ -62,6 +63,7 @@ class ZeroPaddingTestCommon:
             ]
         ),
         "position_ids_2d": [[0, 1, 2, 3, 4, 5, 6, 0, 1, 2, 3, 4, 5, 6], [0, 1, 2, 3, 4, 5, 6, 0, 1, 2, 3, 4, 5, 6]],
+        "attn_mask_startend_row_indices": [7, 7, 7, 7, 7, 7, 7, 14, 14, 14, 14, 14, 14, 14],
     }
 
     def preprocess_fn(
@@ -129,6 +131,11 @@ class TestZeroPaddingMapDataset(ZeroPaddingTestCommon, unittest.TestCase):
         self.assertEqual(type(inData_input_labels_only[0]["input_ids"]), list)
         self.assertEqual(np.array(inData_input_labels_only[0]["input_ids"]).shape, (70,))
 
+        inData_compact_mask = ZeroPaddingMapDataset(
+            self.dataset_input_labels_only, self.tokenizer, max_length=128, dense_attention_mask=False
+        )
+        self.assertEqual(set(inData_compact_mask[0].keys()), {"input_ids", "labels", "attn_mask_startend_row_indices"})
+
     def test_short_max_length(self):
         inData = ZeroPaddingMapDataset(self.dataset, self.tokenizer, max_length=16)
         self.assertEqual(inData[0]["input_ids"], self.expected_output["input_ids"])
@@ -143,6 +150,15 @@ class TestZeroPaddingMapDataset(ZeroPaddingTestCommon, unittest.TestCase):
             (inData_input_labels_only[0]["attention_mask"] == self.expected_output["attention_mask"]).all()
         )
 
+        inData_compact_mask = ZeroPaddingMapDataset(
+            self.dataset_input_labels_only, self.tokenizer, max_length=16, dense_attention_mask=False
+        )
+        self.assertEqual(inData_compact_mask[0]["input_ids"], self.expected_output["input_ids"])
+        self.assertEqual(
+            inData_compact_mask[0]["attn_mask_startend_row_indices"],
+            self.expected_output["attn_mask_startend_row_indices"],
+        )
+
     def test_2d_position_id(self):
         inData_2d = ZeroPaddingMapDataset(self.dataset_position_2d, self.tokenizer, max_length=16)
         self.assertTrue(inData_2d[0]["position_ids"] == self.expected_output["position_ids_2d"])
@@ -188,6 +204,12 @@ class TestZeroPaddingIterableDataset(ZeroPaddingTestCommon, unittest.TestCase):
         self.assertEqual(type(example["input_ids"]), list)
         self.assertEqual(np.array(example["input_ids"]).shape, (70,))
 
+        inData_compact_mask = ZeroPaddingIterableDataset(
+            self.dataset_input_labels_only, self.tokenizer, max_length=128, dense_attention_mask=False
+        )
+        example = next(iter(inData_compact_mask))
+        self.assertEqual(set(example.keys()), {"input_ids", "labels", "attn_mask_startend_row_indices"})
+
     def test_short_max_length(self):
         inData = ZeroPaddingIterableDataset(self.dataset, self.tokenizer, max_length=16)
         example = next(iter(inData))
@@ -204,6 +226,15 @@ class TestZeroPaddingIterableDataset(ZeroPaddingTestCommon, unittest.TestCase):
         self.assertEqual(example["labels"], self.expected_output["labels"])
         self.assertTrue((example["attention_mask"] == self.expected_output["attention_mask"]).all())
 
+        inData_compact_mask = ZeroPaddingIterableDataset(
+            self.dataset_input_labels_only, self.tokenizer, max_length=16, dense_attention_mask=False
+        )
+        example = next(iter(inData_compact_mask))
+        self.assertEqual(example["input_ids"], self.expected_output["input_ids"])
+        self.assertEqual(
+            example["attn_mask_startend_row_indices"], self.expected_output["attn_mask_startend_row_indices"]
+        )
+
     def test_2d_position_id(self):
         inData_2d = ZeroPaddingIterableDataset(self.dataset_position_2d, self.tokenizer, max_length=16)
         example = next(iter(inData_2d))
@@ -215,3 +246,26 @@ class TestZeroPaddingIterableDataset(ZeroPaddingTestCommon, unittest.TestCase):
         inData = ZeroPaddingIterableDataset(self.dataset, self.tokenizer, max_length=128)
         tgt_input_ids = [item["input_ids"] for item in inData]
         self.assertEqual(orginal_input_ids, tgt_input_ids)
+
+    def test_greedy_zero_padding(self):
+        inData = ZeroPaddingIterableDataset(
+            self.dataset, self.tokenizer, max_length=32, greedy_zero_padding=True, greedy_buffer_size=4
+        )
+        packs = list(inData)
+        self.assertTrue(all(len(pack["input_ids"]) <= 32 for pack in packs))
+        self.assertEqual(inData.packing_stats.num_packs, len(packs))
+        self.assertEqual(inData.packing_stats.num_tokens, sum(len(pack["input_ids"]) for pack in packs))
+
+
+class TestBestFitPacks(unittest.TestCase):
+    def test_generate_best_fit_packs(self):
+        lengths = [2, 7, 3, 5, 8, 1, 4, 6]
+        examples = [{"input_ids": [0] * length} for length in lengths]
+        packs = generate_best_fit_packs(examples, max_length=9)
+        pack_lengths = [[len(record["input_ids"]) for record in pack] for pack in packs]
+        self.assertEqual(pack_lengths, [[8, 1], [7, 2], [6, 3], [5, 4]])
+
+    def test_oversized_examples(self):
+        examples = [{"input_ids": [0] * length} for length in [12, 3]]
+        packs = generate_best_fit_packs(examples, max_length=10)
+        self.assertEqual([len(pack) for pack in packs], [1, 1])
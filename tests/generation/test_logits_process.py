@@ -209,6 +209,24 @@ class LogitsProcessorTest(unittest.TestCase):
             [[False, False, False], [True, False, False]],
         )
 
+    def test_no_repeat_ngram_dist_processor_incremental(self):
+        vocab_size = 5
+        num_beams = 4
+
+        input_ids = ids_tensor((1, 3), vocab_size=vocab_size).tile([num_beams, 1])
+        no_repeat_proc = NoRepeatNGramLogitsProcessor(2)
+        for _ in range(10):
+            scores = self._get_uniform_logits(num_beams, vocab_size)
+            filtered_scores = no_repeat_proc(input_ids, scores.clone())
+            # a new processor builds the n-grams from scratch
+            expected_scores = NoRepeatNGramLogitsProcessor(2)(input_ids, scores.clone())
+            self.assertListEqual(filtered_scores.tolist(), expected_scores.tolist())
+
+            # reorder the beams and append new tokens like beam search
+            beam_idx = paddle.to_tensor([random.randrange(num_beams) for _ in range(num_beams)])
+            next_tokens = ids_tensor((num_beams, 1), vocab_size=vocab_size)
+            input_ids = paddle.concat([paddle.index_select(input_ids, beam_idx), next_tokens], axis=-1)
+
     def test_processor_list(self):
         batch_size = 4
         sequence_length = 10
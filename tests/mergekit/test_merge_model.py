@@ -12,11 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import os
 import unittest
 from tempfile import TemporaryDirectory
+from unittest import mock
 
+import numpy as np
 from parameterized import parameterized
+from safetensors.numpy import load_file
 
 from paddlenlp.mergekit import MergeConfig, MergeModel
 from paddlenlp.transformers import AutoModel
@@ -114,3 +118,60 @@ class TestMergeModel(unittest.TestCase):
             )
             mergekit = MergeModel(merge_config)
             mergekit.merge_model()
+
+    @parameterized.expand([("np",), ("pd",)])
+    def test_merge_model_sharded(self, tensor_type):
+        with TemporaryDirectory() as tempdir:
+            model = AutoModel.from_pretrained("__internal_testing__/tiny-random-bert", dtype="float32")
+            safe_path = os.path.join(tempdir, "safe_model")
+            model.save_pretrained(safe_path, safe_serialization="safetensors")
+
+            output_path = os.path.join(tempdir, "merged")
+            merge_config = MergeConfig(
+                merge_method="linear",
+                model_path_list=[safe_path, safe_path],
+                output_path=output_path,
+                tensor_type=tensor_type,
+                n_thread=4,
+                max_shard_size="100KB",
+            )
+            mergekit = MergeModel(merge_config)
+            mergekit.merge_model()
+
+            with open(os.path.join(output_path, "model.safetensors.index.json"), "r") as f:
+                weight_map = json.load(f)["weight_map"]
+            shard_files = sorted(set(weight_map.values()))
+            self.assertGreater(len(shard_files), 1)
+            merged_state_dict = {}
+            for shard_file in shard_files:
+                shard = load_file(os.path.join(output_path, shard_file))
+                # a shard exceeds max_shard_size only if it holds a single large tensor
+                if len(shard) > 1:
+                    self.assertLessEqual(sum(tensor.nbytes for tensor in shard.values()), 100 * 1000)
+                merged_state_dict.update(shard)
+
+            # merging a model with itself gives the same model
+            state_dict = model.state_dict()
+            self.assertEqual(set(merged_state_dict.keys()), set(weight_map.keys()))
+            for key, tensor in merged_state_dict.items():
+                np.testing.assert_allclose(tensor, state_dict[key].numpy(), rtol=1e-5, atol=1e-6)
+
+    def test_merge_model_failed(self):
+        def failed_shard_merge(self, shard_plan, index_list):
+            raise RuntimeError("Merging failed")
+
+        with TemporaryDirectory() as tempdir:
+            model = AutoModel.from_pretrained("__internal_testing__/tiny-random-bert", dtype="float32")
+            safe_path = os.path.join(tempdir, "safe_model")
+            model.save_pretrained(safe_path, safe_serialization="safetensors")
+
+            output_path = os.path.join(tempdir, "merged")
+            merge_config = MergeConfig(
+                merge_method="linear", model_path_list=[safe_path, safe_path], output_path=output_path, n_process=2
+            )
+            mergekit = MergeModel(merge_config)
+            with mock.patch.object(MergeModel, "shard_merge", failed_shard_merge):
+                with self.assertRaises(RuntimeError):
+                    mergekit.merge_model()
+            # the index of the incomplete shards is not saved
+            self.assertFalse(os.path.exists(os.path.join(output_path, "model.safetensors.index.json")))
@@ -0,0 +1,139 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+import unittest
+
+from paddlenlp.server.batch_scheduler import BatchScheduler
+
+
+class FakeProcessFn:
+    """Upper-cases every example and records the calls."""
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, data, parameters):
+        with self.lock:
+            self.calls.append((data, parameters))
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        text = [data["text"]] if isinstance(data["text"], str) else data["text"]
+        return {"label": [t.upper() for t in text], "batch_size": len(text)}
+
+
+class BatchSchedulerTest(unittest.TestCase):
+    def create_scheduler(self, process_fn, **kwargs):
+        scheduler = BatchScheduler(process_fn, ["label"], **kwargs)
+        self.addCleanup(scheduler.close)
+        return scheduler
+
+    def test_merge_requests(self):
+        process_fn = FakeProcessFn()
+        scheduler = self.create_scheduler(process_fn, max_batch_size=5, max_wait_ms=10000)
+        texts = ["a", ["b", "c"], "d", "e"]
+        futures = [scheduler.submit({"text": text}, {"max_seq_len": 8}) for text in texts]
+
+        results = [future.result(timeout=10) for future in futures]
+        self.assertEqual(len(process_fn.calls), 1)
+        data, parameters = process_fn.calls[0]
+        self.assertEqual(data, {"text": ["a", "b", "c", "d", "e"]})
+        self.assertEqual(parameters, {"max_seq_len": 8, "batch_size": 5})
+        # every caller gets its own examples, and the other outputs are shared
+        self.assertEqual([result["label"] for result in results], [["A"], ["B", "C"], ["D"], ["E"]])
+        self.assertEqual([result["batch_size"] for result in results], [5, 5, 5, 5])
+
+    def test_merge_text_pair(self):
+        process_fn = FakeProcessFn()
+        scheduler = self.create_scheduler(process_fn, max_batch_size=3, max_wait_ms=10000)
+        futures = [
+            scheduler.submit({"text": "a", "text_pair": "x"}, {}),
+            scheduler.submit({"text": ["b", "c"], "text_pair": ["y", "z"]}, {}),
+        ]
+
+        results = [future.result(timeout=10) for future in futures]
+        self.assertEqual(process_fn.calls[0][0], {"text": ["a", "b", "c"], "text_pair": ["x", "y", "z"]})
+        self.assertEqual([result["label"] for result in results], [["A"], ["B", "C"]])
+
+    def test_split_by_parameters(self):
+        process_fn = FakeProcessFn()
+        scheduler = self.create_scheduler(process_fn, max_batch_size=2, max_wait_ms=10000)
+        futures = [
+            scheduler.submit({"text": "a"}, {"prob_limit": 0.5}),
+            scheduler.submit({"text": "b"}, {"prob_limit": 0.9}),
+            scheduler.submit({"text": "c"}, {"prob_limit": 0.5}),
+            scheduler.submit({"text": "d"}, {"prob_limit": 0.9}),
+        ]
+
+        results = [future.result(timeout=10) for future in futures]
+        self.assertEqual([result["label"] for result in results], [["A"], ["B"], ["C"], ["D"]])
+        batches = sorted((parameters["prob_limit"], data["text"]) for data, parameters in process_fn.calls)
+        self.assertEqual(batches, [(0.5, ["a", "c"]), (0.9, ["b", "d"])])
+
+    def test_max_tokens(self):
+        process_fn = FakeProcessFn()
+        scheduler = self.create_scheduler(process_fn, max_batch_size=8, max_wait_ms=50, max_tokens=8)
+        futures = [scheduler.submit({"text": text}, {}) for text in ["aa", "bb", "cc", "dddd"]]
+
+        results = [future.result(timeout=10) for future in futures]
+        self.assertEqual([result["label"] for result in results], [["AA"], ["BB"], ["CC"], ["DDDD"]])
+        for data, _ in process_fn.calls:
+            texts = [data["text"]] if isinstance(data["text"], str) else data["text"]
+            self.assertLessEqual(len(texts) * max(len(t) for t in texts), 8)
+
+    def test_unbatchable_request(self):
+        process_fn = FakeProcessFn()
+        scheduler = self.create_scheduler(process_fn)
+        data = {"text": ["a", "b"], "label": [0, 1]}
+
+        self.assertEqual(scheduler.predict(data, None), {"label": ["A", "B"], "batch_size": 2})
+        self.assertEqual(process_fn.calls, [(data, {})])
+
+    def test_error_reaches_every_request(self):
+        error = ValueError("predict failed")
+        scheduler = self.create_scheduler(FakeProcessFn(error=error), max_batch_size=3, max_wait_ms=10000)
+        futures = [scheduler.submit({"text": text}, {}) for text in ["a", "b", "c"]]
+
+        for future in futures:
+            self.assertIs(future.exception(timeout=10), error)
+
+    def test_wrong_number_of_outputs(self):
+        def process_fn(data, parameters):
+            return {"label": ["A"]}
+
+        scheduler = self.create_scheduler(process_fn, max_batch_size=2, max_wait_ms=10000)
+        futures = [scheduler.submit({"text": text}, {}) for text in ["a", "b"]]
+
+        for future in futures:
+            with self.assertRaisesRegex(ValueError, "1 items for a batch of 2 examples"):
+                future.result(timeout=10)
+
+    def test_close_drains_requests(self):
+        process_fn = FakeProcessFn(delay=0.05)
+        scheduler = BatchScheduler(process_fn, ["label"], max_batch_size=1, num_workers=2)
+        texts = ["a", "b", "c", "d", "e", "f"]
+        futures = [scheduler.submit({"text": text}, {}) for text in texts]
+        scheduler.close()
+
+        for text, future in zip(texts, futures):
+            self.assertTrue(future.done())
+            self.assertEqual(future.result()["label"], [text.upper()])
+        self.assertEqual(len(process_fn.calls), len(texts))
+        with self.assertRaises(RuntimeError):
+            scheduler.submit({"text": "g"}, {})
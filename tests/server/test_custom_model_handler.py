@@ -0,0 +1,108 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from paddlenlp.server.handlers.custom_model_handler import (
+    _make_batches,
+    _predict_batches,
+    _process,
+)
+
+
+class StubRunner:
+    """Returns the sum and the padded length of the input ids of every example."""
+
+    def __init__(self):
+        self.batch_shapes = []
+
+    def run(self, output_names, inputs):
+        input_ids = inputs["input_ids"]
+        self.batch_shapes.append(input_ids.shape)
+        return [input_ids.sum(axis=1, keepdims=True), np.full([input_ids.shape[0], 1], input_ids.shape[1])]
+
+
+class StubPredictor:
+    _predictor_type = "onnxruntime"
+    _output_num = 2
+
+    def __init__(self):
+        self._predictor = StubRunner()
+
+
+class StubTokenizer:
+    pad_token_id = 0
+
+    def __call__(self, text, text_pair=None, max_length=None):
+        input_ids = [ord(c) for c in text + (text_pair or "")][:max_length]
+        return {"input_ids": input_ids}
+
+
+class MakeBatchesTest(unittest.TestCase):
+    def assert_all_indices(self, batches, num_examples):
+        indices = [idx for batch in batches for idx in batch]
+        self.assertEqual(sorted(indices), list(range(num_examples)))
+
+    @parameterized.expand([(0,), (1,), (7,), (32,), (100,)])
+    def test_batch_size(self, num_examples):
+        lengths = np.random.RandomState(num_examples).randint(1, 50, size=num_examples).tolist()
+        for sort_by_length in [True, False]:
+            batches = _make_batches(lengths, 8, sort_by_length=sort_by_length)
+            self.assert_all_indices(batches, num_examples)
+            self.assertEqual(len(batches), (num_examples + 7) // 8)
+            for batch in batches:
+                self.assertLessEqual(len(batch), 8)
+            if not sort_by_length:
+                self.assertEqual([idx for batch in batches for idx in batch], list(range(num_examples)))
+
+    def test_sort_by_length(self):
+        lengths = [5, 1, 5, 3, 1, 3]
+        self.assertEqual(_make_batches(lengths, 2), [[1, 4], [3, 5], [0, 2]])
+
+    @parameterized.expand([(16,), (64,), (200,)])
+    def test_max_tokens(self, max_tokens):
+        lengths = np.random.RandomState(max_tokens).randint(1, 50, size=100).tolist()
+        for sort_by_length in [True, False]:
+            batches = _make_batches(lengths, 8, max_tokens=max_tokens, sort_by_length=sort_by_length)
+            self.assert_all_indices(batches, len(lengths))
+            for batch in batches:
+                padded_size = len(batch) * max(lengths[idx] for idx in batch)
+                # an example longer than max_tokens is batched alone
+                self.assertTrue(padded_size <= max_tokens or len(batch) == 1)
+
+
+class PredictBatchesTest(unittest.TestCase):
+    def test_restore_order(self):
+        rng = np.random.RandomState(0)
+        examples = [(rng.randint(1, 100, size=rng.randint(1, 20)).tolist(),) for _ in range(37)]
+        lengths = [len(example[0]) for example in examples]
+        predictor = StubPredictor()
+
+        for batches in [_make_batches(lengths, 4), _make_batches(lengths, 4, max_tokens=40)]:
+            sums, _ = _predict_batches(predictor, examples, batches, ("input_ids",), (0,))
+            self.assertEqual(sums[:, 0].tolist(), [sum(example[0]) for example in examples])
+
+    def test_process(self):
+        text = ["a", "abcdef", "ab", "abcd", "abc", "a"]
+        predictor = StubPredictor()
+        parameters = {"batch_size": 2, "encode_cache": False}
+        output = _process(predictor, StubTokenizer(), {"text": text}, parameters, ("input_ids",), (0,))
+
+        self.assertEqual(output["logits"], [[sum(ord(c) for c in t)] for t in text])
+        # the examples of similar lengths are padded together
+        self.assertEqual(output["logits_1"], [[1], [6], [3], [6], [3], [1]])
+        self.assertEqual(predictor._predictor.batch_shapes, [(2, 1), (2, 3), (2, 6)])
@@ -0,0 +1,106 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import inspect
+import threading
+import unittest
+
+from fastapi import HTTPException
+
+from paddlenlp.server.http_router import HttpRouterManager
+from paddlenlp.server.utils import BoundedExecutor
+
+
+class FakeModelManager:
+    def __init__(self):
+        self.release = threading.Event()
+        self.release.set()
+        self.calls = []
+
+    def predict(self, data, parameters):
+        self.release.wait(10)
+        self.calls.append((data, parameters))
+        return {"label": [len(data["text"])]}
+
+    def get_metrics(self):
+        return {"queue_depth": 0, "in_flight": 0}
+
+
+class FakeApp:
+    def __init__(self, max_workers=1, max_queue_size=1, request_timeout=None):
+        self._executor = BoundedExecutor(max_workers, max_queue_size)
+        self._request_timeout = request_timeout
+        self._model_manager = FakeModelManager()
+        self.routers = []
+
+    def include_router(self, router):
+        self.routers.append(router)
+
+
+class HttpRouterManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.app = FakeApp()
+        self.addCleanup(self.app._executor.shutdown)
+        self.addCleanup(self.app._model_manager.release.set)
+        self.router_manager = HttpRouterManager(self.app)
+        self.router_manager.register_models_router("test")
+        self.routes = {(route.path, tuple(route.methods)): route for route in self.app.routers[0].routes}
+
+    def predict(self, data, timeout=None):
+        route = self.routes[("/test", ("POST",))]
+        request_model = inspect.signature(route.endpoint).parameters["inference_request"].annotation
+        inference_request = request_model(data=data, parameters={}, timeout=timeout)
+        return asyncio.run(route.endpoint(None, inference_request))
+
+    def test_predict(self):
+        self.assertEqual(self.predict({"text": "abc"}), {"result": {"label": [3]}})
+        self.assertEqual(self.app._model_manager.calls, [({"text": "abc"}, {})])
+
+    def test_metrics(self):
+        route = self.routes[("/test/metrics", ("GET",))]
+        self.assertEqual(route.endpoint(), {"queue_depth": 0, "in_flight": 0})
+
+    def test_queue_full(self):
+        self.app._model_manager.release.clear()
+        # one running and one queued request fill the executor
+        futures = [self.app._executor.submit(self.app._model_manager.predict, {"text": "a"}, {}) for _ in range(2)]
+        with self.assertRaises(HTTPException) as context:
+            self.predict({"text": "abc"})
+        self.assertEqual(context.exception.status_code, 429)
+
+        self.app._model_manager.release.set()
+        for future in futures:
+            future.result(10)
+        self.assertEqual(self.predict({"text": "abc"}), {"result": {"label": [3]}})
+
+    def test_request_timeout(self):
+        self.app._model_manager.release.clear()
+        with self.assertRaises(HTTPException) as context:
+            self.predict({"text": "abc"}, timeout=0.05)
+        self.assertEqual(context.exception.status_code, 503)
+
+    def test_default_request_timeout(self):
+        self.app._request_timeout = 0.05
+        self.app._model_manager.release.clear()
+        running = self.app._executor.submit(self.app._model_manager.predict, {"text": "a"}, {})
+        with self.assertRaises(HTTPException) as context:
+            self.predict({"text": "abc"})
+        self.assertEqual(context.exception.status_code, 503)
+
+        self.app._model_manager.release.set()
+        running.result(10)
+        # the timed out request was cancelled before it ran
+        self.app._executor.shutdown()
+        self.assertEqual(self.app._model_manager.calls, [({"text": "a"}, {})])
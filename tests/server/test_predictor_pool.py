@@ -0,0 +1,152 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from paddlenlp.server.predictor_pool import PredictorPool
+
+
+class StubPredictor:
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self.calls = []
+
+
+def predict(predictor, data, parameters=None):
+    # the pool holds the lock of the predictor while predicting
+    assert predictor._lock.locked()
+    predictor.calls.append(data)
+    return predictor.name, data
+
+
+class PredictorPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.predictors = [StubPredictor(f"predictor_{i}") for i in range(3)]
+        self.pool = PredictorPool(self.predictors)
+
+    def wait_until(self, condition, timeout=10):
+        deadline = time.time() + timeout
+        while not condition():
+            self.assertLess(time.time(), deadline, "Timeout")
+            time.sleep(0.01)
+
+    def test_empty_pool(self):
+        with self.assertRaises(ValueError):
+            PredictorPool([])
+
+    def test_dispatch_to_least_used_replica(self):
+        names = [self.pool.run(predict, i)[0] for i in range(6)]
+        self.assertEqual(names, ["predictor_0", "predictor_1", "predictor_2"] * 2)
+        self.assertEqual([len(predictor.calls) for predictor in self.predictors], [2, 2, 2])
+        self.assertEqual(len(self.pool), 3)
+        self.assertIs(self.pool[1], self.predictors[1])
+
+    def test_dispatch_to_idle_replica(self):
+        barrier = threading.Barrier(3, timeout=10)
+
+        def blocking_predict(predictor, data):
+            # the three requests can only pass the barrier together if they run on different replicas
+            barrier.wait()
+            return predict(predictor, data)
+
+        with ThreadPoolExecutor(3) as executor:
+            results = list(executor.map(lambda i: self.pool.run(blocking_predict, i), range(3)))
+        self.assertEqual(sorted(name for name, _ in results), ["predictor_0", "predictor_1", "predictor_2"])
+
+    def test_wait_for_idle_replica(self):
+        pool = PredictorPool(self.predictors[:1])
+        started, release = threading.Event(), threading.Event()
+
+        def blocking_predict(predictor, data):
+            started.set()
+            release.wait(10)
+            return predict(predictor, data)
+
+        with ThreadPoolExecutor(2) as executor:
+            first = executor.submit(pool.run, blocking_predict, "first")
+            started.wait(10)
+            second = executor.submit(pool.run, predict, "second")
+            self.wait_until(lambda: pool.get_metrics()["queue_depth"] == 1)
+            metrics = pool.get_metrics()
+            self.assertEqual(metrics["in_flight"], 1)
+            self.assertEqual(metrics["replicas"][0]["in_flight"], 1)
+            self.assertFalse(second.done())
+
+            release.set()
+            self.assertEqual(first.result(10), ("predictor_0", "first"))
+            self.assertEqual(second.result(10), ("predictor_0", "second"))
+        self.assertEqual(self.predictors[0].calls, ["first", "second"])
+        self.assertEqual(pool.get_metrics()["queue_depth"], 0)
+
+    def test_release_lock_on_error(self):
+        def failed_predict(predictor, data):
+            raise ValueError(data)
+
+        with self.assertRaisesRegex(ValueError, "bad input"):
+            self.pool.run(failed_predict, "bad input")
+        self.assertFalse(self.predictors[0]._lock.locked())
+        self.assertEqual(self.pool.run(predict, "good input"), ("predictor_1", "good input"))
+
+        metrics = self.pool.get_metrics()
+        self.assertEqual([replica["num_errors"] for replica in metrics["replicas"]], [1, 0, 0])
+        self.assertEqual(metrics["in_flight"], 0)
+
+    def test_metrics(self):
+        def slow_predict(predictor, data):
+            time.sleep(0.01)
+            return predict(predictor, data)
+
+        for i in range(4):
+            self.pool.run(slow_predict, i)
+        metrics = self.pool.get_metrics()
+
+        self.assertEqual(set(metrics.keys()), {"queue_depth", "in_flight", "wait", "replicas"})
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertEqual(metrics["in_flight"], 0)
+        self.assertEqual(set(metrics["wait"].keys()), {"mean_ms", "p50_ms", "p99_ms"})
+        self.assertEqual([replica["num_requests"] for replica in metrics["replicas"]], [2, 1, 1])
+        for replica in metrics["replicas"]:
+            self.assertEqual(replica["in_flight"], 0)
+            self.assertEqual(replica["num_errors"], 0)
+            latency = replica["latency"]
+            self.assertGreaterEqual(latency["mean_ms"], 10)
+            self.assertLessEqual(latency["p50_ms"], latency["p99_ms"])
+
+    def test_metrics_without_requests(self):
+        metrics = self.pool.get_metrics()
+        self.assertEqual(metrics["wait"], {"mean_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0})
+        for replica in metrics["replicas"]:
+            self.assertEqual(replica["num_requests"], 0)
+            self.assertEqual(replica["latency"], {"mean_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0})
+
+    def test_latency_window(self):
+        pool = PredictorPool(self.predictors[:1], latency_window=2)
+        for i in range(5):
+            pool.run(predict, i)
+        self.assertEqual(len(pool._stats[0].latencies), 2)
+        self.assertEqual(pool.get_metrics()["replicas"][0]["num_requests"], 5)
+
+    def test_warmup(self):
+        self.pool.warmup(predict, {"text": "warmup"}, {})
+
+        for predictor in self.predictors:
+            self.assertEqual(predictor.calls, [{"text": "warmup"}])
+            self.assertFalse(predictor._lock.locked())
+        # the warmup is not counted in the metrics
+        metrics = self.pool.get_metrics()
+        self.assertEqual([replica["num_requests"] for replica in metrics["replicas"]], [0, 0, 0])
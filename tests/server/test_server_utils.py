@@ -0,0 +1,73 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+import unittest
+
+from paddlenlp.server.utils import BoundedExecutor, QueueFullError
+
+
+class BoundedExecutorTest(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.executor = BoundedExecutor(max_workers=2, max_queue_size=1)
+        self.addCleanup(self.executor.shutdown)
+        self.addCleanup(self.release.set)
+
+    def blocking_task(self, value):
+        self.release.wait(10)
+        return value
+
+    def test_max_workers(self):
+        self.assertEqual(self.executor.max_workers, 2)
+        self.assertEqual(self.executor.max_queue_size, 1)
+        executor = BoundedExecutor()
+        self.addCleanup(executor.shutdown)
+        self.assertGreaterEqual(executor.max_workers, 1)
+
+    def test_queue_full(self):
+        futures = [self.executor.submit(self.blocking_task, i) for i in range(3)]
+        self.assertEqual(self.executor.num_pending, 3)
+        with self.assertRaises(QueueFullError):
+            self.executor.submit(self.blocking_task, 3)
+        self.assertEqual(self.executor.num_pending, 3)
+
+        self.release.set()
+        self.assertEqual([future.result(10) for future in futures], [0, 1, 2])
+        # the finished tasks free their places
+        self.assertEqual(self.executor.submit(self.blocking_task, 4).result(10), 4)
+        self.assertEqual(self.executor.num_pending, 0)
+
+    def test_expired_deadline(self):
+        futures = [self.executor.submit(self.blocking_task, i) for i in range(2)]
+        queued = self.executor.submit(self.blocking_task, 2, deadline=time.time() + 0.05)
+        time.sleep(0.1)
+        self.release.set()
+
+        self.assertEqual([future.result(10) for future in futures], [0, 1])
+        with self.assertRaises(TimeoutError):
+            queued.result(10)
+
+    def test_deadline_not_expired(self):
+        future = self.executor.submit(lambda: "done", deadline=time.time() + 10)
+        self.assertEqual(future.result(10), "done")
+
+    def test_task_error(self):
+        def failed_task():
+            raise ValueError("failed")
+
+        with self.assertRaisesRegex(ValueError, "failed"):
+            self.executor.submit(failed_task).result(10)
+        self.assertEqual(self.executor.num_pending, 0)
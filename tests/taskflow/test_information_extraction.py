@@ -14,6 +14,7 @@
 
 import unittest
 
+import numpy as np
 import pytest
 
 from paddlenlp import Taskflow
@@ -103,6 +104,38 @@ class TestUIETask(unittest.TestCase):
                         self.assertIn("text", relation)
                         self.assertIn("probability", relation)
 
+    def test_shared_encoding(self):
+        prompt, text = "歌手", "《告别了》是孙耀威在专辑爱的故事里面的歌曲"
+        expected = self.uie._tokenizer(
+            text=[prompt],
+            text_pair=[text],
+            truncation=True,
+            max_seq_len=self.uie._max_seq_len,
+            pad_to_max_seq_len=True,
+            return_attention_mask=True,
+            return_position_ids=True,
+            return_offsets_mapping=True,
+        )
+        self.uie._segment_cache = {}
+        try:
+            encoded_inputs = self.uie._shared_encode(prompt, text)
+            # the cached text is reused for another prompt
+            self.uie._shared_encode("所属专辑", text)
+            self.assertEqual(len(self.uie._segment_cache), 3)
+        finally:
+            self.uie._segment_cache = None
+        for key in ["input_ids", "token_type_ids", "position_ids", "attention_mask", "offset_mapping"]:
+            self.assertEqual(np.array(encoded_inputs[key][0]).tolist(), np.array(expected[key][0]).tolist())
+
+    def test_batch_stage_predict(self):
+        text = "《告别了》是孙耀威在专辑爱的故事里面的歌曲"
+        groups = [
+            [{"text": text, "bbox": None, "image": None, "prompt": "歌曲名称"}],
+            [{"text": text, "bbox": None, "image": None, "prompt": prompt} for prompt in ["歌手", "所属专辑"]],
+        ]
+        expected = [self.uie._single_stage_predict(group) for group in groups]
+        self.assertEqual(self.uie._batch_stage_predict(groups), expected)
+
     @pytest.mark.skip(reason="todo, fix it")
     def test_doc_entity_extraction(self):
         doc_path = get_tests_dir("fixtures/tests_samples/OCR/custom.jpeg")
@@ -0,0 +1,65 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import unittest
+
+from paddlenlp.taskflow.task import Task
+
+
+class LengthTask(Task):
+    """Keeps the texts of a call on the task between the stages, as many tasks do."""
+
+    def __init__(self, **kwargs):
+        super().__init__(model="length", task="length", from_hf_hub=True, **kwargs)
+
+    def _construct_model(self, model):
+        pass
+
+    def _construct_tokenizer(self, model):
+        pass
+
+    def _construct_input_spec(self):
+        pass
+
+    def _preprocess(self, inputs):
+        self._texts = inputs[0]
+        return {"lengths": [len(text) for text in self._texts]}
+
+    def _run_model(self, inputs, scale=1):
+        # give the other stages the time to process the next chunks
+        time.sleep(0.05)
+        inputs["lengths"] = [length * scale for length in inputs["lengths"]]
+        return inputs
+
+    def _postprocess(self, inputs):
+        return [{"text": text, "length": length} for text, length in zip(self._texts, inputs["lengths"])]
+
+
+class TestTask(unittest.TestCase):
+    def test_stream(self):
+        task = LengthTask()
+        texts = ["a" * i for i in range(1, 20)]
+        expected = task((texts,), scale=2)
+        self.assertEqual(list(task.stream(iter(texts), chunk_size=2, scale=2)), expected)
+        self.assertEqual(list(task.stream(iter(texts), chunk_size=len(texts) + 1, scale=2)), expected)
+        self.assertEqual(list(task.stream(iter([]))), [])
+
+    def test_stream_error(self):
+        def texts():
+            yield "a"
+            raise ValueError("broken input")
+
+        with self.assertRaises(ValueError):
+            list(LengthTask().stream(texts(), chunk_size=1))
@@ -0,0 +1,159 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from paddlenlp.taskflow.utils import (
+    AhoCorasick,
+    BurkhardKellerTree,
+    Customization,
+    TriedTree,
+    batch_viterbi_decode,
+    levenstein_distance,
+    viterbi_decode,
+)
+
+
+class TestAhoCorasick(unittest.TestCase):
+    def test_search(self):
+        tree = TriedTree()
+        for word in ["ab", "abc", "bcd", "c", "da"]:
+            tree.add_word(word)
+        self.assertEqual(sorted(tree.iter_matches("abcda")), [(0, 2), (0, 3), (1, 4), (2, 3), (3, 5)])
+        # the matches whose ends do not exceed the previous match are skipped
+        self.assertEqual(tree.search("abcda"), [(0, 2), (0, 3), (1, 4), (3, 5)])
+        self.assertEqual(tree.search("xyz"), [])
+
+    def test_save_and_load(self):
+        automaton = AhoCorasick(["北京", "北京大学", "大学生"])
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = os.path.join(tempdir, "ac.npz")
+            automaton.save(path)
+            loaded = AhoCorasick.load(path)
+        query = "北京大学生活"
+        self.assertEqual(loaded.search(query), automaton.search(query))
+        self.assertEqual(loaded.search(query), [(0, 2), (0, 4), (2, 5)])
+        with self.assertRaises(ValueError):
+            loaded.add_word("生活")
+
+    def test_customization_cache(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            dict_path = os.path.join(tempdir, "user_dict.txt")
+            cache_path = os.path.join(tempdir, "user_dict.npz")
+            with open(dict_path, "w", encoding="utf8") as f:
+                f.write("苹果/n 公司/nt\n上海/LOC\n")
+            custom = Customization()
+            custom.load_customization(dict_path, cache_path=cache_path)
+            self.assertTrue(os.path.exists(cache_path))
+
+            cached = Customization()
+            cached.load_customization(dict_path, cache_path=cache_path)
+        self.assertEqual(cached.dictitem, {"苹果公司": [["n", "nt"], [2, 4]], "上海": [["LOC"], [2]]})
+        lac_tags = ["O"] * 6
+        cached.parse_customization("在苹果公司上", lac_tags, prefix=True)
+        self.assertEqual(lac_tags, ["O", "B-n", "I-n", "B-nt", "I-nt", "B"])
+
+
+class TestBurkhardKellerTree(unittest.TestCase):
+    def test_levenstein_distance(self):
+        self.assertEqual(levenstein_distance("kitten", "sitting"), 3)
+        self.assertEqual(levenstein_distance("", "abc"), 3)
+        self.assertEqual(levenstein_distance("abc", "abc"), 0)
+        # longer than a machine word
+        self.assertEqual(levenstein_distance("a" * 100, "a" * 98 + "bc"), 2)
+
+    def test_search_similar_word(self):
+        words = ["book", "books", "cake", "boo", "boon", "cook", "cape", "cart"]
+        tree = BurkhardKellerTree()
+        for word in words:
+            tree.add(word)
+        self.assertEqual(tree.search_similar_word("book", threshold=1)[0], ("book", 0))
+        self.assertEqual(
+            sorted(tree.search_similar_word("bok", threshold=2)),
+            sorted(
+                (word, levenstein_distance(word, "bok")) for word in words if levenstein_distance(word, "bok") <= 2
+            ),
+        )
+        self.assertEqual(tree.search_similar_words(["caku", "caku"], threshold=1), [[("cake", 1)], [("cake", 1)]])
+
+    def test_save_and_load(self):
+        tree = BurkhardKellerTree()
+        for word in ["北京", "北京市", "南京", "东京", "北海"]:
+            tree.add(word)
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = os.path.join(tempdir, "bktree.json")
+            tree.save(path)
+            loaded = BurkhardKellerTree.load(path)
+        self.assertEqual(loaded.search_similar_word("北京"), tree.search_similar_word("北京"))
+        self.assertEqual(set(loaded.nodes), set(tree.nodes))
+
+
+def reference_viterbi_decode(logits):
+    """The per-step Viterbi decoding that `batch_viterbi_decode` replaced, returns the score and the path."""
+    np_logits = np.array(logits, dtype="float64")
+    length, dim = np_logits.shape
+    f = np.zeros(np_logits.shape)
+    path = [["" for i in range(dim)] for j in range(length)]
+    label_scheme = "OIB"
+    illegal = np.array([[0, -1, 0, -1, 0], [0, 0, 0, -1, 0], [0, 0, 0, 0, 0], [0, -1, 0, 0, 0], [-1, -1, -1, -1, -1]])
+    illegal = illegal * 1000
+
+    f[0, :] = np_logits[0, :] + illegal[3, :3]
+    path[0] = [label_scheme[i] for i in range(dim)]
+
+    for step in range(1, length):
+        last_s = f[step - 1, :]
+        for d in range(dim):
+            cand_score = illegal[:3, d] + last_s + np_logits[step, d]
+            f[step, d] = np.max(cand_score)
+            path[step][d] = path[step - 1][np.argmax(cand_score)] + label_scheme[d]
+    return np.max(f[-1, :]), path[-1][np.argmax(f[-1, :])]
+
+
+class TestViterbiDecode(unittest.TestCase):
+    def test_viterbi_decode(self):
+        # O, I, B
+        logits = [[0.0, 5.0, 1.0], [0.0, 5.0, 1.0], [3.0, 0.0, 1.0], [0.0, 0.0, 2.0], [0.0, 4.0, 0.0]]
+        # a path can not start with I or go from O to I
+        self.assertEqual(viterbi_decode(logits), "BIOBI")
+
+    def test_compare_with_reference(self):
+        rng = np.random.RandomState(0)
+        for _ in range(50):
+            length = rng.randint(1, 30)
+            # the integer logits have many ties between the paths
+            for logits in [rng.randn(length, 3), rng.randint(0, 3, size=[length, 3]).astype("float64")]:
+                _, expected = reference_viterbi_decode(logits)
+                self.assertEqual(viterbi_decode(logits), expected)
+                self.assertEqual(viterbi_decode(logits.tolist()), expected)
+
+    def test_batch_viterbi_decode(self):
+        rng = np.random.RandomState(0)
+        for logits in [rng.randn(4, 20, 3).astype("float32"), rng.randint(0, 2, size=[4, 20, 3]).astype("float32")]:
+            lengths = np.array([20, 7, 1, 13])
+            scores, paths = batch_viterbi_decode(logits, lengths)
+            for i, length in enumerate(lengths):
+                expected_score, expected_path = reference_viterbi_decode(logits[i, :length])
+                self.assertEqual("".join("OIB"[label] for label in paths[i, :length]), expected_path)
+                self.assertAlmostEqual(scores[i], expected_score, places=4)
+                self.assertTrue((paths[i, length:] == 0).all())
+
+        logits = rng.randn(4, 20, 3).astype("float32")
+        scores, paths = batch_viterbi_decode(logits, transitions=np.zeros([3, 3]), start_transitions=np.zeros([3]))
+        np.testing.assert_array_equal(paths, logits.argmax(axis=-1))
+        np.testing.assert_allclose(scores, logits.max(axis=-1).sum(axis=-1), rtol=1e-5)
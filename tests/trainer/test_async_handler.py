@@ -0,0 +1,174 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import signal
+import struct
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+import paddle
+from safetensors import safe_open
+from safetensors.numpy import load_file, save_file
+
+from paddlenlp.trainer.unified_checkpoint.async_handler import (
+    AsyncCheckpointHandler,
+    ShmRingSaver,
+)
+from paddlenlp.trainer.unified_checkpoint.shared_memory_utils import (
+    create_safetensors_header,
+    is_streamable_state_dict,
+)
+
+
+def get_state_dict(seed):
+    rng = np.random.default_rng(seed)
+    return {
+        # larger than a slot, split over several slots
+        "linear.weight": paddle.to_tensor(rng.standard_normal([37, 11]).astype("float32")),
+        "linear.bias": paddle.to_tensor(rng.standard_normal([11]).astype("float32")),
+        "embedding.weight": paddle.to_tensor(rng.standard_normal([23, 5]).astype("float16")),
+        "empty": paddle.zeros([0, 3], dtype="float32"),
+        "step": np.array([seed], dtype=np.int64),
+        # 8-byte elements do not fill the 100-byte slots exactly
+        "moment": rng.standard_normal([29]),
+        "mask": rng.random([13]) > 0.5,
+    }
+
+
+def to_numpy(state_dict):
+    return {key: value.numpy() if paddle.is_tensor(value) else value for key, value in state_dict.items()}
+
+
+class ShmRingSaverTest(unittest.TestCase):
+    def assert_state_dict_equal(self, loaded, expected):
+        self.assertEqual(set(loaded.keys()), set(expected.keys()))
+        for key, value in expected.items():
+            self.assertEqual(loaded[key].dtype, value.dtype, key)
+            np.testing.assert_array_equal(loaded[key], value, err_msg=key)
+
+    def test_create_safetensors_header(self):
+        state_dict = to_numpy(get_state_dict(0))
+        header = create_safetensors_header(state_dict, {"format": "np"})
+        header_size = struct.unpack("<Q", header[:8])[0]
+        self.assertEqual(len(header), 8 + header_size)
+        self.assertEqual(header_size % 8, 0)
+
+        header = json.loads(header[8:])
+        self.assertEqual(header.pop("__metadata__"), {"format": "np"})
+        self.assertEqual(list(header.keys()), list(state_dict.keys()))
+        offset = 0
+        for key, value in state_dict.items():
+            self.assertEqual(header[key]["shape"], list(value.shape))
+            self.assertEqual(header[key]["data_offsets"], [offset, offset + value.nbytes])
+            offset += value.nbytes
+
+    def test_is_streamable_state_dict(self):
+        self.assertTrue(is_streamable_state_dict(get_state_dict(0)))
+        self.assertTrue(is_streamable_state_dict({"weight": paddle.to_tensor([1.0]).astype("bfloat16")}))
+        self.assertFalse(is_streamable_state_dict({"weight": paddle.to_tensor([1 + 2j], dtype="complex64")}))
+        self.assertFalse(is_streamable_state_dict({"nested": {"weight": paddle.to_tensor([1.0])}}))
+        self.assertFalse(is_streamable_state_dict({"lr": 0.1}))
+
+    def test_round_trip(self):
+        saver = ShmRingSaver("model_weight", 0, slot_size=100)
+        try:
+            with tempfile.TemporaryDirectory() as tempdir:
+                # the saver is reused for several state dicts, as in training
+                for seed in range(3):
+                    state_dict = get_state_dict(seed)
+                    expected = to_numpy(state_dict)
+                    path = os.path.join(tempdir, f"model_{seed}.safetensors")
+                    saver.save(state_dict, path, tempdir)
+                    saver.wait()
+
+                    loaded = load_file(path)
+                    self.assert_state_dict_equal(loaded, expected)
+                    with safe_open(path, framework="np") as f:
+                        self.assertEqual(f.metadata(), {"format": "np"})
+                    self.assertTrue(os.path.exists(os.path.join(tempdir, ".model_weight.done.0")))
+
+                    reference_path = os.path.join(tempdir, f"reference_{seed}.safetensors")
+                    save_file(expected, reference_path, metadata={"format": "np"})
+                    reference = load_file(reference_path)
+                    self.assertEqual(set(loaded.keys()), set(reference.keys()))
+                    for key, value in reference.items():
+                        np.testing.assert_array_equal(loaded[key], value, err_msg=key)
+                    os.remove(os.path.join(tempdir, ".model_weight.done.0"))
+        finally:
+            saver.close()
+        self.assertFalse(saver.process.is_alive())
+
+    def test_staging_does_not_wait_for_writer(self):
+        saver = ShmRingSaver("model_weight", 0, slot_size=100)
+        try:
+            with tempfile.TemporaryDirectory() as tempdir:
+                state_dict = get_state_dict(0)
+                expected = to_numpy(state_dict)
+                path = os.path.join(tempdir, "model.safetensors")
+                # the stopped writer cannot hand back any slot, the state dict is staged into new slots
+                os.kill(saver.process.pid, signal.SIGSTOP)
+                try:
+                    saver.save(state_dict, path, tempdir)
+                finally:
+                    os.kill(saver.process.pid, signal.SIGCONT)
+                staged_bytes = sum(value.nbytes for value in expected.values())
+                self.assertGreaterEqual(len(saver.slots) * saver.slot_size, staged_bytes)
+                saver.wait()
+                self.assert_state_dict_equal(load_file(path), expected)
+        finally:
+            saver.close()
+
+    def test_max_slots(self):
+        saver = ShmRingSaver("model_weight", 0, slot_size=100, max_slots=2)
+        try:
+            with tempfile.TemporaryDirectory() as tempdir:
+                state_dict = get_state_dict(0)
+                expected = to_numpy(state_dict)
+                path = os.path.join(tempdir, "model.safetensors")
+                saver.save(state_dict, path, tempdir)
+                saver.wait()
+                self.assertLessEqual(len(saver.slots), 2)
+                self.assert_state_dict_equal(load_file(path), expected)
+        finally:
+            saver.close()
+
+    def test_fallback(self):
+        args = SimpleNamespace(
+            unified_checkpoint_config=["async_save", "async_save_stream"], async_save_stream_buffer_size=1
+        )
+        handler = AsyncCheckpointHandler(args)
+        state_dict = {
+            "weight": paddle.to_tensor(np.arange(6, dtype=np.float32).reshape([2, 3])),
+            "weight.complex": paddle.to_tensor(np.array([1 + 2j, 3 - 4j], dtype=np.complex64)),
+        }
+        expected = to_numpy(state_dict)
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = os.path.join(tempdir, "model.safetensors")
+            handler._file_save_async_or_sync(
+                state_dict, path, signal_path=tempdir, is_sync=False, state_dict_type="model_weight"
+            )
+            # the complex tensor cannot be streamed, so the full copy path saved the state dict
+            self.assertEqual(handler._ring_savers, {})
+            self.assertIsNotNone(handler._shm_model_weight)
+            handler.unlink_shared_memory()
+
+            self.assertTrue(os.path.exists(os.path.join(tempdir, f".model_weight.done.{handler.global_rank}")))
+            loaded = load_file(path)
+            self.assertEqual(set(loaded.keys()), set(expected.keys()))
+            for key, value in expected.items():
+                np.testing.assert_array_equal(loaded[key], value, err_msg=key)
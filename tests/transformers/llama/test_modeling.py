@@ -287,6 +287,24 @@ class LlamaModelTester:
         else:
             self.parent.assertEqual(result[0].shape, [self.batch_size, self.seq_length, self.vocab_size])
 
+    def create_and_check_static_cache_generation(self, config, input_ids, input_mask, *args):
+        model = LlamaForCausalLM(config)
+        model.eval()
+        attention_mask = paddle.ones_like(input_ids, dtype="int64")
+        attention_mask[0, :2] = 0
+
+        expected_ids, _ = model.generate(
+            input_ids, attention_mask=attention_mask, decode_strategy="greedy_search", max_new_tokens=5
+        )
+        ids, _ = model.generate(
+            input_ids,
+            attention_mask=attention_mask,
+            decode_strategy="greedy_search",
+            max_new_tokens=5,
+            cache_implementation="static",
+        )
+        self.parent.assertEqual(ids.tolist(), expected_ids.tolist())
+
 
 class LlamaModelTest(ModelTesterMixin, GenerationTesterMixin, unittest.TestCase):
     base_model_class = LlamaModel
@@ -340,6 +358,10 @@ class LlamaModelTest(ModelTesterMixin, GenerationTesterMixin, unittest.TestCase)
         config_and_inputs = self.model_tester.prepare_config_and_inputs()
         self.model_tester.create_and_check_gqa_model(*config_and_inputs)
 
+    def test_llama_static_cache_generation(self):
+        config_and_inputs = self.model_tester.prepare_config_and_inputs()
+        self.model_tester.create_and_check_static_cache_generation(*config_and_inputs)
+
 
 class LlamaModelIntegrationTest(ModelTesterPretrainedMixin, unittest.TestCase):
     base_model_class = LlamaModel
@@ -19,7 +19,11 @@ import unittest
 import numpy as np
 from safetensors.numpy import load_file, save_file
 
-from paddlenlp.utils.safetensors import fast_load_file, fast_safe_open
+from paddlenlp.utils.safetensors import (
+    SafeTensorsWriter,
+    fast_load_file,
+    fast_safe_open,
+)
 
 from ..testing_utils import skip_platform
 
@@ -69,3 +73,50 @@ class FastSafetensors(unittest.TestCase):
                     np.testing.assert_equal(self.weigth_map[key][..., 1], safe_slice[..., 1])
                     np.testing.assert_equal(self.weigth_map[key][:2, ...], safe_slice[:2, ...])
                     np.testing.assert_equal(self.weigth_map[key][..., :4], safe_slice[..., :4])
+
+    @skip_platform("win32", "cygwin")
+    def test_mmap_mode(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            path = os.path.join(tmpdirname, "test.safetensors")
+            save_file(self.weigth_map, path, metadata={"format": "np"})
+
+            for mmap_mode in ["r", "c"]:
+                fs_sf_load = fast_load_file(path, mmap_mode=mmap_mode)
+                for k, v in self.weigth_map.items():
+                    np.testing.assert_equal(v, fs_sf_load[k])
+                    # the arrays are backed by the mapped file
+                    self.assertFalse(fs_sf_load[k].flags.owndata)
+                    self.assertEqual(fs_sf_load[k].flags.writeable, mmap_mode == "c")
+
+                with fast_safe_open(path, framework="np", mmap_mode=mmap_mode) as f:
+                    for key in f.keys():
+                        safe_slice = f.get_slice(key)
+                        np.testing.assert_equal(self.weigth_map[key][:], safe_slice[:])
+                        np.testing.assert_equal(self.weigth_map[key][:2, ...], safe_slice[:2, ...])
+                        np.testing.assert_equal(self.weigth_map[key][..., 1], safe_slice[..., 1])
+
+            # writing to the copy-on-write arrays does not change the file
+            fs_sf_load["weight_0"][...] = 0
+            np.testing.assert_equal(self.weigth_map["weight_0"], fast_load_file(path)["weight_0"])
+
+    @skip_platform("win32", "cygwin")
+    def test_safetensors_writer(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            path = os.path.join(tmpdirname, "test.safetensors")
+            tensor_infos = {k: (v.dtype, v.shape) for k, v in self.weigth_map.items()}
+            with SafeTensorsWriter(path, tensor_infos, metadata={"format": "np"}) as writer:
+                for k, v in self.weigth_map.items():
+                    writer.write(k, v)
+            sf_load = load_file(path)
+            fs_sf_load = fast_load_file(path)
+            for k, v in self.weigth_map.items():
+                np.testing.assert_equal(v, sf_load[k])
+                np.testing.assert_equal(v, fs_sf_load[k])
+
+            # the tensors should be written in the order of the header
+            with self.assertRaises(ValueError):
+                with SafeTensorsWriter(path, tensor_infos) as writer:
+                    writer.write("weight_1", self.weigth_map["weight_1"])
+            with self.assertRaises(ValueError):
+                with SafeTensorsWriter(path, tensor_infos) as writer:
+                    writer.write("weight_0", self.weigth_map["weight_0"])
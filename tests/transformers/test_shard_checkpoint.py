@@ -14,8 +14,10 @@
 
 import json
 import os
+import sys
 import tempfile
 import unittest
+from unittest import mock
 
 import paddle
 
@@ -26,7 +28,11 @@ from paddlenlp.transformers import (
     PretrainedModel,
     register_base_model,
 )
-from paddlenlp.transformers.model_utils import load_sharded_checkpoint, shard_checkpoint
+from paddlenlp.transformers.model_utils import (
+    ShardLoader,
+    load_sharded_checkpoint,
+    shard_checkpoint,
+)
 from paddlenlp.utils.env import (
     PADDLE_WEIGHTS_INDEX_NAME,
     PADDLE_WEIGHTS_NAME,
@@ -352,6 +358,48 @@ class TestShardCheckpoint(unittest.TestCase):
         for p1, p2 in zip(model.parameters(), new_model.parameters()):
             self.assertTrue(paddle.allclose(p1, p2))
 
+    def test_shard_loader(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            shard_files = []
+            for i in range(5):
+                shard_file = os.path.join(tmp_dir, f"model-0000{i + 1}-of-00005.safetensors")
+                with open(shard_file, "wb") as f:
+                    f.write(b"0" * 100 * (i + 1))
+                shard_files.append(shard_file)
+
+            for num_workers, max_inflight_bytes in [(0, None), (1, None), (3, None), (3, 300), (3, 1)]:
+                loader = ShardLoader(
+                    shard_files, os.path.basename, num_workers=num_workers, max_inflight_bytes=max_inflight_bytes
+                )
+                self.assertEqual(list(loader), [(f, os.path.basename(f)) for f in shard_files])
+                self.assertEqual([stats["bytes"] for stats in loader.stats], [100, 200, 300, 400, 500])
+            # the shards are loaded inline by default
+            self.assertEqual(ShardLoader(shard_files, os.path.basename).num_workers, 0)
+
+    def test_checkpoint_sharding_local_safe_parallel(self):
+        model = BertModel.from_pretrained("__internal_testing__/tiny-random-bert")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            model.save_pretrained(tmp_dir, max_shard_size="50kB", safe_serialization=True)
+            env = {"LOAD_SHARDS_THREAD_NUM": "3", "LOAD_SHARDS_MAX_INFLIGHT_GB": "0.0001"}
+            with mock.patch.dict(os.environ, env):
+                new_model = BertModel.from_pretrained(tmp_dir)
+
+        for p1, p2 in zip(model.parameters(), new_model.parameters()):
+            self.assertTrue(paddle.allclose(p1, p2))
+
+    @unittest.skipIf(sys.platform.startswith("win"), "mmap_mode is not supported on Windows")
+    def test_checkpoint_mmap_mode(self):
+        model = BertModel.from_pretrained("__internal_testing__/tiny-random-bert")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for max_shard_size in ["10GB", "50kB"]:
+                save_dir = os.path.join(tmp_dir, max_shard_size)
+                model.save_pretrained(save_dir, max_shard_size=max_shard_size, safe_serialization=True)
+                new_model = BertModel.from_pretrained(save_dir, mmap_mode="c")
+                for p1, p2 in zip(model.parameters(), new_model.parameters()):
+                    self.assertTrue(paddle.allclose(p1, p2))
+
     def test_checkpoint_variant_hub(self):
         with tempfile.TemporaryDirectory() as tmp_dir:
             with self.assertRaises(EnvironmentError):
@@ -13,13 +13,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import gc
 import json
 import os
 import tempfile
 import unittest
+from unittest import mock
 
-from paddlenlp.transformers import BertTokenizer
-from paddlenlp.transformers.tokenizer_utils import PretrainedTokenizer
+from paddlenlp.transformers import BertTokenizer, tokenizer_utils
+from paddlenlp.transformers.tokenizer_utils import (
+    BPECache,
+    PretrainedTokenizer,
+    bpe_merge,
+)
 from paddlenlp.utils.env import TOKENIZER_CONFIG_NAME
 
 
@@ -60,3 +66,69 @@ class TokenizerUtilsTest(unittest.TestCase):
             self.assertTrue(os.path.exists(os.path.join(tempdir, model_name, TOKENIZER_CONFIG_NAME)))
             # check against double appending model_name in cache_dir
             self.assertFalse(os.path.exists(os.path.join(tempdir, model_name, model_name)))
+
+    def test_parallel_batch_encode(self):
+        tokenizer = BertTokenizer.from_pretrained("__internal_testing__/tiny-random-bert")
+        texts = ["hello world", "a much longer sentence for the test", "short", "another sentence here"] * 4
+        text_pairs = [(text, text[::-1]) for text in texts]
+
+        for batch, kwargs in [
+            (texts, dict(padding=True, return_offsets_mapping=True)),
+            (text_pairs, dict(padding="max_length", max_length=16, truncation=True)),
+            (text_pairs, dict(max_length=12, stride=2, return_overflowing_tokens=True)),
+        ]:
+            expected = tokenizer(batch, **kwargs)
+            with mock.patch.object(tokenizer_utils, "MIN_PARALLEL_ENCODE_BATCH_SIZE", 2):
+                outputs = tokenizer(batch, num_workers=2, **kwargs)
+            self.assertEqual(dict(outputs), dict(expected))
+
+        # the small batches are encoded without starting the processes
+        with mock.patch.object(tokenizer_utils, "_get_encode_pool", side_effect=AssertionError):
+            self.assertEqual(dict(tokenizer(texts, num_workers=2)), dict(tokenizer(texts)))
+
+    def test_parallel_batch_encode_pool(self):
+        tokenizer = BertTokenizer.from_pretrained("__internal_testing__/tiny-random-bert")
+        texts = ["hello world", "a much longer sentence for the test", "short", "another sentence here"] * 4
+
+        with mock.patch.object(tokenizer_utils, "MIN_PARALLEL_ENCODE_BATCH_SIZE", 2), mock.patch.object(
+            tokenizer_utils, "ProcessPoolExecutor", wraps=tokenizer_utils.ProcessPoolExecutor
+        ) as executor_cls:
+            # the pool of the tokenizer is reused by the following calls
+            for _ in range(3):
+                self.assertEqual(dict(tokenizer(texts, num_workers=2)), dict(tokenizer(texts)))
+            self.assertEqual(executor_cls.call_count, 1)
+
+            # the workers are restarted with the new vocabulary
+            tokenizer.add_tokens(["[NEW]"])
+            texts = [text + " [NEW]" for text in texts]
+            self.assertEqual(dict(tokenizer(texts, num_workers=2)), dict(tokenizer(texts)))
+            self.assertEqual(executor_cls.call_count, 2)
+
+        # the pool is shut down with the tokenizer
+        executor = tokenizer_utils._encode_pools[tokenizer][1]
+        del tokenizer
+        gc.collect()
+        with self.assertRaises(RuntimeError):
+            executor.submit(len, [])
+
+
+class BPEUtilsTest(unittest.TestCase):
+    def test_bpe_merge(self):
+        bpe_ranks = {("l", "o"): 0, ("lo", "w"): 1, ("e", "r"): 2, ("a", "a"): 3}
+        self.assertEqual(bpe_merge(tuple("lower"), bpe_ranks), ("low", "er"))
+        self.assertEqual(bpe_merge(tuple("lowlow"), bpe_ranks), ("low", "low"))
+        # occurrences are merged from left to right without overlapping
+        self.assertEqual(bpe_merge(tuple("aaa"), bpe_ranks), ("aa", "a"))
+        self.assertEqual(bpe_merge(tuple("x"), bpe_ranks), ("x",))
+
+    def test_bpe_cache(self):
+        cache = BPECache(maxsize=2)
+        cache["a"] = "a"
+        cache["b"] = "b"
+        self.assertEqual(cache.get("a"), "a")
+        cache["c"] = "c"
+
+        # "b" is the least recently used one
+        self.assertNotIn("b", cache)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.cache_info(), {"hits": 1, "misses": 1, "maxsize": 2, "currsize": 2})
@@ -15,8 +15,11 @@
 from __future__ import annotations
 
 import hashlib
+import json
 import os
+import threading
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from tempfile import TemporaryDirectory
 
 
@@ -60,3 +63,122 @@ class LockFileTest(unittest.TestCase):
             _ = os.open(lock_file_path, open_mode)
             config_file = get_path_from_url_with_filelock(self.test_url, root_dir=tempdir)
             self.assertIsNotNone(config_file)
+
+
+class RangeRequestHandler(BaseHTTPRequestHandler):
+    """Serves `server.content` at any path, with range requests if `server.accept_ranges` is True."""
+
+    def log_message(self, *args):
+        pass
+
+    def send_file_headers(self, status, length, content_range=None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(length))
+        self.send_header("ETag", '"v1"')
+        if self.server.accept_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        if content_range is not None:
+            self.send_header("Content-Range", content_range)
+        self.end_headers()
+
+    def do_HEAD(self):
+        self.send_file_headers(200, len(self.server.content))
+
+    def do_GET(self):
+        content = self.server.content
+        start, end = 0, len(content)
+        range_header = self.headers.get("Range")
+        if self.server.accept_ranges and range_header is not None:
+            start, end = range_header[len("bytes=") :].split("-")
+            start, end = int(start), int(end) + 1 if end else len(content)
+            self.send_file_headers(206, end - start, f"bytes {start}-{end - 1}/{len(content)}")
+        else:
+            self.send_file_headers(200, len(content))
+        with self.server.lock:
+            self.server.requests.append((start, end))
+            fail = start in self.server.fail_starts
+            self.server.fail_starts.discard(start)
+        # a failed request sends half of the body and closes the connection
+        self.wfile.write(content[start : (start + end) // 2 if fail else end])
+
+
+class DownloadFileTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), RangeRequestHandler)
+        self.server.content = os.urandom(3 * 1024 * 1024 + 123)
+        self.server.accept_ranges = True
+        self.server.fail_starts = set()
+        self.server.requests = []
+        self.server.lock = threading.Lock()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/model_state.pdparams"
+        self.md5sum = hashlib.md5(self.server.content).hexdigest()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_parallel_download(self):
+        from paddlenlp.utils.downloader import download_file
+
+        with TemporaryDirectory() as tempdir:
+            fullname = os.path.join(tempdir, "model_state.pdparams")
+            download_file(self.url, fullname, md5sum=self.md5sum, num_threads=4, part_size=256 * 1024)
+            with open(fullname, "rb") as f:
+                self.assertEqual(f.read(), self.server.content)
+            self.assertEqual(len(self.server.requests), 13)
+            self.assertEqual(os.listdir(tempdir), ["model_state.pdparams"])
+
+    def test_resume_download(self):
+        from paddlenlp.utils.downloader import download_file
+
+        part_size = 256 * 1024
+        self.server.fail_starts = {3 * part_size}
+        with TemporaryDirectory() as tempdir:
+            fullname = os.path.join(tempdir, "model_state.pdparams")
+            with self.assertRaises(IOError):
+                download_file(self.url, fullname, md5sum=self.md5sum, num_threads=4, part_size=part_size)
+            with open(fullname + "_tmp.json") as f:
+                finished = json.load(f)["parts"]
+            self.assertNotIn(3, finished)
+
+            self.server.requests = []
+            download_file(self.url, fullname, md5sum=self.md5sum, num_threads=4, part_size=part_size)
+            with open(fullname, "rb") as f:
+                self.assertEqual(f.read(), self.server.content)
+            # only the unfinished parts are downloaded again
+            self.assertEqual(len(self.server.requests), 13 - len(finished))
+
+    def test_stream_download(self):
+        from paddlenlp.utils.downloader import download_file
+
+        self.server.fail_starts = {0}
+        with TemporaryDirectory() as tempdir:
+            fullname = os.path.join(tempdir, "model_state.pdparams")
+            with self.assertRaises(IOError):
+                download_file(self.url, fullname, num_threads=1)
+            download_file(self.url, fullname, md5sum=self.md5sum, num_threads=1)
+            with open(fullname, "rb") as f:
+                self.assertEqual(f.read(), self.server.content)
+            # resumed from the end of the partial file
+            self.assertGreater(self.server.requests[-1][0], 0)
+
+    def test_download_without_range(self):
+        from paddlenlp.utils.downloader import _download
+
+        self.server.accept_ranges = False
+        self.server.fail_starts = {0}
+        with TemporaryDirectory() as tempdir:
+            fullname = _download(self.url, tempdir, md5sum=self.md5sum)
+            with open(fullname, "rb") as f:
+                self.assertEqual(f.read(), self.server.content)
+            self.assertEqual(self.server.requests, [(0, len(self.server.content))] * 2)
+
+    def test_md5_mismatch(self):
+        from paddlenlp.utils.downloader import download_file
+
+        with TemporaryDirectory() as tempdir:
+            fullname = os.path.join(tempdir, "model_state.pdparams")
+            with self.assertRaises(IOError):
+                download_file(self.url, fullname, md5sum="0" * 32, num_threads=4, part_size=256 * 1024)
+            self.assertEqual(os.listdir(tempdir), [])
@@ -0,0 +1,132 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib
+import inspect
+import os
+import pkgutil
+import subprocess
+import sys
+import textwrap
+import unittest
+
+import paddlenlp
+from paddlenlp import transformers
+
+PUBLIC_MODEL_SUBMODULES = {
+    "configuration",
+    "modeling",
+    "tokenizer",
+    "processing",
+    "image_processing",
+    "feature_extraction",
+}
+
+
+class LazyImportTest(unittest.TestCase):
+    def run_python(self, code, lazy=True):
+        env = dict(os.environ, PADDLENLP_LAZY_IMPORT="1" if lazy else "0")
+        subprocess.run([sys.executable, "-c", textwrap.dedent(code)], env=env, check=True)
+
+    def test_import_on_access(self):
+        self.run_python(
+            """
+            import sys
+            import paddlenlp
+            assert "paddlenlp.transformers.llama.modeling" not in sys.modules
+            assert "paddlenlp.taskflow" not in sys.modules
+
+            from paddlenlp.transformers import LlamaForCausalLM
+            assert "paddlenlp.transformers.llama.modeling" in sys.modules
+            assert "paddlenlp.transformers.bert.modeling" not in sys.modules
+            assert paddlenlp.transformers.LlamaForCausalLM is LlamaForCausalLM
+            """
+        )
+
+    def test_eager_import(self):
+        self.run_python(
+            """
+            import sys
+            import paddlenlp
+            assert "paddlenlp.transformers.bert.modeling" in sys.modules
+            assert "paddlenlp.taskflow" in sys.modules
+            """,
+            lazy=False,
+        )
+
+    def test_paddle_patches(self):
+        for lazy in [True, False]:
+            self.run_python(
+                """
+                import sys
+                import paddle
+                import paddlenlp
+
+                nn = paddle.nn
+                assert "paddlenlp.transformers.model_outputs" in sys.modules
+                # model_outputs has been imported, so importing it again does not patch again
+                from paddlenlp.transformers import model_outputs
+
+                assert nn.TransformerEncoder.forward is model_outputs._transformer_encoder_fwd
+                assert nn.TransformerDecoder.forward is model_outputs._transformer_decoder_fwd
+                assert nn.TransformerEncoderLayer.forward is model_outputs._transformer_encoder_layer_fwd
+                assert nn.TransformerDecoderLayer.forward is model_outputs._transformer_decoder_layer_fwd
+                assert nn.TransformerEncoder.__init__.__wrapped__ is model_outputs._encoder_init
+                assert nn.TransformerDecoder.__init__.__wrapped__ is model_outputs._decoder_init
+                for cls in [nn.TransformerEncoderLayer, nn.TransformerEncoder, nn.TransformerDecoder]:
+                    assert hasattr(cls.__setattr__, "__wrapped__"), cls
+                """,
+                lazy=lazy,
+            )
+
+    def test_transformers_all(self):
+        for submodule, names in transformers.import_structure.items():
+            module = importlib.import_module("paddlenlp.transformers." + submodule)
+            if hasattr(module, "__all__"):
+                for name in module.__all__:
+                    self.assertIn(name, dir(transformers))
+            for name in names:
+                self.assertIn(name, transformers.__all__)
+                value = getattr(module, name)
+                self.assertIs(getattr(transformers, name), value)
+                # the modules and names imported by the submodules are not exported
+                self.assertFalse(inspect.ismodule(value), name)
+                if inspect.isclass(value) or inspect.isfunction(value):
+                    self.assertTrue(value.__module__.startswith("paddlenlp."), name)
+
+    def test_transformers_model_packages(self):
+        # every model package is exported, either as a whole or by its public submodules
+        for package in pkgutil.iter_modules(transformers.__path__):
+            if not package.ispkg:
+                continue
+            submodules = {
+                info.name for info in pkgutil.iter_modules([os.path.join(package.module_finder.path, package.name)])
+            }
+            public_submodules = PUBLIC_MODEL_SUBMODULES & submodules
+            if len(public_submodules) == 0 or package.name in transformers.import_structure:
+                continue
+            for submodule in public_submodules:
+                self.assertIn(f"{package.name}.{submodule}", transformers.import_structure)
+
+    def test_top_level_all(self):
+        for name in ["transformers", "taskflow", "Taskflow", "SimpleServer", "version"]:
+            self.assertIn(name, paddlenlp.__all__)
+        self.assertIs(paddlenlp.Taskflow, importlib.import_module("paddlenlp.taskflow").Taskflow)
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            transformers.NotExistModel
+        with self.assertRaises(ImportError):
+            from paddlenlp.transformers import NotExistModel  # noqa: F401
+        self.assertFalse(hasattr(paddlenlp, "not_exist_module"))
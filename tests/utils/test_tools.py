@@ -0,0 +1,53 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import TestCase
+
+import numpy as np
+
+from paddlenlp.utils.tools import (
+    batch_get_bool_ids_greater_than,
+    batch_get_span,
+    get_bool_ids_greater_than,
+    get_span,
+)
+
+
+class SpanDecodingTest(TestCase):
+    def test_batch_get_bool_ids_greater_than(self):
+        probs = np.array([[0.1, 0.6, 0.7], [0.9, 0.2, 0.3]])
+        batch_ids, ids, values = batch_get_bool_ids_greater_than(probs, limit=0.5)
+        self.assertEqual(batch_ids.tolist(), [0, 0, 1])
+        self.assertEqual(ids.tolist(), [1, 2, 0])
+        self.assertEqual(values.tolist(), [0.6, 0.7, 0.9])
+        self.assertEqual(get_bool_ids_greater_than(probs, limit=0.5), [[1, 2], [0]])
+
+    def test_batch_get_span(self):
+        rng = np.random.RandomState(2024)
+        start_probs = rng.rand(8, 32).astype("float32") ** 3
+        end_probs = rng.rand(8, 32).astype("float32") ** 3
+        batch_ids, start_ids, end_ids, start_scores, end_scores = batch_get_span(start_probs, end_probs, limit=0.5)
+
+        start_ids_list = get_bool_ids_greater_than(start_probs.tolist(), limit=0.5, return_prob=True)
+        end_ids_list = get_bool_ids_greater_than(end_probs.tolist(), limit=0.5, return_prob=True)
+        for i in range(len(start_probs)):
+            expected = get_span(start_ids_list[i], end_ids_list[i], with_prob=True)
+            mask = batch_ids == i
+            spans = set(
+                zip(
+                    zip(start_ids[mask].tolist(), start_scores[mask]),
+                    zip(end_ids[mask].tolist(), end_scores[mask]),
+                )
+            )
+            self.assertEqual(spans, expected)